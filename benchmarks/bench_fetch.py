@@ -0,0 +1,64 @@
+# coding=utf-8
+"""Benchmarks of element set retrieval against the local SpaceTrack stand-in.
+
+The mock server replays the recorded element sets of test/data with a fixed
+latency per query, so the numbers show the client overhead and how well
+concurrent fetching hides the network round trips.
+"""
+
+import asyncio
+
+import pytest
+
+from src.Space_trace.orbital.ratelimit import RateLimiter
+from src.Space_trace.orbital.spacetrack_client import AsyncSpacetrackClientWrapper, SpacetrackClientWrapper
+from test.mock_spacetrack import MockSpaceTrackServer, load_records
+
+# Added to every query, in seconds.
+LATENCIES = (0.0, 0.02)
+
+
+@pytest.fixture(scope="module", params=LATENCIES, ids=lambda latency: f"{latency * 1000:g}ms")
+def server(request):
+    with MockSpaceTrackServer(latency=request.param) as server:
+        yield server
+
+
+@pytest.fixture
+def limiter():
+    # Far above the SpaceTrack limits, so that no round waits for the limiter.
+    return RateLimiter(limits=((100000, 1),))
+
+
+@pytest.fixture(scope="module")
+def sat_ids():
+    return sorted({record['NORAD_CAT_ID'] for record in load_records()}, key=int)
+
+
+@pytest.mark.benchmark(group="fetch")
+@pytest.mark.parametrize("count", (1, 3))
+def bench_fetch_sequential(benchmark, server, limiter, sat_ids, count):
+    def fetch():
+        wrapper = SpacetrackClientWrapper("user@example.com", "password", rate_limiter=limiter,
+                                          base_url=server.base_url)
+        try:
+            return [wrapper.get_tle(int(sat_id), latest=True) for sat_id in sat_ids[:count]]
+        finally:
+            wrapper.close()
+
+    assert len(benchmark(fetch)) == count
+
+
+@pytest.mark.benchmark(group="fetch")
+@pytest.mark.parametrize("count", (1, 3))
+def bench_fetch_concurrent(benchmark, server, limiter, sat_ids, count):
+    async def run():
+        wrapper = AsyncSpacetrackClientWrapper("user@example.com", "password", rate_limiter=limiter,
+                                               base_url=server.base_url)
+        try:
+            return await wrapper.get_many([int(sat_id) for sat_id in sat_ids[:count]], latest=True)
+        finally:
+            await wrapper.close()
+
+    results = benchmark(lambda: asyncio.run(run()))
+    assert not any(isinstance(result, Exception) for result in results.values())
@@ -0,0 +1,75 @@
+# coding=utf-8
+"""Benchmarks of the propagation and line generation steps of the pipeline."""
+
+import pytest
+
+from src.Space_trace.orbital.track import points_to_columns
+from .conftest import TRACK_DAY, START_TIME, STEPS_MINUTES, WINDOWS, SATELLITE_COUNTS, step_id, skip_large
+
+
+def _lonlat_points(handler, tle_data, step_minutes):
+    """
+    Track of the day as the list of (lon, lat) tuples taken by get_line_segments.
+    """
+    columns = handler.generate_track(tle_data, 'TLE', TRACK_DAY, step_minutes)
+    return list(zip(columns['lon'].tolist(), columns['lat'].tolist()))
+
+
+@pytest.mark.benchmark(group="generate_points")
+@pytest.mark.parametrize("step_minutes", STEPS_MINUTES, ids=step_id)
+def bench_generate_points(benchmark, handler, tle_data, step_minutes):
+    points = benchmark(handler.generate_points, tle_data, 'TLE', TRACK_DAY, step_minutes)
+    assert points
+
+
+@pytest.mark.benchmark(group="generate_window")
+@pytest.mark.parametrize("window", WINDOWS, ids=lambda window: f"{window.total_seconds() / 3600:g}h")
+@pytest.mark.parametrize("step_minutes", STEPS_MINUTES, ids=step_id)
+def bench_generate_window(benchmark, handler, tle_data, step_minutes, window):
+    skip_large(window, step_minutes)
+    benchmark(handler.generate_window, tle_data, 'TLE', START_TIME, START_TIME + window, step_minutes)
+
+
+@pytest.mark.benchmark(group="constellation")
+@pytest.mark.parametrize("count", SATELLITE_COUNTS)
+def bench_constellation_tracks(benchmark, handler, element_sets, count):
+    satellites = [element_sets[number % len(element_sets)] for number in range(count)]
+
+    def generate():
+        return [handler.generate_track(data, 'TLE', TRACK_DAY, 1) for data in satellites]
+
+    benchmark(generate)
+
+
+@pytest.mark.benchmark(group="get_line_segments")
+@pytest.mark.parametrize("step_minutes", STEPS_MINUTES, ids=step_id)
+def bench_get_line_segments(benchmark, handler, tle_data, step_minutes):
+    points = _lonlat_points(handler, tle_data, step_minutes)
+    segments = benchmark(handler.get_line_segments, points)
+    assert segments
+
+
+@pytest.mark.benchmark(group="generate_line_geometries")
+@pytest.mark.parametrize("step_minutes", STEPS_MINUTES, ids=step_id)
+def bench_generate_line_geometries(benchmark, handler, tle_data, step_minutes):
+    points = _lonlat_points(handler, tle_data, step_minutes)
+    geometries = benchmark(handler.generate_line_geometries, points)
+    assert geometries
+
+
+@pytest.mark.benchmark(group="generate_track_segments")
+@pytest.mark.parametrize("options", [{}, {'per_revolution': True}, {'simplify_km': 1}, {'densify_km': 50}],
+                         ids=lambda options: ",".join(options) or "default")
+@pytest.mark.parametrize("step_minutes", STEPS_MINUTES, ids=step_id)
+def bench_generate_track_segments(benchmark, handler, tle_data, step_minutes, options):
+    columns = handler.generate_track(tle_data, 'TLE', TRACK_DAY, step_minutes)
+    if options.get('per_revolution'):
+        columns = handler.with_revolutions(columns, tle_data, 'TLE')
+    benchmark(handler.generate_track_segments, columns, **options)
+
+
+@pytest.mark.benchmark(group="points_to_columns")
+@pytest.mark.parametrize("step_minutes", STEPS_MINUTES, ids=step_id)
+def bench_points_to_columns(benchmark, handler, tle_data, step_minutes):
+    points = handler.generate_points(tle_data, 'TLE', TRACK_DAY, step_minutes)
+    benchmark(points_to_columns, points)
@@ -0,0 +1,65 @@
+# coding=utf-8
+"""Benchmarks of the export step: every file saver and the in-memory layers."""
+
+import os
+
+import pytest
+
+from src.Space_trace.orbital.saver import FILE_SAVERS, MemoryLayerSaver, ParquetSaver, pa
+from .conftest import TRACK_DAY, STEPS_MINUTES, SATELLITE_COUNTS, step_id
+
+# Savers writing through QGIS layers, the others only need NumPy (and pyarrow).
+QGIS_FORMATS = ('shp', 'gpkg', 'geojson', 'fgb')
+# 'feather' is written by the same saver as 'arrow'.
+FORMATS = [file_format for file_format in FILE_SAVERS if file_format != 'feather']
+
+
+def _saver(file_format, request):
+    if file_format in QGIS_FORMATS:
+        request.getfixturevalue('qgis_app')
+    elif file_format in ('parquet', 'arrow') and pa is None:
+        pytest.skip("pyarrow is not installed")
+    return FILE_SAVERS[file_format]()
+
+
+@pytest.mark.benchmark(group="save_track")
+@pytest.mark.parametrize("step_minutes", STEPS_MINUTES, ids=step_id)
+@pytest.mark.parametrize("file_format", FORMATS)
+def bench_save_track(benchmark, request, tmp_path, handler, tle_data, file_format, step_minutes):
+    saver = _saver(file_format, request)
+    columns = handler.with_revolutions(handler.generate_track(tle_data, 'TLE', TRACK_DAY, step_minutes),
+                                       tle_data, 'TLE')
+    path = os.path.join(tmp_path, f"points.{file_format}")
+    benchmark(saver.save_track, columns, path)
+    assert os.path.exists(path)
+
+
+@pytest.mark.benchmark(group="save_lines")
+@pytest.mark.parametrize("step_minutes", STEPS_MINUTES, ids=step_id)
+@pytest.mark.parametrize("file_format", FORMATS)
+def bench_save_lines(benchmark, request, tmp_path, handler, tle_data, file_format, step_minutes):
+    saver = _saver(file_format, request)
+    columns = handler.generate_track(tle_data, 'TLE', TRACK_DAY, step_minutes)
+    geometries, segments = handler.generate_track_segments(columns)
+    path = os.path.join(tmp_path, f"lines.{file_format}")
+    benchmark(saver.save_lines, geometries, path, segments)
+    assert os.path.exists(path)
+
+
+@pytest.mark.benchmark(group="memory_layer")
+@pytest.mark.parametrize("step_minutes", STEPS_MINUTES, ids=step_id)
+def bench_memory_layer(benchmark, qgis_app, handler, tle_data, step_minutes):
+    columns = handler.generate_track(tle_data, 'TLE', TRACK_DAY, step_minutes)
+    layer = benchmark(MemoryLayerSaver().save_track, columns, "points", step_minutes)
+    assert layer.featureCount() == len(columns['time'])
+
+
+@pytest.mark.benchmark(group="save_tracks")
+@pytest.mark.parametrize("count", SATELLITE_COUNTS)
+def bench_save_constellation(benchmark, tmp_path, handler, element_sets, count):
+    if pa is None:
+        pytest.skip("pyarrow is not installed")
+    tracks = [(number, handler.generate_track(element_sets[number % len(element_sets)], 'TLE', TRACK_DAY, 1))
+              for number in range(count)]
+    path = os.path.join(tmp_path, "constellation.parquet")
+    benchmark(ParquetSaver().save_tracks, tracks, path)
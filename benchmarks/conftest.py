@@ -0,0 +1,89 @@
+# coding=utf-8
+"""Shared fixtures of the benchmark suite.
+
+The suite needs pytest-benchmark. Run it from the plugin root, with QGIS on the
+Python path for the QGIS-based savers::
+
+    python -m pytest benchmarks --benchmark-autosave --benchmark-storage=benchmarks/results
+    python -m pytest benchmarks --benchmark-storage=benchmarks/results --benchmark-compare
+
+Every run is saved as JSON under benchmarks/results; ``--benchmark-compare``
+compares against the latest saved run (see ``make benchmark``).
+"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from src.Space_trace.orbital.cache import TrackCache
+from src.Space_trace.orbital.handler import OrbitalLogicHandler
+from test.mock_spacetrack import load_records
+from test.utilities import get_qgis_app
+
+# Day covered by the recorded element sets in test/data.
+TRACK_DAY = date(2025, 3, 28)
+START_TIME = datetime(TRACK_DAY.year, TRACK_DAY.month, TRACK_DAY.day)
+
+# Time steps in minutes, from one second to one hour.
+STEPS_MINUTES = (1 / 60, 1, 10, 60)
+# Window lengths.
+WINDOWS = (timedelta(hours=1), timedelta(days=1), timedelta(days=7))
+# Satellite counts of the constellation benchmarks.
+SATELLITE_COUNTS = (1, 10, 50)
+# Cases with more points are skipped, they take minutes per round without telling more.
+MAX_POINTS = 200000
+
+
+def step_id(step_minutes):
+    """
+    Readable pytest id of a time step ('1s', '10min').
+    """
+    return f"{round(step_minutes * 60)}s" if step_minutes < 1 else f"{step_minutes:g}min"
+
+
+def point_count(window, step_minutes):
+    return int(window / timedelta(minutes=step_minutes))
+
+
+def skip_large(window, step_minutes):
+    """
+    Skip a benchmark case whose track would exceed MAX_POINTS.
+    """
+    if point_count(window, step_minutes) > MAX_POINTS:
+        pytest.skip(f"more than {MAX_POINTS} points")
+
+
+@pytest.fixture
+def handler():
+    """
+    OrbitalLogicHandler whose track cache keeps nothing, so every round propagates.
+    """
+    return OrbitalLogicHandler(track_cache=TrackCache(max_bytes=0))
+
+
+@pytest.fixture(scope="session")
+def element_sets():
+    """
+    Recorded element sets as TLE tuples (tle_1, tle_2, inc), one per object.
+    """
+    sets = {}
+    for record in load_records():
+        sets.setdefault(record['NORAD_CAT_ID'],
+                        (record['TLE_LINE1'], record['TLE_LINE2'], float(record['INCLINATION'])))
+    return list(sets.values())
+
+
+@pytest.fixture(scope="session")
+def tle_data(element_sets):
+    """
+    Element set of the ISS.
+    """
+    return element_sets[0]
+
+
+@pytest.fixture(scope="session")
+def qgis_app():
+    app = get_qgis_app()[0]
+    if app is None:
+        pytest.skip("QGIS is not available")
+    return app
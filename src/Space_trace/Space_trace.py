@@ -1,7 +1,7 @@
 from qgis.PyQt.QtCore import QSettings, QTranslator, QCoreApplication
 from qgis.PyQt.QtGui import QIcon
 from qgis.PyQt.QtWidgets import QAction, QApplication
-from qgis.core import QgsVectorLayer, QgsProject
+from qgis.core import QgsVectorLayer, QgsProject, QgsApplication
 
 import os.path
 import time
@@ -11,8 +11,16 @@ import logging
 from ...resources import *
 from .Space_trace_dialog import SpaceTracePluginDialog
 from .orbital.orchestrator import OrbitalOrchestrator
+from .orbital.handler import OrbitalLogicHandler
+from .orbital.live import LivePositionLayer
+from .orbital.session import default_session_pool
+from .orbital.saver import FILE_SAVERS, configure_temporal, lod_table_name
+from .processing.provider import SpaceTraceProvider
 from ..config.orbital import OrbitalConfig
 
+# Decimation factors of the level-of-detail tables offered in the dialog.
+LOD_LEVELS = (4, 16)
+
 
 class SpaceTracePlugin:
     """
@@ -32,6 +40,10 @@ class SpaceTracePlugin:
         self.actions = []
         self.menu = self.tr('Space trace')
         self.first_start = None
+        self.dlg = None
+        self.live_layer = None
+        self.live_objects = {}      # Elements of the tracks processed in this session
+        self.provider = None
 
         self._init_logger()
         self._init_localization()
@@ -104,21 +116,41 @@ class SpaceTracePlugin:
         self.actions.append(action)
         return action
 
+    def initProcessing(self):
+        """
+        Register the Processing provider with the track generation algorithms.
+        """
+        self.provider = SpaceTraceProvider()
+        QgsApplication.processingRegistry().addProvider(self.provider)
+
     def initGui(self):
         """
         Initialize the GUI by creating menu entries and toolbar icons.
         """
+        self.initProcessing()
+
         icon_path = ':/plugins/Space_trace/icon.png'
         self.add_action(icon_path,
                         text=self.tr('Draw flight path'),
                         callback=self.run,
                         parent=self.iface.mainWindow())
+        self.live_action = self.add_action(icon_path,
+                                           text=self.tr('Show live positions'),
+                                           callback=self.toggle_live_positions,
+                                           add_to_toolbar=False,
+                                           parent=self.iface.mainWindow())
+        self.live_action.setCheckable(True)
         self.first_start = True
 
     def unload(self):
         """
         Remove the plugin menu items and icons from QGIS GUI.
         """
+        if self.live_layer:
+            self.live_layer.stop()
+        if self.provider:
+            QgsApplication.processingRegistry().removeProvider(self.provider)
+        default_session_pool.close()
         for action in self.actions:
             self.iface.removePluginVectorMenu(self.tr('&Space trace'), action)
             self.iface.removeToolBarIcon(action)
@@ -167,6 +199,13 @@ class SpaceTracePlugin:
                     else self.dlg.comboBoxDataFormatSpaceTrack.currentText())
         
         create_line_layer = self.dlg.checkBoxCreateLineLayer.isChecked()
+        revolution_lines = self.dlg.checkBoxRevolutionLines.isChecked()
+        lod_levels = LOD_LEVELS if self.dlg.checkBoxLodLevels.isChecked() else ()
+        target_crs = None
+        if self.dlg.checkBoxProjectCrs.isChecked():
+            project_crs = QgsProject.instance().crs()
+            if project_crs.isValid() and project_crs.authid() != "EPSG:4326":
+                target_crs = project_crs.authid() or project_crs.toWkt()
         save_data = self.dlg.checkBoxSaveData.isChecked()
         save_data_path = self.dlg.lineEditSaveDataPath.text().strip() if self.dlg.checkBoxSaveData.isChecked() else None
         
@@ -181,6 +220,9 @@ class SpaceTracePlugin:
         'password': password,
         'data_format': data_format,
         'create_line_layer': create_line_layer,
+        'revolution_lines': revolution_lines,
+        'lod_levels': lod_levels,
+        'target_crs': target_crs,
         'save_data': save_data,
         'save_data_path': save_data_path
         }
@@ -206,16 +248,22 @@ class SpaceTracePlugin:
             except ValueError:
                 raise Exception(self.tr("Invalid NORAD ID: Please enter a valid positive integer."))
         else:
-            sat_id = None  # Skip validation if local file is provided
+            # With a local file the NORAD ID is optional and selects the object in multi-object files
+            sat_id = int(inputs['sat_id_text']) if inputs['sat_id_text'].isdigit() else None
 
         # Validate output file format if provided
         if inputs['output_path']:
             _, ext = os.path.splitext(inputs['output_path'])
             file_format = ext[1:].lower()
-            if file_format not in ['shp', 'gpkg', 'geojson']:
-                raise Exception(self.tr("Unsupported file format. Use .shp, .gpkg, or .geojson."))
+            if file_format not in FILE_SAVERS:
+                raise Exception(self.tr("Unsupported file format. Use one of: {}.").format(
+                    ", ".join(f".{extension}" for extension in FILE_SAVERS)))
         else:
             file_format = None
+        if inputs['lod_levels'] and file_format != 'gpkg':
+            raise Exception(self.tr("Level-of-detail tables require a GeoPackage (.gpkg) output file."))
+        if inputs['target_crs'] and file_format and not FILE_SAVERS[file_format].SUPPORTS_CRS:
+            raise Exception(self.tr("The .{} output is always written in WGS 84.").format(file_format))
 
         if inputs['save_data'] and inputs['save_data_path']:
             _, ext = os.path.splitext(inputs['save_data_path'])
@@ -247,7 +295,10 @@ class SpaceTracePlugin:
             create_line_layer=inputs['create_line_layer'],
             save_data=inputs['save_data'],
             data_file_path=inputs['data_file_path'],
-            save_data_path=inputs['save_data_path']
+            save_data_path=inputs['save_data_path'],
+            revolution_lines=inputs['revolution_lines'],
+            lod_levels=inputs['lod_levels'],
+            target_crs=inputs['target_crs']
         )
 
     def _process_track(self, config):
@@ -256,7 +307,9 @@ class SpaceTracePlugin:
         
         :param config: An OrbitalConfig instance.
         """
-        orchestrator = OrbitalOrchestrator(config.login, config.password, log_callback=self.log_message)
+        client = default_session_pool.get_client(config.login, config.password)
+        orchestrator = OrbitalOrchestrator(config.login, config.password, log_callback=self.log_message,
+                                           client=client)
         self.log_message("OrbitalOrchestrator initialized.", "DEBUG")
         if config.output_path:
             point_file, line_file = orchestrator.process_persistent_track(config)
@@ -266,8 +319,9 @@ class SpaceTracePlugin:
                 self.tr("{} created successfully").format(config.file_format.capitalize()),
                 level=0
             )
-            self._load_and_add_layer(point_file, "point")
-            self._load_and_add_layer(line_file, "line")
+            if FILE_SAVERS[config.file_format].OGR_READABLE:
+                self._load_levels(point_file, "point", config, config.step_minutes)
+                self._load_levels(line_file, "line", config)
         else:
             point_layer, line_layer = orchestrator.process_in_memory_track(config)
             if config.add_layer:
@@ -276,22 +330,85 @@ class SpaceTracePlugin:
                 self.log_message("Temporary layers added to the project.", "INFO")
                 self.log_message(f"Temporary Point layer contains {point_layer.featureCount()} features.", "INFO")
             self.iface.messageBar().pushMessage("Success", "Temporary layers created successfully", level=0)
+        self._register_live_object(config, orchestrator.last_data)
+
+    def _register_live_object(self, config, data):
+        """
+        Remember the elements of a processed track for the live position layer.
+
+        :param config: An OrbitalConfig instance.
+        :param data: TLE or OMM data used for the track.
+        """
+        if not data:
+            return
+        tle_1, tle_2, _ = OrbitalLogicHandler.resolve_elements(data, config.data_format)
+        name = config.sat_id or tle_1[2:7].strip()
+        self.live_objects[name] = (name, tle_1, tle_2)
+        if self.live_layer and self.live_layer.is_running():
+            self.live_layer.set_objects(list(self.live_objects.values()))
+
+    def toggle_live_positions(self, checked):
+        """
+        Start or stop the live position layer for the satellites processed in this session.
 
-    def _load_and_add_layer(self, file_path, layer_type):
+        :param checked: New state of the live positions action.
+        """
+        if not checked:
+            if self.live_layer:
+                self.live_layer.stop()
+            return
+        if not self.live_objects:
+            self.live_action.setChecked(False)
+            self.iface.messageBar().pushMessage(
+                self.tr("Warning"), self.tr("Draw a flight path first to choose the satellites."), level=1)
+            return
+        if self.live_layer is None or not QgsProject.instance().mapLayer(self.live_layer.layer.id()):
+            self.live_layer = LivePositionLayer(self.tr("Live positions"), log_callback=self.log_message)
+            QgsProject.instance().addMapLayer(self.live_layer.layer)
+        self.live_layer.set_objects(list(self.live_objects.values()))
+        self.live_layer.start()
+        self.log_message(f"Live positions started for {len(self.live_objects)} objects.", "INFO")
+
+    def _load_levels(self, file_path, layer_type, config, step_minutes=None):
+        """
+        Load an output file, or every level-of-detail table of it, into the QGIS project.
+
+        The scale range of each level is restored from the default style stored in the GeoPackage.
+
+        :param file_path: The file path to load.
+        :param layer_type: A string identifier for the layer type.
+        :param config: The OrbitalConfig the file was written with.
+        :param step_minutes: Time step of the track, used as the display duration of each point.
+        """
+        factors = OrbitalLogicHandler.lod_factors(config.lod_levels)
+        if not file_path or len(factors) == 1:
+            self._load_and_add_layer(file_path, layer_type, step_minutes)
+            return
+        for factor in reversed(factors):
+            table = lod_table_name(file_path, factor)
+            self._load_and_add_layer(f"{file_path}|layername={table}", layer_type, step_minutes, table)
+
+    def _load_and_add_layer(self, file_path, layer_type, step_minutes=None, layer_name=None):
         """
         Load a vector layer from a file and add it to the QGIS project.
 
+        Layers with a Date_Time field get temporal properties and a time index.
+
         :param file_path: The file path to load.
         :param layer_type: A string identifier for the layer type.
+        :param step_minutes: Time step of the track, used as the display duration of each point.
+        :param layer_name: Layer name, the file name without extension by default.
         """
         if not file_path:
             return
-        layer_name = os.path.splitext(os.path.basename(file_path))[0]
+        layer_name = layer_name or os.path.splitext(os.path.basename(file_path))[0]
         layer = QgsVectorLayer(file_path, layer_name, "ogr")
         if not layer.isValid():
             self.iface.messageBar().pushMessage("Error", f"Failed to load {layer_type} layer", level=3)
             self.log_message(f"Failed to load {layer_type} layer from {file_path}.", "ERROR")
         else:
+            if configure_temporal(layer, step_minutes):
+                self.log_message(f"Temporal properties enabled for the {layer_type} layer.", "DEBUG")
             QgsProject.instance().addMapLayer(layer)
             self.log_message(f"{layer_type.capitalize()} layer loaded with {layer.featureCount()} features.", "INFO")
 
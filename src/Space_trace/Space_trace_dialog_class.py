@@ -140,6 +140,19 @@ class Ui_SpaceTracePluginDialogBase(object):
         self.checkBoxCreateLineLayer = QtWidgets.QCheckBox("Create line layer", self.groupBoxOutput)
         self.checkBoxCreateLineLayer.setChecked(True)
         self.verticalLayoutOutput.addWidget(self.checkBoxCreateLineLayer)
+
+        self.checkBoxRevolutionLines = QtWidgets.QCheckBox("One line per revolution", self.groupBoxOutput)
+        self.checkBoxRevolutionLines.setChecked(False)
+        self.verticalLayoutOutput.addWidget(self.checkBoxRevolutionLines)
+
+        self.checkBoxLodLevels = QtWidgets.QCheckBox("Level-of-detail tables (x4, x16, GeoPackage only)",
+                                                     self.groupBoxOutput)
+        self.checkBoxLodLevels.setChecked(False)
+        self.verticalLayoutOutput.addWidget(self.checkBoxLodLevels)
+
+        self.checkBoxProjectCrs = QtWidgets.QCheckBox("Write layers in the project CRS", self.groupBoxOutput)
+        self.checkBoxProjectCrs.setChecked(False)
+        self.verticalLayoutOutput.addWidget(self.checkBoxProjectCrs)
         self.verticalLayoutMain.addWidget(self.groupBoxOutput)
 
         # Save data settings group box
@@ -217,6 +230,7 @@ class Ui_SpaceTracePluginDialogBase(object):
         self.pushButtonBrowseData.clicked.connect(self.browseDataFile)
         self.pushButtonBrowseOutput.clicked.connect(self.browseOutputFile)
         self.pushButtonBrowseSaveData.clicked.connect(self.browseSaveDataFile)
+        self.checkBoxCreateLineLayer.toggled.connect(self.checkBoxRevolutionLines.setEnabled)
 
     def retranslateUi(self, Dialog):
         _translate = QtCore.QCoreApplication.translate
@@ -237,6 +251,10 @@ class Ui_SpaceTracePluginDialogBase(object):
         self.pushButtonBrowseOutput.setText(_translate("SpaceTracePluginDialogBase", "Browse"))
         self.checkBoxAddLayer.setText(_translate("SpaceTracePluginDialogBase", "Add created layer to project"))
         self.checkBoxCreateLineLayer.setText(_translate("SpaceTracePluginDialogBase", "Create line layer"))
+        self.checkBoxRevolutionLines.setText(_translate("SpaceTracePluginDialogBase", "One line per revolution"))
+        self.checkBoxLodLevels.setText(_translate("SpaceTracePluginDialogBase",
+                                                  "Level-of-detail tables (x4, x16, GeoPackage only)"))
+        self.checkBoxProjectCrs.setText(_translate("SpaceTracePluginDialogBase", "Write layers in the project CRS"))
         self.groupBoxSaveData.setTitle(_translate("SpaceTracePluginDialogBase", "Save Received Data"))
         self.checkBoxSaveData.setText(_translate("SpaceTracePluginDialogBase", "Save TLE/OMM data"))
         self.lineEditSaveDataPath.setPlaceholderText(_translate("SpaceTracePluginDialogBase", "Specify the path to save received data"))
@@ -286,16 +304,16 @@ class Ui_SpaceTracePluginDialogBase(object):
             data_format = self.comboBoxDataFormatSpaceTrack.currentText()
         
         if data_format == "TLE":
-            file_filter = "Text Files (*.txt)"
+            file_filter = "TLE Files (*.txt *.tle)"
         else:
-            file_filter = "JSON Files (*.json)"
+            file_filter = "OMM Files (*.json *.xml *.csv)"
 
         file, _ = QtWidgets.QFileDialog.getOpenFileName(None, "Select Data File", "", file_filter)
         if file:
             self.lineEditDataPath.setText(file)
 
     def browseOutputFile(self):
-        file, _ = QtWidgets.QFileDialog.getSaveFileName(None, "Select Output File", "", "Shapefiles (*.shp);;GeoPackage (*.gpkg);;GeoJSON (*.geojson);;All Files (*)")
+        file, _ = QtWidgets.QFileDialog.getSaveFileName(None, "Select Output File", "", "Shapefiles (*.shp);;GeoPackage (*.gpkg);;GeoJSON (*.geojson);;FlatGeobuf (*.fgb);;GeoParquet (*.parquet);;Arrow IPC (*.arrow *.feather);;CZML (*.czml);;All Files (*)")
         if file:
             self.lineEditOutputPath.setText(file)
 
@@ -0,0 +1,283 @@
+"""
+Headless command-line entry point for batch track generation.
+
+Runs OrbitalOrchestrator without the QGIS GUI. Jobs are given either as
+command-line arguments or as JSON/YAML job files; all jobs of one invocation
+share the process, the SpaceTrack sessions and the track cache.
+
+Usage (from the src directory of the plugin, or as ``python -m src.Space_trace``
+from the plugin directory)::
+
+    python -m Space_trace --sat-id 25544 --day 2025-03-28 --output iss.gpkg
+    python -m Space_trace --jobs nightly.yaml --cache-dir ~/.cache/space_trace
+
+A job file contains either a list of jobs or a mapping with optional
+``defaults`` and a ``jobs`` list. Job keys are the OrbitalConfig attribute names.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from datetime import date, datetime
+
+from .orbital.orchestrator import OrbitalOrchestrator
+from .orbital.session import default_session_pool
+from .orbital.handler import OrbitalLogicHandler
+from .orbital.cache import default_track_cache
+from .orbital.ratelimit import default_rate_limiters
+from .orbital.saver import FILE_SAVERS
+
+try:
+    from ..config.orbital import OrbitalConfig
+except ImportError:  # Run as a top-level package (python -m Space_trace from src/)
+    from config.orbital import OrbitalConfig
+
+try:
+    import yaml
+except ImportError:  # PyYAML is optional, JSON job files always work
+    yaml = None
+
+SUPPORTED_OUTPUT_FORMATS = list(FILE_SAVERS)
+
+logger = logging.getLogger("SpaceTraceCLI")
+
+
+def parse_args(argv=None):
+    """
+    Parse command-line arguments.
+
+    :param argv: Argument list (defaults to sys.argv[1:]).
+    :return: argparse.Namespace.
+    """
+    parser = argparse.ArgumentParser(
+        # The package name the module was started as: Space_trace or src.Space_trace.
+        prog=f"python -m {__package__}",
+        description="Generate spacecraft ground tracks without the QGIS GUI."
+    )
+    parser.add_argument("--jobs", action="append", default=[], metavar="FILE",
+                        help="JSON or YAML job file (may be given several times).")
+    parser.add_argument("--sat-id", type=int,
+                        help="Satellite NORAD ID (also selects the object in a multi-object data file).")
+    parser.add_argument("--day", help="Track day (YYYY-MM-DD), defaults to today.")
+    parser.add_argument("--step", type=float, default=1, help="Time step in minutes.")
+    parser.add_argument("--output", help="Output file ({}).".format(
+        ", ".join(f".{extension}" for extension in SUPPORTED_OUTPUT_FORMATS)))
+    parser.add_argument("--data-format", choices=["TLE", "OMM"], default="TLE")
+    parser.add_argument("--data-file", help="Local TLE/OMM file instead of SpaceTrack.")
+    parser.add_argument("--no-lines", action="store_true", help="Do not create the line layer.")
+    parser.add_argument("--revolution-lines", action="store_true",
+                        help="Write one line feature per revolution instead of one per segment.")
+    parser.add_argument("--simplify-km", type=float, default=0,
+                        help="Simplify lines with this tolerance in km (0 keeps every vertex).")
+    parser.add_argument("--densify-km", type=float, default=0,
+                        help="Densify lines along great circles to this vertex spacing in km (0 = off).")
+    parser.add_argument("--state-vectors", action="store_true",
+                        help="Add ECI/ECEF position and velocity fields and the ground speed to the points.")
+    parser.add_argument("--crs", help="Write the layers in this CRS (e.g. EPSG:3413) instead of WGS 84.")
+    parser.add_argument("--lod", type=int, nargs="+", default=[], metavar="FACTOR",
+                        help="Add level-of-detail tables decimated by these factors (GeoPackage only), e.g. --lod 4 16.")
+    parser.add_argument("--save-data", metavar="PATH", help="Save the received TLE/OMM data.")
+    parser.add_argument("--login", default=os.environ.get("SPACETRACK_LOGIN"),
+                        help="SpaceTrack login (default: $SPACETRACK_LOGIN).")
+    parser.add_argument("--password", default=os.environ.get("SPACETRACK_PASSWORD"),
+                        help="SpaceTrack password (default: $SPACETRACK_PASSWORD).")
+    parser.add_argument("--epoch-series", action="store_true",
+                        help="Use every element set published around the day, switching to the nearest epoch.")
+    parser.add_argument("--blend-minutes", type=float, default=0,
+                        help="Blend consecutive element sets over this many minutes (with --epoch-series).")
+    parser.add_argument("--cache-dir", help="Directory for the on-disk track cache.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log debug messages.")
+    return parser.parse_args(argv)
+
+
+def load_jobs(path):
+    """
+    Load jobs from a JSON or YAML file.
+
+    :param path: Job file path.
+    :return: List of job dicts with the file defaults applied.
+    :raises ValueError: If the file cannot be interpreted as a job list.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+            if yaml is None:
+                raise ValueError("PyYAML is required to read YAML job files.")
+            content = yaml.safe_load(f)
+        else:
+            content = json.load(f)
+
+    defaults = {}
+    if isinstance(content, dict):
+        defaults = content.get("defaults", {})
+        content = content.get("jobs", [])
+    if not isinstance(content, list):
+        raise ValueError(f"Job file {path} must contain a list of jobs.")
+    return [{**defaults, **job} for job in content]
+
+
+def jobs_from_args(args):
+    """
+    Build the job list from the command-line arguments.
+
+    :param args: argparse.Namespace from parse_args.
+    :return: List of job dicts.
+    """
+    base = {"login": args.login, "password": args.password}
+    jobs = []
+    for path in args.jobs:
+        jobs.extend({**base, **job} for job in load_jobs(path))
+    if args.sat_id or args.data_file:
+        jobs.append({
+            **base,
+            "sat_id": args.sat_id,
+            "track_day": args.day,
+            "step_minutes": args.step,
+            "output_path": args.output,
+            "data_format": args.data_format,
+            "data_file_path": args.data_file,
+            "create_line_layer": not args.no_lines,
+            "save_data_path": args.save_data,
+            "epoch_series": args.epoch_series,
+            "revolution_lines": args.revolution_lines,
+            "simplify_km": args.simplify_km,
+            "densify_km": args.densify_km,
+            "target_crs": args.crs,
+            "state_vectors": args.state_vectors,
+            "lod_levels": args.lod,
+        })
+    return jobs
+
+
+def build_config(job):
+    """
+    Validate a job dict and turn it into an OrbitalConfig.
+
+    :param job: Job dict.
+    :return: An OrbitalConfig instance.
+    :raises ValueError: When validation fails.
+    """
+    output_path = job.get("output_path")
+    if not output_path:
+        raise ValueError("An output path is required in headless mode.")
+    file_format = os.path.splitext(output_path)[1][1:].lower()
+    if file_format not in SUPPORTED_OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported file format: {output_path}")
+
+    lod_levels = tuple(int(factor) for factor in job.get("lod_levels") or ())
+    if lod_levels and file_format != "gpkg":
+        raise ValueError("Level-of-detail tables require a .gpkg output.")
+    target_crs = job.get("target_crs") or None
+    if target_crs and not FILE_SAVERS[file_format].SUPPORTS_CRS:
+        raise ValueError(f"The .{file_format} output is always written in WGS 84.")
+
+    data_file_path = job.get("data_file_path") or ''
+    sat_id = job.get("sat_id")
+    if not data_file_path:
+        if not sat_id or int(sat_id) <= 0:
+            raise ValueError("Either a positive NORAD ID or a local data file is required.")
+        if not job.get("login") or not job.get("password"):
+            raise ValueError("SpaceTrack login and password are required.")
+    sat_id = int(sat_id) if sat_id else None
+
+    track_day = job.get("track_day") or date.today()
+    if isinstance(track_day, str):
+        track_day = datetime.strptime(track_day, "%Y-%m-%d").date()
+
+    save_data_path = job.get("save_data_path")
+    return OrbitalConfig(
+        sat_id=sat_id,
+        track_day=track_day,
+        step_minutes=float(job.get("step_minutes", 1)),
+        output_path=output_path,
+        file_format=file_format,
+        add_layer=False,
+        login=job.get("login"),
+        password=job.get("password"),
+        data_format=job.get("data_format", "TLE"),
+        create_line_layer=job.get("create_line_layer", True),
+        save_data=bool(save_data_path),
+        data_file_path=data_file_path,
+        save_data_path=save_data_path,
+        epoch_series=bool(job.get("epoch_series", False)),
+        revolution_lines=bool(job.get("revolution_lines", False)),
+        simplify_km=float(job.get("simplify_km", 0)),
+        lod_levels=lod_levels,
+        densify_km=float(job.get("densify_km", 0)),
+        target_crs=target_crs,
+        state_vectors=bool(job.get("state_vectors", False))
+    )
+
+
+def run_jobs(jobs, blend_minutes=0):
+    """
+    Run jobs one after another, reusing one SpaceTrack session per account.
+
+    :param jobs: List of job dicts.
+    :param blend_minutes: Blending window between consecutive element sets.
+    :return: Number of failed jobs.
+    """
+    logic_handler = OrbitalLogicHandler(blend_minutes=blend_minutes)
+    failed = 0
+    for number, job in enumerate(jobs, 1):
+        started = time.time()
+        try:
+            config = build_config(job)
+            client = default_session_pool.get_client(config.login, config.password)
+            orchestrator = OrbitalOrchestrator(config.login, config.password,
+                                               client=client, logic_handler=logic_handler)
+            result = orchestrator.process_persistent_track(config)
+            if not result:
+                raise ValueError("No data received.")
+            point_file, line_file = result
+            logger.info(f"Job {number}/{len(jobs)} done in {time.time() - started:.2f} seconds: "
+                        f"Point={point_file}, Line={line_file}")
+        except Exception as e:
+            failed += 1
+            logger.error(f"Job {number}/{len(jobs)} failed: {e}")
+    return failed
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    :param argv: Argument list (defaults to sys.argv[1:]).
+    :return: Process exit code.
+    """
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format="[%(asctime)s] %(levelname)s: %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+
+    try:
+        jobs = jobs_from_args(args)
+    except (OSError, ValueError) as e:
+        logger.error(str(e))
+        return 2
+    if not jobs:
+        logger.error("Nothing to do: pass --sat-id, --data-file or --jobs.")
+        return 2
+    if args.cache_dir:
+        default_track_cache.cache_dir = args.cache_dir
+
+    from qgis.core import QgsApplication
+    app = QgsApplication([], False)
+    app.initQgis()
+    try:
+        failed = run_jobs(jobs, args.blend_minutes)
+    finally:
+        default_session_pool.close()
+        app.exitQgis()
+
+    metrics = default_rate_limiters.metrics()
+    if metrics['requests']:
+        logger.info(f"SpaceTrack requests: {metrics['requests']}, throttled: {metrics['throttled_requests']} "
+                    f"({metrics['throttled_seconds']:.1f} s), retries: {metrics['retries']}.")
+    logger.info(f"{len(jobs) - failed} of {len(jobs)} jobs succeeded.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
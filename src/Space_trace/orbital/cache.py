@@ -0,0 +1,172 @@
+"""
+This module contains the TrackCache class which memoizes computed orbital tracks.
+
+Tracks are keyed by a hash of the TLE lines together with the time window and the
+sampling step, so re-running the same computation with different output options
+does not propagate the orbit again.
+"""
+
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .track import columns_nbytes
+
+logger = logging.getLogger("TrackCache")
+
+
+class TrackCache:
+    """
+    LRU cache of computed orbital tracks in columnar form.
+
+    Tracks are held in memory and evicted least-recently-used first once their total
+    size exceeds ``max_bytes``. When ``cache_dir`` is set, tracks are also stored as
+    compressed ``.npz`` files, and the oldest files are removed once the directory
+    grows beyond ``max_disk_bytes``.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, cache_dir=None, max_disk_bytes=512 * 1024 * 1024):
+        """
+        :param max_bytes: Maximum total size of the in-memory tracks in bytes.
+        :param cache_dir: Directory for the on-disk cache (None disables it).
+        :param max_disk_bytes: Maximum total size of the on-disk cache in bytes.
+        """
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(tle_1, tle_2, start_time, end_time, step_minutes):
+        """
+        Build a cache key for a track.
+
+        :param tle_1: First TLE line.
+        :param tle_2: Second TLE line.
+        :param start_time: Start of the time window (datetime).
+        :param end_time: End of the time window (datetime).
+        :param step_minutes: Time step in minutes.
+        :return: Key string.
+        """
+        digest = hashlib.sha1(f"{tle_1.strip()}\n{tle_2.strip()}".encode("utf-8")).hexdigest()
+        return (f"{digest}_{start_time:%Y%m%dT%H%M%S}_{end_time:%Y%m%dT%H%M%S}_"
+                f"{float(step_minutes):g}")
+
+    def get(self, key):
+        """
+        Look up a track, first in memory and then on disk.
+
+        :param key: Cache key from make_key.
+        :return: Dict of read-only NumPy columns, or None if the track is not cached.
+        """
+        with self._lock:
+            columns = self._entries.get(key)
+            if columns is not None:
+                self._entries.move_to_end(key)
+                return columns
+
+        columns = self._load_from_disk(key)
+        if columns is not None:
+            self._store(key, columns)
+        return columns
+
+    def put(self, key, columns):
+        """
+        Add a track to the cache.
+
+        :param key: Cache key from make_key.
+        :param columns: Dict of NumPy columns.
+        :return: The cached (read-only) columns.
+        """
+        columns = {name: np.array(column) for name, column in columns.items()}
+        for column in columns.values():
+            column.flags.writeable = False
+        self._store(key, columns)
+        self._save_to_disk(key, columns)
+        return columns
+
+    def clear(self):
+        """
+        Remove all tracks from memory. Files in the on-disk cache are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _store(self, key, columns):
+        size = columns_nbytes(columns)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._size -= columns_nbytes(self._entries.pop(key))
+            self._entries[key] = columns
+            self._size += size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= columns_nbytes(evicted)
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def _load_from_disk(self, key):
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                columns = {name: data[name] for name in data.files}
+        except (OSError, ValueError):
+            return None
+        for column in columns.values():
+            column.flags.writeable = False
+        os.utime(path)
+        return columns
+
+    def _save_to_disk(self, key, columns):
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        # The temporary name must not end with .npz, or _evict_disk could pick it up.
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write through a file object: savez would append .npz to a file name.
+            with open(tmp_path, "wb") as file:
+                np.savez_compressed(file, **columns)
+            os.replace(tmp_path, path)
+            self._evict_disk()
+        except OSError as e:
+            # The on-disk cache is optional: keep the in-memory entry and go on.
+            logger.warning(f"Could not write track cache file {path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _evict_disk(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".npz"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+
+# Process-wide cache shared by all handlers, so results survive between plugin runs.
+default_track_cache = TrackCache()
@@ -0,0 +1,127 @@
+"""
+This module contains great-circle geometry on the spherical Earth for track lines.
+
+Between two samples a ground track is much closer to the great circle through them
+than to the straight line in longitude/latitude, so the functions here interpolate
+along great circles: the cut points at the antimeridian and the equator, and the
+vertices inserted to densify coarse tracks. Everything works on whole arrays of
+steps at once.
+"""
+
+import numpy as np
+
+from .track import EARTH_EQUATORIAL_RADIUS_KM
+
+# Normals of the planes of the 0/180 degree meridians and of the equator.
+MERIDIAN_PLANE = np.array([0.0, 1.0, 0.0])
+EQUATOR_PLANE = np.array([0.0, 0.0, 1.0])
+
+
+def unit_vectors(lons, lats):
+    """
+    Convert longitudes and latitudes in degrees into unit vectors, one row per point.
+    """
+    lons = np.radians(np.asarray(lons, dtype=float))
+    lats = np.radians(np.asarray(lats, dtype=float))
+    cos_lats = np.cos(lats)
+    return np.column_stack((cos_lats * np.cos(lons), cos_lats * np.sin(lons), np.sin(lats)))
+
+
+def to_lonlat(vectors):
+    """
+    Convert unit vectors (one row per point) into arrays of longitudes and latitudes in degrees.
+    """
+    lons = np.degrees(np.arctan2(vectors[:, 1], vectors[:, 0]))
+    lats = np.degrees(np.arctan2(vectors[:, 2], np.hypot(vectors[:, 0], vectors[:, 1])))
+    return lons, lats
+
+
+def _angles(starts, ends):
+    return np.arctan2(np.linalg.norm(np.cross(starts, ends), axis=1), np.einsum('ij,ij->i', starts, ends))
+
+
+def interpolate(starts, ends, fractions):
+    """
+    Interpolate along the great circles from starts to ends.
+
+    :param starts: Unit vectors of the arc starts, one row per arc.
+    :param ends: Unit vectors of the arc ends.
+    :param fractions: Fraction of each arc's angle, 0 at the start and 1 at the end.
+    :return: Unit vectors of the interpolated points.
+    """
+    fractions = np.asarray(fractions, dtype=float)
+    # Unit tangent at the start, pointing towards the end.
+    tangents = ends - np.einsum('ij,ij->i', starts, ends)[:, None] * starts
+    norms = np.linalg.norm(tangents, axis=1)
+    tangents = np.divide(tangents, norms[:, None], out=np.zeros_like(tangents), where=norms[:, None] > 1e-15)
+    angles = (fractions * _angles(starts, ends))[:, None]
+    return np.cos(angles) * starts + np.sin(angles) * tangents
+
+
+def plane_crossings(starts, ends, normal):
+    """
+    Find where the great-circle arcs from starts to ends cross a plane through the Earth's centre.
+
+    Every arc is expected to have its ends on different sides of the plane (or its start on it).
+
+    :param starts: Unit vectors of the arc starts, one row per arc.
+    :param ends: Unit vectors of the arc ends.
+    :param normal: Normal of the plane, MERIDIAN_PLANE or EQUATOR_PLANE.
+    :return: Fraction of each arc's angle at which it crosses the plane.
+    """
+    angles = _angles(starts, ends)
+    side = np.sign(starts @ normal)
+    start_offsets = side * (starts @ normal)
+    end_offsets = side * (ends @ normal)
+    # Solve sin(angle - x) * start_offset + sin(x) * end_offset = 0 for the angle x from the start.
+    crossings = np.arctan2(start_offsets * np.sin(angles), start_offsets * np.cos(angles) - end_offsets)
+    return np.divide(crossings, angles, out=np.zeros_like(angles), where=angles > 0)
+
+
+def densify(lons, lats, max_km):
+    """
+    Insert vertices along the great circles between consecutive points of a line.
+
+    :param lons: Longitudes in degrees.
+    :param lats: Latitudes in degrees.
+    :param max_km: Maximum distance between consecutive vertices in km.
+    :return: Tuple (lons, lats) of the densified line; the original vertices keep their exact values.
+    """
+    lons = np.asarray(lons, dtype=float)
+    lats = np.asarray(lats, dtype=float)
+    if max_km <= 0 or len(lons) < 2:
+        return lons, lats
+    points = unit_vectors(lons, lats)
+    parts = np.maximum(np.ceil(_angles(points[:-1], points[1:]) * EARTH_EQUATORIAL_RADIUS_KM / max_km), 1)
+    parts = parts.astype(int)
+
+    edges = np.repeat(np.arange(len(parts)), parts)
+    fractions = (np.arange(len(edges)) - np.repeat(np.cumsum(parts) - parts, parts)) / parts[edges]
+    new_lons, new_lats = to_lonlat(interpolate(points[edges], points[edges + 1], fractions))
+
+    # Keep inserted vertices on the side of the antimeridian of their edge: an edge may
+    # end exactly at +-180 degrees, where the sign of the longitude is ambiguous.
+    references = np.where(np.abs(lons[edges]) < 180, lons[edges], lons[edges + 1])
+    new_lons = references + (new_lons - references + 180) % 360 - 180
+    originals = fractions == 0
+    new_lons[originals] = lons[edges[originals]]
+    new_lats[originals] = lats[edges[originals]]
+    return np.append(new_lons, lons[-1]), np.append(new_lats, lats[-1])
+
+
+def densify_segments(segments, max_km):
+    """
+    Densify line segments given as lists of (lon, lat) tuples.
+
+    :param segments: List of segments, each a list of (lon, lat) tuples.
+    :param max_km: Maximum vertex spacing in km; segments are returned unchanged when it is not positive.
+    :return: List of densified segments.
+    """
+    if max_km <= 0:
+        return segments
+    densified = []
+    for segment in segments:
+        coordinates = np.asarray(segment, dtype=float).reshape(-1, 2)
+        lons, lats = densify(coordinates[:, 0], coordinates[:, 1], max_km)
+        densified.append(list(zip(lons.tolist(), lats.tolist())))
+    return densified
@@ -15,7 +15,36 @@ from qgis.core import (QgsVectorLayer, QgsFeature, QgsGeometry, QgsPointXY,
 from PyQt5.QtCore import QVariant, QDateTime
 from pyorbital.orbital import Orbital
 
-from .saver import ShpSaver, GpkgSaver, GeoJsonSaver, MemoryLayerSaver
+from .saver import FILE_SAVERS, MemoryLayerSaver
+from .cache import TrackCache, default_track_cache
+from .readers import omm_to_tle, tle_epoch
+from .geodesic import (MERIDIAN_PLANE, EQUATOR_PLANE, unit_vectors, to_lonlat, interpolate, plane_crossings,
+                       densify_segments)
+from .simplify import simplify_segments
+from .projection import TrackProjection
+from .track import (points_to_columns, columns_to_points, concat_columns, slice_columns, track_length,
+                    decimate_columns, eci_to_lonlatalt, state_vector_columns, EARTH_EQUATORIAL_RADIUS_KM, EARTH_GM)
+
+
+class RollingTrack:
+    """
+    State of an incrementally maintained track and its in-memory layers.
+
+    Holds the track columns for the current window together with the feature IDs
+    of the point layer and, for every line feature, the range of point indices it
+    covers, so the window can be advanced without rebuilding the layers.
+    """
+
+    def __init__(self, point_layer, line_layer, origin, step_minutes):
+        self.point_layer = point_layer
+        self.line_layer = line_layer
+        self.origin = origin                # Time the sampling grid is aligned to
+        self.step_minutes = step_minutes
+        self.columns = points_to_columns([])
+        self.point_fids = []                # Point feature IDs, aligned with columns
+        self.line_ranges = []               # [fid, first point index, last point index]
+        self.next_point_id = 0
+        self.next_line_id = 1
 
 
 class OrbitalLogicHandler:
@@ -26,8 +55,19 @@ class OrbitalLogicHandler:
     from TLE or OMM data.
     """
 
-    def __init__(self):
+    # Columns holding angles in degrees, blended along the shorter arc.
+    ANGULAR_COLUMNS = ('lon', 'azimuth', 'true_anomaly')
+
+    def __init__(self, track_cache=None, blend_minutes=0):
+        """
+        :param track_cache: TrackCache used to memoize computed tracks. Defaults to the
+                            process-wide cache shared by all handlers.
+        :param blend_minutes: Width of the window in which the positions of two consecutive
+                              element sets are blended when a track uses several of them.
+        """
         self.memory_saver = MemoryLayerSaver()
+        self.track_cache = track_cache if track_cache is not None else default_track_cache
+        self.blend_minutes = blend_minutes
 
     def get_line_segments(self, points):
         """
@@ -75,6 +115,265 @@ class OrbitalLogicHandler:
         return [QgsGeometry.fromPolylineXY([QgsPointXY(lon, lat) for lon, lat in seg])
                 for seg in segments]
 
+    def get_track_segments(self, columns, first_revolution=None, geodesic=False):
+        """
+        Split a track into line segments with a constant direction and revolution.
+
+        Segments end where the track crosses the antimeridian, where the latitude
+        turns (northernmost and southernmost points, which belong to both adjacent
+        segments) and at the ascending node, where a new revolution starts. All cut
+        points are found with array operations; the crossing vertices and times are
+        interpolated linearly between the neighbouring samples, or along the great
+        circle through them with geodesic=True.
+
+        :param columns: Dict of NumPy arrays keyed by the names in track.POINT_COLUMNS.
+        :param first_revolution: Revolution number of the first point; defaults to the first
+                                 value of the 'revolution' column, or 0 without it.
+        :param geodesic: Intersect the great circles between the samples with the antimeridian
+                         and the equator, which stays exact for coarse time steps.
+        :return: Tuple (segments, attributes): a list of lists of (lon, lat) tuples and a
+                 dict of arrays 'start_time', 'end_time', 'revolution' and 'ascending',
+                 one value per segment.
+        :raises ValueError: If the track is empty.
+        """
+        lons = np.asarray(columns['lon'], dtype=float)
+        lats = np.asarray(columns['lat'], dtype=float)
+        times = columns['time'].astype('datetime64[ms]').astype(np.int64)
+        if not len(lons):
+            raise ValueError("Points list is empty.")
+        if first_revolution is None:
+            first_revolution = int(columns['revolution'][0]) if 'revolution' in columns else 0
+        delta_lon = np.diff(lons)
+        delta_lat = np.diff(lats)
+
+        # Antimeridian crossings, with the fraction of the time step at which they happen.
+        dateline = np.flatnonzero(np.abs(delta_lon) > 180)
+        nodes, skipped_t = self._ascending_nodes(columns)
+        if geodesic:
+            points = unit_vectors(lons, lats)
+            dateline_t = plane_crossings(points[dateline], points[dateline + 1], MERIDIAN_PLANE)
+            nodes_t = plane_crossings(points[nodes], points[nodes + 1], EQUATOR_PLANE)
+        else:
+            dateline_t = (np.where(delta_lon[dateline] < 0, 180.0, -180.0) - lons[dateline]) / \
+                ((delta_lon[dateline] + 180) % 360 - 180)
+            nodes_t = np.divide(-lats[nodes], delta_lat[nodes], out=np.zeros(len(nodes)),
+                                where=delta_lat[nodes] != 0)
+        # Nodes within a step whose samples do not straddle the equator.
+        nodes_t = np.where(np.isnan(skipped_t), nodes_t, skipped_t)
+        # Latitude turning points: the direction changes at the sample itself.
+        direction = np.sign(delta_lat)
+        turns = np.flatnonzero(direction[:-1] * direction[1:] < 0) + 1
+
+        steps = np.concatenate((dateline, nodes, turns))
+        fractions = np.concatenate((dateline_t, nodes_t, np.zeros(len(turns))))
+        kinds = np.concatenate((np.zeros(len(dateline), int), np.ones(len(nodes), int), np.full(len(turns), 2)))
+        order = np.lexsort((fractions, steps))
+        steps, fractions, kinds = steps[order], fractions[order], kinds[order]
+        following_steps = steps + 1
+        wrapped_delta = (lons[following_steps] - lons[steps] + 180) % 360 - 180
+        if geodesic:
+            cut_lons, cut_lats = to_lonlat(interpolate(points[steps], points[following_steps], fractions))
+            at_sample = fractions == 0
+            cut_lons[at_sample], cut_lats[at_sample] = lons[steps[at_sample]], lats[steps[at_sample]]
+        else:
+            cut_lats = lats[steps] + fractions * (lats[following_steps] - lats[steps])
+            cut_lons = (lons[steps] + fractions * wrapped_delta + 180) % 360 - 180
+        cut_times = times[steps] + np.round(fractions * (times[following_steps] - times[steps])).astype(np.int64)
+        cut_edges = np.where(wrapped_delta > 0, 180.0, -180.0)
+
+        segments, starts, ends, revolutions = [], [times[0]], [], []
+        revolution = first_revolution
+        current = [(lons[0], lats[0])]
+        position = 1
+        for step, kind, lon, lat, moment, edge in zip(steps.tolist(), kinds.tolist(), cut_lons.tolist(),
+                                                      cut_lats.tolist(), cut_times.tolist(), cut_edges.tolist()):
+            current.extend(zip(lons[position:step + 1].tolist(), lats[position:step + 1].tolist()))
+            position = max(position, step + 1)
+            if kind == 0:
+                current.append((edge, lat))
+                following = [(-edge, lat)]
+            elif kind == 1:
+                if current[-1] != (lon, lat):
+                    current.append((lon, lat))
+                following = [(lon, lat)]
+            else:
+                following = [current[-1]]
+            if len(current) > 1:
+                segments.append(current)
+                ends.append(moment)
+                revolutions.append(revolution)
+                starts.append(moment)
+            else:
+                starts[-1] = moment
+            if kind == 1:
+                revolution += 1
+            current = following
+        current.extend(zip(lons[position:].tolist(), lats[position:].tolist()))
+        if len(current) > 1 or not segments:
+            segments.append(current)
+            ends.append(times[-1])
+            revolutions.append(revolution)
+        else:
+            starts.pop()
+
+        first_lats = np.array([segment[0][1] for segment in segments])
+        last_lats = np.array([segment[-1][1] for segment in segments])
+        return segments, {
+            'start_time': np.array(starts, dtype=np.int64).astype('datetime64[ms]'),
+            'end_time': np.array(ends, dtype=np.int64).astype('datetime64[ms]'),
+            'revolution': np.array(revolutions, dtype=np.int32),
+            'ascending': last_lats > first_lats,
+        }
+
+    @staticmethod
+    def _ascending_nodes(columns):
+        """
+        Find the time steps (i, i + 1) in which the track crosses the equator northbound.
+
+        A step shorter than half an orbit crosses it exactly when the latitude changes sign
+        from negative to non-negative. A longer step can skip a whole half of the orbit, so
+        there the argument of latitude u is followed instead: sin(lat) = sin(inc) sin(u) gives
+        two candidates for u at each sample, and the pair whose difference best matches the
+        advance of u over the step (from the mean motion given by the altitude and speed) is
+        taken. The step then holds a node if u wraps around.
+
+        :param columns: Dict of NumPy arrays keyed by the names in track.POINT_COLUMNS.
+        :return: Tuple (indices i, fractions): for nodes within a step whose samples do not
+                 straddle the equator, the fraction of the step at which u wraps, else NaN.
+        """
+        lats = np.asarray(columns['lat'], dtype=float)
+        crossing = (lats[:-1] < 0) & (lats[1:] >= 0)
+        fractions = np.full(len(crossing), np.nan)
+        if all(name in columns for name in ('alt', 'velocity', 'inclination')) and len(lats) > 1:
+            # Semi-major axis from the vis-viva equation, then the mean motion in degrees/s.
+            radii = EARTH_EQUATORIAL_RADIUS_KM + np.asarray(columns['alt'], dtype=float)
+            speeds = np.asarray(columns['velocity'], dtype=float)
+            axes = 1 / (2 / radii - speeds ** 2 / EARTH_GM)
+            motion = np.degrees(np.sqrt(EARTH_GM / np.abs(axes) ** 3))
+            seconds = np.diff(columns['time'].astype('datetime64[ms]').astype(np.int64)) / 1000
+            advance = (motion[:-1] + motion[1:]) / 2 * seconds
+            sin_inc = np.sin(np.radians(np.asarray(columns['inclination'], dtype=float)))
+            coarse = np.flatnonzero((advance >= 180) & (advance < 360) & (sin_inc[:-1] > 0))
+            if len(coarse):
+                asin = np.degrees(np.arcsin(np.clip(np.sin(np.radians(lats)) / sin_inc, -1, 1)))
+                # Candidates (northbound, southbound) for u at every sample, in [0, 360).
+                candidates = np.stack((asin % 360, (180 - asin) % 360), axis=1)
+                starts, ends = candidates[coarse], candidates[coarse + 1]
+                errors = np.abs((ends[:, None, :] - starts[:, :, None] - advance[coarse, None, None] + 180)
+                                % 360 - 180)
+                start = starts[np.arange(len(coarse)), errors.reshape(len(coarse), 4).argmin(axis=1) // 2]
+                wraps = start + advance[coarse] >= 360
+                crossing[coarse] = wraps
+                straddles = (lats[coarse] < 0) & (lats[coarse + 1] >= 0)
+                fractions[coarse] = np.where(wraps & ~straddles, (360 - start) / advance[coarse], np.nan)
+        nodes = np.flatnonzero(crossing)
+        return nodes, fractions[nodes]
+
+    def revolution_numbers(self, columns, first_revolution=0):
+        """
+        Number the revolution of every point of a track.
+
+        :param columns: Dict of NumPy arrays keyed by the names in track.POINT_COLUMNS.
+        :param first_revolution: Revolution number of the first point.
+        :return: Array of int32, incremented after every ascending node crossing.
+        """
+        steps = np.zeros(len(columns['lat']), dtype=np.int32)
+        steps[self._ascending_nodes(columns)[0] + 1] = 1
+        return first_revolution + np.cumsum(steps, dtype=np.int32)
+
+    def orbit_number(self, data, data_format, time):
+        """
+        Return the orbit number at a given time, counted from the revolution number of the elements.
+
+        :param data: TLE or OMM data.
+        :param data_format: 'TLE' or 'OMM'.
+        :param time: numpy.datetime64 or datetime.
+        :return: Orbit number (int) as computed by pyorbital.
+        """
+        tle_1, tle_2, _ = self.resolve_elements(data, data_format)
+        return Orbital("N", line1=tle_1, line2=tle_2).get_orbit_number(np.datetime64(time, 'us'))
+
+    def with_revolutions(self, columns, data, data_format):
+        """
+        Return the track columns with an absolute 'revolution' column added.
+
+        :param columns: Dict of NumPy arrays keyed by the names in track.POINT_COLUMNS.
+        :param data: TLE or OMM data the track was computed from.
+        :param data_format: 'TLE' or 'OMM'.
+        :return: New dict of columns (the cached arrays are shared, not copied).
+        """
+        first = self.orbit_number(data, data_format, columns['time'][0]) if len(columns['time']) else 0
+        return {**columns, 'revolution': self.revolution_numbers(columns, first)}
+
+    def get_revolution_lines(self, segments, attributes):
+        """
+        Merge track segments into one multi-line per revolution.
+
+        Consecutive segments of a revolution that share their end vertex are joined,
+        so the parts of a revolution are only split at the antimeridian.
+
+        :param segments: Segments from get_track_segments.
+        :param attributes: Segment attributes from get_track_segments.
+        :return: Tuple (revolutions, attributes): a list of lists of parts (lists of (lon, lat)
+                 tuples) and a dict of arrays 'start_time', 'end_time' and 'revolution'.
+        """
+        revolutions = attributes['revolution']
+        firsts = np.flatnonzero(np.concatenate(([True], revolutions[1:] != revolutions[:-1])))
+        lasts = np.concatenate((firsts[1:], [len(revolutions)])) - 1
+        lines = []
+        for first, last in zip(firsts.tolist(), lasts.tolist()):
+            parts = [list(segments[first])]
+            for segment in segments[first + 1:last + 1]:
+                if parts[-1][-1] == segment[0]:
+                    parts[-1].extend(segment[1:])
+                else:
+                    parts.append(list(segment))
+            lines.append(parts)
+        return lines, {
+            'start_time': attributes['start_time'][firsts],
+            'end_time': attributes['end_time'][lasts],
+            'revolution': revolutions[firsts],
+        }
+
+    def generate_track_segments(self, columns, first_revolution=None, per_revolution=False, simplify_km=0,
+                                densify_km=0, projection=None):
+        """
+        Generate line geometries with segment attributes for a columnar track.
+
+        :param columns: Dict of NumPy arrays keyed by the names in track.POINT_COLUMNS.
+        :param first_revolution: Revolution number of the first point (see get_track_segments).
+        :param per_revolution: Emit one multi-line feature per revolution instead of one per segment.
+        :param simplify_km: Tolerance of the Douglas-Peucker simplification in km on the ground
+                            (0 keeps every vertex). Segment ends, and so the attribute boundaries, are kept.
+        :param densify_km: Maximum vertex spacing in km of great-circle densification (0 keeps the
+                           samples only). When set, the cut points are computed on great circles too.
+        :param projection: Optional projection.TrackProjection: the track is split at the cut of
+                           its CRS instead of the antimeridian and the geometries are in its CRS.
+        :return: Tuple (geometries, attributes) as for get_track_segments or get_revolution_lines.
+        """
+        if projection is not None:
+            columns = projection.shift_columns(columns)
+        segments, attributes = self.get_track_segments(columns, first_revolution, geodesic=densify_km > 0)
+        # Densified lines follow great circles between the kept vertices, the others are
+        # drawn straight in longitude/latitude: simplify against the line actually written.
+        segments = densify_segments(simplify_segments(segments, simplify_km, geodesic=densify_km > 0), densify_km)
+        if per_revolution:
+            lines, attributes = self.get_revolution_lines(segments, attributes)
+        else:
+            lines = [[segment] for segment in segments]
+        if projection is not None:
+            # A part may lose vertices outside the domain of the CRS and fall apart.
+            lines = [projection.project_parts(parts) for parts in lines]
+
+        geometries = []
+        for parts in lines:
+            if len(parts) == 1 and not per_revolution:
+                geometries.append(QgsGeometry.fromPolylineXY([QgsPointXY(x, y) for x, y in parts[0]]))
+            else:
+                geometries.append(QgsGeometry.fromMultiPolylineXY([[QgsPointXY(x, y) for x, y in part]
+                                                                   for part in parts]))
+        return geometries, attributes
+
     def compute_orbital_parameters(self, orb, times, inc):
         """
         Compute orbital parameters for given times.
@@ -84,8 +383,21 @@ class OrbitalLogicHandler:
         :param inc: Orbital inclination (degrees).
         :return: List of tuples (datetime, lon, lat, alt, velocity, azimuth, elevation, true_anomaly, inc).
         """
+        return columns_to_points(self.compute_orbital_columns(orb, times, inc))
+
+    def compute_orbital_columns(self, orb, times, inc, state_vectors=False):
+        """
+        Compute orbital parameters for given times in columnar form.
+
+        :param orb: Orbital object initialized with TLE data.
+        :param times: Array of numpy.datetime64 times.
+        :param inc: Orbital inclination (degrees).
+        :param state_vectors: Also return the columns in track.STATE_COLUMNS.
+        :return: Dict of NumPy arrays keyed by the names in track.POINT_COLUMNS.
+        """
         positions, velocities = orb.get_position(times, normalize=False)
-        lons, lats, alts = orb.get_lonlatalt(times)
+        # Geodetic coordinates of the same positions; get_lonlatalt would propagate again.
+        lons, lats, alts = eci_to_lonlatalt(*positions, times)
         velocity_norms = np.linalg.norm(velocities, axis=0)
 
         lats_rad = np.radians(lats)
@@ -115,11 +427,20 @@ class OrbitalLogicHandler:
                                   np.sqrt(1 - e) * np.cos(E / 2))
         true_anomaly = (np.degrees(true_anomaly) + 360) % 360
 
-        points = [(times[i].astype('datetime64[ms]').astype(datetime), lons[i], lats[i], alts[i],
-                velocity_norms[i], azimuth[i], elevation[i], true_anomaly[i], inc)
-                for i in range(len(times))]
-
-        return points
+        columns = {
+            'time': np.asarray(times).astype('datetime64[ms]'),
+            'lon': np.asarray(lons, dtype=float),
+            'lat': np.asarray(lats, dtype=float),
+            'alt': np.asarray(alts, dtype=float),
+            'velocity': np.asarray(velocity_norms, dtype=float),
+            'azimuth': np.asarray(azimuth, dtype=float),
+            'elevation': np.asarray(elevation, dtype=float),
+            'true_anomaly': np.asarray(true_anomaly, dtype=float),
+            'inclination': np.full(len(times), float(inc) if inc is not None else np.nan),
+        }
+        if state_vectors:
+            columns.update(state_vector_columns(positions, velocities, times, lons, lats))
+        return columns
 
     def generate_points(self, data, data_format, track_day, step_minutes):
         """
@@ -132,18 +453,143 @@ class OrbitalLogicHandler:
         :return: List of tuples (datetime, lon, lat, alt, velocity, azimuth, elevation, true_anomaly).
         :raises ValueError: If data format is invalid or data is malformed.
         """
+        return columns_to_points(self.generate_track(data, data_format, track_day, step_minutes))
+
+    def generate_track(self, data, data_format, track_day, step_minutes, state_vectors=False):
+        """
+        Generate the orbital track for a day in columnar form.
+
+        :param data: TLE tuple (tle_1, tle_2, orb_incl) or a list of OMM records.
+        :param data_format: 'TLE' or 'OMM'.
+        :param track_day: Date for track computation.
+        :param step_minutes: Time step in minutes.
+        :param state_vectors: Also compute the columns in track.STATE_COLUMNS.
+        :return: Dict of read-only NumPy arrays keyed by the names in track.POINT_COLUMNS.
+        :raises ValueError: If data format is invalid or data is malformed.
+        """
         start_time = datetime(track_day.year, track_day.month, track_day.day)
         end_time = start_time + timedelta(days=1)
-        step = timedelta(minutes=step_minutes)
-        num_steps = int((end_time - start_time) / step)
-        start_time_np = np.datetime64(start_time)
-        step_np = np.timedelta64(int(step_minutes * 60 * 1e6), 'us')
-        times = start_time_np + np.arange(num_steps) * step_np
+        return self.generate_window(data, data_format, start_time, end_time, step_minutes, state_vectors)
+
+    def generate_window(self, data, data_format, start_time, end_time, step_minutes, state_vectors=False):
+        """
+        Generate the orbital track for an arbitrary time window in columnar form.
+
+        Results are memoized in the track cache, keyed by the TLE lines, the time
+        window and the step, so repeated runs with the same inputs skip propagation.
 
+        :param data: TLE tuple (tle_1, tle_2, orb_incl) or a list of OMM records.
+        :param data_format: 'TLE' or 'OMM'.
+        :param start_time: Start of the window (datetime, inclusive).
+        :param end_time: End of the window (datetime, exclusive).
+        :param step_minutes: Time step in minutes.
+        :param state_vectors: Also compute the columns in track.STATE_COLUMNS.
+        :return: Dict of read-only NumPy arrays keyed by the names in track.POINT_COLUMNS.
+        :raises ValueError: If data format is invalid or data is malformed.
+        """
+        element_sets = self.resolve_element_series(data, data_format)
+
+        key = TrackCache.make_key(*self._series_key(element_sets, state_vectors), start_time, end_time,
+                                  step_minutes)
+        columns = self.track_cache.get(key)
+        if columns is not None:
+            return columns
+
+        times = self._time_grid(start_time, end_time, step_minutes)
+        columns = self.compute_series_columns(element_sets, times, state_vectors)
+        return self.track_cache.put(key, columns)
+
+    def compute_series_columns(self, element_sets, times, state_vectors=False):
+        """
+        Compute a track from several element sets, each used around its own epoch.
+
+        Every time step is propagated once, with the element set whose epoch is nearest;
+        the switch points are the midpoints between consecutive epochs. When
+        blend_minutes is set, positions within that window around a switch point are
+        blended linearly between both element sets.
+
+        :param element_sets: List of tuples (tle_1, tle_2, inc) ordered by epoch.
+        :param times: Array of numpy.datetime64 times.
+        :param state_vectors: Also compute the columns in track.STATE_COLUMNS.
+        :return: Dict of NumPy arrays keyed by the names in track.POINT_COLUMNS.
+        """
+        orbitals = [Orbital("N", line1=tle_1, line2=tle_2) for tle_1, tle_2, _ in element_sets]
+        if len(element_sets) == 1:
+            return self.compute_orbital_columns(orbitals[0], times, element_sets[0][2], state_vectors)
+
+        times = np.asarray(times).astype('datetime64[us]')
+        epochs = np.array([tle_epoch(tle_1) for tle_1, _, _ in element_sets], dtype='datetime64[us]')
+        boundaries = epochs[:-1] + (epochs[1:] - epochs[:-1]) // 2
+        index = np.searchsorted(boundaries, times, side='right')
+
+        columns = None
+        for number in np.unique(index):
+            mask = index == number
+            part = self.compute_orbital_columns(orbitals[number], times[mask], element_sets[number][2],
+                                                state_vectors)
+            if columns is None:
+                columns = {name: np.empty(len(times), dtype=column.dtype) for name, column in part.items()}
+            for name, column in part.items():
+                columns[name][mask] = column
+        if columns is None:
+            return self.compute_orbital_columns(orbitals[0], times, element_sets[0][2], state_vectors)
+
+        if self.blend_minutes > 0:
+            half = np.timedelta64(int(self.blend_minutes * 30e6), 'us')
+            for number, boundary in enumerate(boundaries):
+                mask = (np.abs(times - boundary) < half) & ((index == number) | (index == number + 1))
+                if not mask.any():
+                    continue
+                window = times[mask]
+                before = self.compute_orbital_columns(orbitals[number], window, element_sets[number][2],
+                                                      state_vectors)
+                after = self.compute_orbital_columns(orbitals[number + 1], window, element_sets[number + 1][2],
+                                                     state_vectors)
+                weight = (window - (boundary - half)) / (2 * half)
+                for name in columns:
+                    if name != 'time':
+                        columns[name][mask] = self._blend(name, before[name], after[name], weight)
+        return columns
+
+    def _blend(self, name, before, after, weight):
+        if name not in self.ANGULAR_COLUMNS:
+            return before + weight * (after - before)
+        blended = before + weight * ((after - before + 180) % 360 - 180)
+        return (blended + 180) % 360 - 180 if name == 'lon' else blended % 360
+
+    def _series_key(self, element_sets, state_vectors=False):
+        """
+        Return the (tle_1, tle_2) pair identifying element sets in the track cache.
+
+        A single element set gives its own lines, so cache entries stay compatible.
+        Tracks with state vector columns are cached apart from those without.
+        """
+        tle_1 = "\n".join(element_set[0] for element_set in element_sets)
+        tle_2 = "\n".join(element_set[1] for element_set in element_sets)
+        if len(element_sets) > 1 and self.blend_minutes > 0:
+            tle_2 += f"\nblend={float(self.blend_minutes):g}"
+        if state_vectors:
+            tle_2 += "\nstate_vectors"
+        return tle_1, tle_2
+
+    @staticmethod
+    def resolve_elements(data, data_format):
+        """
+        Extract the TLE lines and inclination from TLE or OMM data.
+
+        Of several element sets, the first one is used.
+
+        :param data: TLE tuple (tle_1, tle_2, orb_incl), a list of such tuples or a list of OMM records.
+        :param data_format: 'TLE' or 'OMM'.
+        :return: Tuple (tle_1, tle_2, inc).
+        :raises ValueError: If data format is invalid or data is malformed.
+        """
         if data_format == 'TLE':
+            if isinstance(data, list) and data:
+                data = data[0]
             if not isinstance(data, tuple) or len(data) != 3:
                 raise ValueError("TLE data must be a tuple of (tle_1, tle_2, orb_incl).")
-            tle_1, tle_2, inc = data
+            return data
         elif data_format == 'OMM':
             if not isinstance(data, list) or not data:
                 raise ValueError("OMM data must be a non-empty list of records.")
@@ -152,34 +598,217 @@ class OrbitalLogicHandler:
             tle_2 = record.get("TLE_LINE2")
             inc = record.get("INCLINATION")
             if not tle_1 or not tle_2:
-                raise ValueError("OMM record missing TLE data.")
+                # Sources such as OMM CSV/XML only carry the mean elements.
+                tle_1, tle_2 = omm_to_tle(record)
+            return tle_1, tle_2, inc
         else:
             raise ValueError("Data format must be 'TLE' or 'OMM'.")
-        
-        orb = Orbital("N", line1=tle_1, line2=tle_2)
-        points = self.compute_orbital_parameters(orb, times, inc)
-        return points
-    
+
+    @staticmethod
+    def resolve_element_series(data, data_format):
+        """
+        Extract every element set from TLE or OMM data, ordered by epoch.
+
+        :param data: TLE tuple (tle_1, tle_2, orb_incl), a list of such tuples or a list of OMM records.
+        :param data_format: 'TLE' or 'OMM'.
+        :return: List of tuples (tle_1, tle_2, inc), one per distinct epoch.
+        :raises ValueError: If data format is invalid or data is malformed.
+        """
+        if isinstance(data, list) and data:
+            items = [[item] if data_format == 'OMM' else item for item in data]
+        else:
+            items = [data]
+        element_sets = {}
+        for item in items:
+            element_set = OrbitalLogicHandler.resolve_elements(item, data_format)
+            element_sets.setdefault(element_set[0][18:32], element_set)
+        return sorted(element_sets.values(), key=lambda element_set: tle_epoch(element_set[0]))
+
+    @staticmethod
+    def _time_grid(start_time, end_time, step_minutes, origin=None):
+        """
+        Build the array of sample times within [start_time, end_time).
+
+        :param start_time: Start of the window (datetime).
+        :param end_time: End of the window (datetime).
+        :param step_minutes: Time step in minutes.
+        :param origin: Optional datetime the grid is aligned to (defaults to start_time).
+        :return: Array of numpy.datetime64 times.
+        """
+        origin_np = np.datetime64(origin if origin is not None else start_time, 'us')
+        step_np = np.timedelta64(int(step_minutes * 60 * 1e6), 'us')
+        first = int(np.ceil((np.datetime64(start_time, 'us') - origin_np) / step_np))
+        last = int((np.datetime64(end_time, 'us') - origin_np) / step_np)
+        return origin_np + np.arange(first, last) * step_np
+
+    # ---------------- Incremental (Rolling Window) Methods ----------------
+
+    def create_rolling_layers(self, data, data_format, start_time, end_time, step_minutes,
+                              create_line_layer, layer_name=None):
+        """
+        Create in-memory layers for a rolling time window that can later be advanced
+        with advance_rolling_layers instead of being rebuilt.
+
+        :param data: TLE or OMM data.
+        :param data_format: 'TLE' or 'OMM'.
+        :param start_time: Start of the window (datetime).
+        :param end_time: End of the window (datetime).
+        :param step_minutes: Time step in minutes.
+        :param create_line_layer: Flag to create the line layer.
+        :param layer_name: Base layer name (defaults to "Orbital Track <format>").
+        :return: RollingTrack holding the layers and the track columns.
+        """
+        layer_name = layer_name or f"Orbital Track {data_format}"
+        columns = self.generate_window(data, data_format, start_time, end_time, step_minutes)
+        point_layer = self.memory_saver.save_points([], layer_name, step_minutes)
+        line_layer = None
+        if create_line_layer:
+            line_layer = self.memory_saver.save_lines([], f"{layer_name} Line")
+        rolling = RollingTrack(point_layer, line_layer, start_time, step_minutes)
+        self._append_rolling_points(rolling, columns)
+        return rolling
+
+    def advance_rolling_layers(self, rolling, data, data_format, start_time, end_time):
+        """
+        Move a rolling track to a new time window.
+
+        Points that fall before start_time are deleted, only the time steps after the
+        current tail are propagated, and the last line feature is extended in place.
+
+        :param rolling: RollingTrack returned by create_rolling_layers.
+        :param data: TLE or OMM data used for the new time steps.
+        :param data_format: 'TLE' or 'OMM'.
+        :param start_time: New start of the window (datetime).
+        :param end_time: New end of the window (datetime).
+        :return: Tuple (number of points removed, number of points added).
+        """
+        expired = int(np.searchsorted(rolling.columns['time'], np.datetime64(start_time, 'ms')))
+        if expired:
+            self._drop_rolling_points(rolling, expired)
+
+        grid_start = start_time
+        if track_length(rolling.columns):
+            last_time = rolling.columns['time'][-1].astype(datetime)
+            grid_start = max(start_time, last_time + timedelta(microseconds=1))
+        times = self._time_grid(grid_start, end_time, rolling.step_minutes, origin=rolling.origin)
+        if len(times):
+            element_sets = self.resolve_element_series(data, data_format)
+            self._append_rolling_points(rolling, self.compute_series_columns(element_sets, times))
+        return expired, len(times)
+
+    def _append_rolling_points(self, rolling, new_columns):
+        count = track_length(new_columns)
+        if not count:
+            return
+        old_count = track_length(rolling.columns)
+        fids = self.memory_saver.append_track(rolling.point_layer, new_columns, start_id=rolling.next_point_id)
+        rolling.point_fids.extend(fids)
+        rolling.next_point_id += count
+        rolling.columns = concat_columns(rolling.columns, new_columns)
+
+        if rolling.line_layer is None:
+            return
+        lons = rolling.columns['lon'][max(old_count - 1, 0):]
+        lats = rolling.columns['lat'][max(old_count - 1, 0):]
+        offset = max(old_count - 1, 0)
+        segments = self.get_line_segments(list(zip(lons.tolist(), lats.tolist())))
+        ranges = self._segment_ranges(lons, offset)
+
+        provider = rolling.line_layer.dataProvider()
+        if old_count and rolling.line_ranges:
+            # The first segment continues the last line feature: extend it at the tail.
+            fid, first, _ = rolling.line_ranges[-1]
+            tail = rolling.line_layer.getFeature(fid).geometry().asPolyline()
+            tail.extend(QgsPointXY(lon, lat) for lon, lat in segments[0][1:])
+            provider.changeGeometryValues({fid: QgsGeometry.fromPolylineXY(tail)})
+            rolling.line_ranges[-1] = [fid, first, ranges[0][1]]
+            segments, ranges = segments[1:], ranges[1:]
+
+        if segments:
+            fids = self.memory_saver.append_lines(
+                rolling.line_layer,
+                [QgsGeometry.fromPolylineXY([QgsPointXY(lon, lat) for lon, lat in seg]) for seg in segments],
+                start_id=rolling.next_line_id
+            )
+            rolling.next_line_id += len(fids)
+            rolling.line_ranges.extend([fid, first, last] for fid, (first, last) in zip(fids, ranges))
+        rolling.line_layer.updateExtents()
+        rolling.line_layer.triggerRepaint()
+
+    def _drop_rolling_points(self, rolling, expired):
+        count = track_length(rolling.columns)
+        rolling.point_layer.dataProvider().deleteFeatures(rolling.point_fids[:expired])
+        rolling.point_layer.updateExtents()
+        rolling.point_layer.triggerRepaint()
+        del rolling.point_fids[:expired]
+
+        if rolling.line_layer is not None:
+            deleted, changed, kept = [], {}, []
+            for fid, first, last in rolling.line_ranges:
+                if last < expired:
+                    deleted.append(fid)
+                    continue
+                if first < expired:
+                    # Rebuild the head feature from the first surviving point, keeping the
+                    # interpolated dateline vertex at its end if the next point crosses it.
+                    end = min(last + 2, count)
+                    lons = rolling.columns['lon'][expired:end].tolist()
+                    lats = rolling.columns['lat'][expired:end].tolist()
+                    head = self.get_line_segments(list(zip(lons, lats)))[0]
+                    if len(head) < 2:
+                        deleted.append(fid)
+                        continue
+                    changed[fid] = QgsGeometry.fromPolylineXY([QgsPointXY(lon, lat) for lon, lat in head])
+                    first = expired
+                kept.append([fid, first - expired, last - expired])
+            provider = rolling.line_layer.dataProvider()
+            if deleted:
+                provider.deleteFeatures(deleted)
+            if changed:
+                provider.changeGeometryValues(changed)
+            rolling.line_ranges = kept
+            rolling.line_layer.updateExtents()
+            rolling.line_layer.triggerRepaint()
+
+        rolling.columns = slice_columns(rolling.columns, expired, None)
+
+    @staticmethod
+    def _segment_ranges(lons, offset=0):
+        """
+        Return the (first, last) point indices covered by each segment that
+        get_line_segments produces for the given longitudes.
+        """
+        breaks = np.nonzero(np.abs(np.diff(lons)) > 180)[0] + 1
+        starts = np.concatenate(([0], breaks)) + offset
+        ends = np.concatenate((breaks - 1, [len(lons) - 1])) + offset
+        return list(zip(starts.tolist(), ends.tolist()))
+
+    @staticmethod
+    def lod_factors(lod_levels):
+        """
+        Normalize level-of-detail decimation factors.
+
+        :param lod_levels: Iterable of decimation factors.
+        :return: Sorted list of distinct factors, starting with 1 for the full track.
+        """
+        return [1] + sorted({int(factor) for factor in lod_levels or () if int(factor) > 1})
 
     def _adjust_output_path(self, output_path, file_format):
         """
         Adjust the output file path based on the file format.
 
         :param output_path: Original output path.
-        :param file_format: 'shp', 'gpkg', or 'geojson'.
+        :param file_format: Output format, one of saver.FILE_SAVERS.
         :return: Adjusted output file path.
         """
         base, ext = os.path.splitext(output_path)
-        if file_format == 'shp':
-            return f"{base}_line.shp"
-        elif file_format == 'gpkg':
-            return f"{base}_line.gpkg"
-        elif file_format == 'geojson':
-            return f"{base}_line.geojson"
+        return f"{base}_line.{file_format}"
 
     # ---------------- Unified High-Level Methods ----------------
 
-    def create_persistent_orbital_track(self, data, data_format, track_day, step_minutes, output_path, file_format, create_line_layer):
+    def create_persistent_orbital_track(self, data, data_format, track_day, step_minutes, output_path, file_format,
+                                        create_line_layer, revolution_lines=False, simplify_km=0, lod_levels=(),
+                                        densify_km=0, target_crs=None, state_vectors=False):
         """
         Create persistent orbital track shapefiles on disk.
 
@@ -188,32 +817,60 @@ class OrbitalLogicHandler:
         :param track_day: Date for track computation.
         :param step_minutes: Time step in minutes.
         :param output_path: Output path for the points file.
-        :param file_format: 'shp', 'gpkg', or 'geojson'.
+        :param file_format: Output format, one of saver.FILE_SAVERS ('shp', 'gpkg', 'geojson', 'parquet', ...).
+        :param revolution_lines: Write one line feature per revolution instead of one per segment.
+        :param simplify_km: Line simplification tolerance in km (0 keeps every vertex).
+        :param lod_levels: Decimation factors of extra level-of-detail tables (e.g. (4, 16)),
+                           GeoPackage output only.
+        :param densify_km: Maximum vertex spacing in km of great-circle line densification (0 = off).
+        :param target_crs: CRS to write the layers in (e.g. 'EPSG:3413'), None for WGS 84.
+        :param state_vectors: Add the ECI/ECEF state vector and ground speed fields to the points.
         :return: Tuple (points_file, line_file).
         """
-        points = self.generate_points(data, data_format, track_day, step_minutes)
-
-        if file_format == 'shp':
-            saver = ShpSaver()
-        elif file_format == 'gpkg':
-            saver = GpkgSaver()
-        elif file_format == 'geojson':
-            saver = GeoJsonSaver()
-        else:
+        saver_class = FILE_SAVERS.get(file_format)
+        if saver_class is None:
             raise ValueError("Unsupported file format")
-
-        saver.save_points(points, output_path)
+        saver = saver_class()
+        columns = self.with_revolutions(self.generate_track(data, data_format, track_day, step_minutes,
+                                                            state_vectors or saver.USES_STATE_VECTORS),
+                                        data, data_format)
+        projection = None
+        if target_crs:
+            if not saver.SUPPORTS_CRS:
+                raise ValueError(f"The {file_format} output is always written in WGS 84.")
+            projection = TrackProjection(target_crs)
+            saver.crs = projection.crs
+            columns = projection.project_columns(columns)
+
+        factors = self.lod_factors(lod_levels)
+        if len(factors) > 1:
+            if not hasattr(saver, 'save_track_levels'):
+                raise ValueError("Level-of-detail tables require GeoPackage output.")
+            levels = [(factor, decimate_columns(columns, factor)) for factor in factors]
+            saver.save_track_levels(levels, output_path)
+        else:
+            levels = [(1, columns)]
+            saver.save_track(columns, output_path)
         
         line_file = None
         if create_line_layer:
-            geometries = self.generate_line_geometries([(pt[1], pt[2]) for pt in points])
+            line_levels = [(factor, *self.generate_track_segments(level_columns, per_revolution=revolution_lines,
+                                                                   simplify_km=simplify_km, densify_km=densify_km,
+                                                                   projection=projection))
+                           for factor, level_columns in levels]
             line_output_path = self._adjust_output_path(output_path, file_format)
-            saver.save_lines(geometries, line_output_path)
+            if len(line_levels) > 1:
+                saver.save_lines_levels(line_levels, line_output_path)
+            else:
+                _, geometries, segments = line_levels[0]
+                saver.save_lines(geometries, line_output_path, segments)
             line_file = line_output_path
 
         return output_path, line_file
 
-    def create_in_memory_layers(self, data, data_format, track_day, step_minutes, create_line_layer):
+    def create_in_memory_layers(self, data, data_format, track_day, step_minutes, create_line_layer,
+                                revolution_lines=False, simplify_km=0, densify_km=0, target_crs=None,
+                                state_vectors=False):
         """
         Create temporary in-memory QGIS layers.
 
@@ -221,14 +878,27 @@ class OrbitalLogicHandler:
         :param data_format: 'TLE' or 'OMM'.
         :param track_day: Date for track computation.
         :param step_minutes: Time step in minutes.
+        :param revolution_lines: Create one line feature per revolution instead of one per segment.
+        :param simplify_km: Line simplification tolerance in km (0 keeps every vertex).
+        :param densify_km: Maximum vertex spacing in km of great-circle line densification (0 = off).
+        :param target_crs: CRS of the created layers (e.g. 'EPSG:3413'), None for WGS 84.
+        :param state_vectors: Add the ECI/ECEF state vector and ground speed fields to the points.
         :return: Tuple (point_layer, line_layer).
         """
-        points = self.generate_points(data, data_format, track_day, step_minutes)
-        point_layer = self.memory_saver.save_points(points, f"Orbital Track {data_format}")
+        columns = self.with_revolutions(self.generate_track(data, data_format, track_day, step_minutes,
+                                                            state_vectors), data, data_format)
+        projection = TrackProjection(target_crs) if target_crs else None
+        if projection is not None:
+            columns = projection.project_columns(columns)
+        crs = projection.crs if projection is not None else None
+        point_layer = self.memory_saver.save_track(columns, f"Orbital Track {data_format}", step_minutes, crs=crs)
         line_layer = None
         if create_line_layer:
-            geometries = self.generate_line_geometries([(pt[1], pt[2]) for pt in points])
-            line_layer = self.memory_saver.save_lines(geometries, f"Orbital Track {data_format} Line")
+            geometries, segments = self.generate_track_segments(columns, per_revolution=revolution_lines,
+                                                                simplify_km=simplify_km, densify_km=densify_km,
+                                                                projection=projection)
+            line_layer = self.memory_saver.save_lines(geometries, f"Orbital Track {data_format} Line", segments,
+                                                      crs=crs)
         return point_layer, line_layer
 
 def solve_kepler_newton(M, e, tol=1e-6, max_iter=100):
@@ -0,0 +1,161 @@
+"""
+This module contains the LivePositionLayer class which shows the current position
+of tracked satellites in an in-memory layer that is refreshed on a timer.
+"""
+
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+from qgis.core import QgsVectorLayer, QgsFeature, QgsGeometry, QgsPointXY, QgsField
+from qgis.PyQt.QtCore import QTimer, QVariant, QDateTime, Qt
+from pyorbital.orbital import Orbital
+
+from .track import eci_to_lonlatalt
+
+try:
+    from sgp4.api import Satrec, SatrecArray, jday
+except ImportError:  # sgp4 is optional, pyorbital is used per object without it
+    SatrecArray = None
+
+
+class LivePositionLayer:
+    """
+    In-memory point layer with the current position of every tracked object.
+
+    On each tick the "now" instant is propagated for all objects at once and the
+    existing features are updated in place through changeGeometryValues and
+    changeAttributeValues, so the layer is never recreated.
+    """
+
+    def __init__(self, layer_name="Live positions", interval_seconds=5, frame_budget_ms=16,
+                 log_callback=None):
+        """
+        :param layer_name: Name of the layer.
+        :param interval_seconds: Update interval in seconds.
+        :param frame_budget_ms: Update duration above which a warning is logged.
+        :param log_callback: Optional callable (message, level) used for logging.
+        """
+        self.layer = QgsVectorLayer("Point?crs=EPSG:4326", layer_name, "memory")
+        provider = self.layer.dataProvider()
+        provider.addAttributes([
+            QgsField("Name", QVariant.String),
+            QgsField("Date_Time", QVariant.DateTime),
+            QgsField("Latitude", QVariant.Double),
+            QgsField("Longitude", QVariant.Double),
+            QgsField("Altitude", QVariant.Double),
+        ])
+        self.layer.updateFields()
+
+        self.frame_budget_ms = frame_budget_ms
+        self.log_callback = log_callback
+        self.last_update_ms = 0.0
+        self._names = []
+        self._fids = []
+        self._satrecs = None
+        self._orbitals = []
+
+        self.timer = QTimer()
+        self.timer.setInterval(int(interval_seconds * 1000))
+        self.timer.timeout.connect(self.update)
+
+    def set_objects(self, objects):
+        """
+        Replace the tracked objects.
+
+        :param objects: List of tuples (name, tle_1, tle_2).
+        """
+        provider = self.layer.dataProvider()
+        if self._fids:
+            provider.deleteFeatures(self._fids)
+
+        self._names = [name for name, _, _ in objects]
+        if SatrecArray is not None:
+            self._satrecs = SatrecArray([Satrec.twoline2rv(tle_1, tle_2) for _, tle_1, tle_2 in objects]) \
+                if objects else None
+        else:
+            self._orbitals = [Orbital(str(name), line1=tle_1, line2=tle_2) for name, tle_1, tle_2 in objects]
+
+        features = []
+        for name in self._names:
+            feat = QgsFeature(self.layer.fields())
+            feat.setAttribute("Name", str(name))
+            feat.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(0, 0)))
+            features.append(feat)
+        _, added = provider.addFeatures(features)
+        self._fids = [feat.id() for feat in added] if features else []
+        self.update()
+
+    def start(self):
+        """
+        Start periodic updates.
+        """
+        self.timer.start()
+
+    def stop(self):
+        """
+        Stop periodic updates.
+        """
+        self.timer.stop()
+
+    def is_running(self):
+        return self.timer.isActive()
+
+    def propagate_now(self, now=None):
+        """
+        Compute the current position of all tracked objects.
+
+        :param now: Time to propagate to (UTC datetime), defaults to the current time.
+        :return: Tuple (lon, lat, alt) of arrays, one element per object; NaN for objects
+                 that could not be propagated.
+        """
+        now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+        times = np.full(len(self._names), np.datetime64(now, 'us'))
+        if SatrecArray is not None:
+            jd, fr = jday(now.year, now.month, now.day, now.hour, now.minute,
+                          now.second + now.microsecond / 1e6)
+            errors, positions, _ = self._satrecs.sgp4(np.array([jd]), np.array([fr]))
+            positions = positions[:, 0, :].copy()
+            # Decayed objects and other propagation errors have no position.
+            positions[errors[:, 0] != 0] = np.nan
+            x, y, z = positions.T
+        else:
+            positions = np.array([orb.get_position(now, normalize=False)[0] for orb in self._orbitals])
+            x, y, z = positions.T
+        return eci_to_lonlatalt(x, y, z, times)
+
+    def update(self, now=None):
+        """
+        Move every feature to the current position of its object.
+
+        :param now: Time to propagate to (UTC datetime), defaults to the current time.
+        """
+        if not self._fids:
+            return
+        started = time.perf_counter()
+        now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+        lons, lats, alts = self.propagate_now(now)
+
+        fields = self.layer.fields()
+        time_idx = fields.indexOf("Date_Time")
+        lat_idx = fields.indexOf("Latitude")
+        lon_idx = fields.indexOf("Longitude")
+        alt_idx = fields.indexOf("Altitude")
+        qdt = QDateTime.fromMSecsSinceEpoch(int(now.replace(tzinfo=timezone.utc).timestamp() * 1000), Qt.UTC)
+
+        provider = self.layer.dataProvider()
+        provider.changeGeometryValues({
+            fid: QgsGeometry.fromPointXY(QgsPointXY(lon, lat)) if np.isfinite(lon) else QgsGeometry()
+            for fid, lon, lat in zip(self._fids, lons.tolist(), lats.tolist())
+        })
+        provider.changeAttributeValues({
+            fid: {time_idx: qdt, lat_idx: lat, lon_idx: lon, alt_idx: alt}
+            for fid, lon, lat, alt in zip(self._fids, lons.tolist(), lats.tolist(), alts.tolist())
+        })
+        self.layer.updateExtents()
+        self.layer.triggerRepaint()
+
+        self.last_update_ms = (time.perf_counter() - started) * 1000
+        if self.last_update_ms > self.frame_budget_ms and self.log_callback:
+            self.log_callback(f"Live position update for {len(self._fids)} objects took "
+                              f"{self.last_update_ms:.1f} ms.", "DEBUG")
@@ -10,6 +10,7 @@ import logging
 
 from .spacetrack_client import SpacetrackClientWrapper
 from .handler import OrbitalLogicHandler
+from .readers import iter_tle, iter_omm
 
 
 class OrbitalOrchestrator:
@@ -17,16 +18,20 @@ class OrbitalOrchestrator:
     Orchestrates the process of retrieving TLE/OMM data and generating orbital tracks.
     """
 
-    def __init__(self, username, password, log_callback=None):
+    def __init__(self, username, password, log_callback=None, client=None, logic_handler=None):
         """
         Initialize with SpaceTrack credentials.
         
         :param username: SpaceTrack login.
         :param password: SpaceTrack password.
+        :param log_callback: Optional callable (message, level) used for UI logging.
+        :param client: Optional SpacetrackClientWrapper to reuse instead of creating a new one.
+        :param logic_handler: Optional OrbitalLogicHandler to reuse instead of creating a new one.
         """
-        self.client = SpacetrackClientWrapper(username, password)
-        self.logic_handler = OrbitalLogicHandler()
+        self.client = client if client is not None else SpacetrackClientWrapper(username, password)
+        self.logic_handler = logic_handler if logic_handler is not None else OrbitalLogicHandler()
         self.log_callback = log_callback
+        self.last_data = None
         self._init_logger()
         self._log("OrbitalOrchestrator initialized", "DEBUG")
 
@@ -56,23 +61,33 @@ class OrbitalOrchestrator:
         if self.log_callback:
             self.log_callback(message, level)
             
-    def _load_local_data(self, file_path, data_format):
+    def _load_local_data(self, file_path, data_format, sat_id=None, epoch_series=False):
         try:
             if data_format == 'TLE':
-                # Read TLE data from file
-                with open(file_path, 'r') as f:
-                    lines = f.readlines()
-                    if len(lines) < 2:
-                        raise ValueError("TLE file must contain at least two lines.")
-                    tle_line1 = lines[0].strip()
-                    tle_line2 = lines[1].strip()
-                    orb_incl = float(tle_line2[8:16])
+                # Stream TLE records from the file, stopping at the first match
+                records = iter_tle(file_path, norad_id=sat_id)
+                record = next(records, None)
+                if record is None:
+                    raise ValueError(f"No TLE for satellite {sat_id} found in file." if sat_id
+                                     else "TLE file must contain at least one element set.")
+                _, tle_line1, tle_line2, orb_incl = record
+                if not epoch_series:
                     return (tle_line1, tle_line2, orb_incl)
+                # Keep every element set of the object for nearest-epoch selection
+                return [(tle_line1, tle_line2, orb_incl)] + [
+                    (line1, line2, incl) for _, line1, line2, incl in records if line1[2:7] == tle_line1[2:7]]
             elif data_format == 'OMM':
-                # Read OMM data from JSON file
-                with open(file_path, 'r') as f:
-                    omm_data = json.load(f)
-                return omm_data
+                # Stream OMM records (JSON, XML or CSV) of one object
+                records = iter_omm(file_path, norad_id=sat_id)
+                first = next(records, None)
+                if first is None:
+                    raise ValueError(f"No OMM record for satellite {sat_id} found in file." if sat_id
+                                     else "OMM file contains no records.")
+                if not epoch_series:
+                    return [first]
+                norad_id = str(first.get('NORAD_CAT_ID', '')).strip()
+                return [first] + [record for record in records
+                                  if str(record.get('NORAD_CAT_ID', '')).strip() == norad_id]
             else:
                 raise ValueError("Invalid data format.")
         except Exception as e:
@@ -80,11 +95,12 @@ class OrbitalOrchestrator:
             self._log(f"Error loading local data: {str(e)}", "ERROR")
             return None
 
-    def _retrieve_data(self, sat_id, track_day, data_format, save_data, output_path, local_file_path=None):
+    def _retrieve_data(self, sat_id, track_day, data_format, save_data, output_path, local_file_path=None,
+                       epoch_series=False):
         if local_file_path:
             # Load data from local file if path is provided
             self._log(f"Loading data from local file: {local_file_path}", "INFO")
-            data = self._load_local_data(local_file_path, data_format)
+            data = self._load_local_data(local_file_path, data_format, sat_id, epoch_series)
             if data and save_data:
                 if data_format == 'TLE':
                     self._save_tle_data(data, output_path)
@@ -94,12 +110,20 @@ class OrbitalOrchestrator:
             # Fetch data from SpaceTrack API
             self._log(f"Fetching data from SpaceTrack API for SatID: {sat_id}, Date: {track_day}", "INFO")
             use_latest = track_day > date.today()
+            # Past days can use every element set published around them
+            use_history = epoch_series and not use_latest
             if data_format == 'TLE':
-                data = self.client.get_tle(sat_id, track_day, latest=use_latest)
+                if use_history:
+                    data = self.client.get_tle_history(sat_id, track_day, track_day + datetime.timedelta(days=1))
+                else:
+                    data = self.client.get_tle(sat_id, track_day, latest=use_latest)
                 if save_data and data:
                     self._save_tle_data(data, output_path)
             elif data_format == 'OMM':
-                data = self.client.get_omm(sat_id, track_day, latest=use_latest)
+                if use_history:
+                    data = self.client.get_omm_history(sat_id, track_day, track_day + datetime.timedelta(days=1))
+                else:
+                    data = self.client.get_omm(sat_id, track_day, latest=use_latest)
                 if isinstance(data, str):
                     data = json.loads(data)
                 if save_data and data:
@@ -107,7 +131,8 @@ class OrbitalOrchestrator:
             else:
                 raise ValueError("Invalid data format. Choose 'TLE' or 'OMM'.")
         
-        return data if self._verify_data(data, data_format) else None
+        self.last_data = data if self._verify_data(data, data_format) else None
+        return self.last_data
     
     def _verify_data(self, data, data_format):
         """
@@ -129,8 +154,10 @@ class OrbitalOrchestrator:
         """
         output_path = os.path.splitext(output_path)[0]
         tle_filename = f"{output_path}_tle.txt"
+        element_sets = tle_data if isinstance(tle_data, list) else [tle_data]
         with open(tle_filename, 'w') as f:
-            f.write(f"{tle_data[0]}\n{tle_data[1]}\n")
+            for element_set in element_sets:
+                f.write(f"{element_set[0]}\n{element_set[1]}\n")
         self._log(f"TLE data saved to {tle_filename}", "INFO")
 
     def _save_omm_data(self, omm_data, output_path):
@@ -151,12 +178,15 @@ class OrbitalOrchestrator:
         :return: Tuple (points_file, line_file).
         """
         self._log(f"Processing persistent track for SatID: {config.sat_id}, Date: {config.track_day}, Format: {config.data_format}", "INFO")
-        data = self._retrieve_data(config.sat_id, config.track_day, config.data_format, config.save_data_path, config.output_path, config.data_file_path)
+        data = self._retrieve_data(config.sat_id, config.track_day, config.data_format, config.save_data_path, config.output_path, config.data_file_path,
+                                   config.epoch_series)
         if not data:
             return None
         return self.logic_handler.create_persistent_orbital_track(
             data, config.data_format, config.track_day, config.step_minutes,
-            config.output_path, config.file_format, config.create_line_layer
+            config.output_path, config.file_format, config.create_line_layer, config.revolution_lines,
+            config.simplify_km, config.lod_levels, config.densify_km, config.target_crs,
+            config.state_vectors
         )
 
     def process_in_memory_track(self, config):
@@ -164,6 +194,23 @@ class OrbitalOrchestrator:
         Generate temporary in-memory QGIS layers.
         """
         self._log(f"Processing in-memory track for SatID: {config.sat_id}, Date: {config.track_day}, Format: {config.data_format}", "INFO")
+        data = self.retrieve_data(config)
+        if not data:
+            return None
+        return self.logic_handler.create_in_memory_layers(data, config.data_format, config.track_day, config.step_minutes, config.create_line_layer,
+                                                          config.revolution_lines, config.simplify_km,
+                                                          config.densify_km, config.target_crs, config.state_vectors)
+
+    def retrieve_data(self, config):
+        """
+        Retrieve TLE/OMM data for a configuration without generating a track.
+
+        The data is saved next to save_data_path, or into the plugin data folder,
+        when config.save_data is set.
+
+        :param config: An OrbitalConfig instance containing all settings.
+        :return: TLE tuple or list of OMM records, or None if no data was received.
+        """
         plugin_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
         
         data_folder = os.path.join(plugin_dir, "data")
@@ -172,7 +219,5 @@ class OrbitalOrchestrator:
             self._log(f"Created data folder at: {data_folder}", "INFO")
         
         default_output_path = os.path.join(data_folder, f"{config.sat_id or 'local'}_{config.track_day.strftime('%Y%m%d')}")
-        data = self._retrieve_data(config.sat_id, config.track_day, config.data_format, config.save_data, config.save_data_path or default_output_path, config.data_file_path)
-        if not data:
-            return None
-        return self.logic_handler.create_in_memory_layers(data, config.data_format, config.track_day, config.step_minutes, config.create_line_layer)
+        return self._retrieve_data(config.sat_id, config.track_day, config.data_format, config.save_data, config.save_data_path or default_output_path, config.data_file_path,
+                                   config.epoch_series)
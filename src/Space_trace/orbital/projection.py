@@ -0,0 +1,174 @@
+"""
+This module contains the projection of tracks into a target coordinate reference system.
+
+Tracks are computed in WGS 84 longitude/latitude and split at the antimeridian.
+A projected CRS has its own discontinuity: cylindrical, pseudo-cylindrical and
+conic projections are cut at the meridian opposite their central meridian, and
+azimuthal projections leave out the part of the Earth they cannot represent.
+TrackProjection moves the split to the cut of the target CRS and transforms
+the coordinates in bulk, so layers can be written directly in that CRS.
+"""
+
+import numpy as np
+
+from qgis.core import (
+    QgsCoordinateReferenceSystem,
+    QgsCoordinateTransform,
+    QgsCoordinateTransformContext,
+    QgsCsException,
+    QgsLineString,
+    QgsPointXY
+)
+
+try:
+    import pyproj
+except ImportError:  # pyproj is optional, QgsCoordinateTransform is used without it
+    pyproj = None
+
+# PROJ projections without a cut meridian: azimuthal and transverse projections
+# are continuous around their centre and only lose points outside their domain.
+CONTINUOUS_PROJECTIONS = {
+    'stere', 'sterea', 'ups', 'laea', 'aeqd', 'ortho', 'gnom', 'nsper', 'tpers',
+    'tmerc', 'etmerc', 'utm', 'omerc', 'cass',
+}
+
+# Distance in degrees kept between the cut vertices and the cut meridian, so that
+# PROJ does not wrap them to the opposite edge of the map.
+SEAM_MARGIN = 1e-9
+
+
+def proj_parameters(crs):
+    """
+    Return the parameters of a CRS's PROJ string as a dict ('+proj=merc +lon_0=10' -> {'proj': 'merc', 'lon_0': '10'}).
+    """
+    parameters = {}
+    for token in crs.toProj().split():
+        key, _, value = token.lstrip('+').partition('=')
+        parameters[key] = value
+    return parameters
+
+
+class TrackProjection:
+    """
+    Split and transform track lines for a target CRS.
+    """
+
+    def __init__(self, crs):
+        """
+        :param crs: Target CRS as an authority code ('EPSG:3413'), a PROJ string or WKT.
+        :raises ValueError: If the CRS is not valid.
+        """
+        definition = crs.strip()
+        self.qgs_crs = QgsCoordinateReferenceSystem(f"PROJ:{definition}" if definition.startswith('+')
+                                                    else definition)
+        if not self.qgs_crs.isValid():
+            raise ValueError(f"Invalid target CRS: {crs}")
+        # Definition for QgsCoordinateReferenceSystem, passed on to the savers.
+        self.crs = self.qgs_crs.authid() or self.qgs_crs.toWkt()
+
+        parameters = proj_parameters(self.qgs_crs)
+        if parameters.get('proj') in CONTINUOUS_PROJECTIONS:
+            self.central_meridian = 0.0
+            self.seam = None
+        else:
+            self.central_meridian = (float(parameters.get('lon_0', 0)) + 180) % 360 - 180
+            # Longitude of the cut meridian in [-180, 180).
+            self.seam = self.central_meridian % 360 - 180
+
+        source = QgsCoordinateReferenceSystem("EPSG:4326")
+        self._transform = QgsCoordinateTransform(source, self.qgs_crs, QgsCoordinateTransformContext())
+        self._transformer = (pyproj.Transformer.from_crs("EPSG:4326", self.qgs_crs.toWkt(), always_xy=True)
+                             if pyproj is not None else None)
+
+    def shift_columns(self, columns):
+        """
+        Rotate the longitudes of a columnar track so that the cut meridian of the CRS lies at +-180 degrees.
+
+        Splitting the rotated track at the antimeridian splits it at the cut of the CRS;
+        project_parts rotates the coordinates back.
+
+        :param columns: Dict of NumPy arrays keyed by the names in track.POINT_COLUMNS.
+        :return: A new dict with the rotated 'lon' column.
+        """
+        if self.seam is None or self.seam == -180:
+            return columns
+        # Longitudes measured eastward from the seam, so that it falls on -180 (and +180).
+        return dict(columns, lon=(np.asarray(columns['lon'], dtype=float) - self.seam) % 360 - 180)
+
+    def transform(self, lons, lats):
+        """
+        Transform longitudes and latitudes into the target CRS.
+
+        :param lons: Longitudes in degrees.
+        :param lats: Latitudes in degrees.
+        :return: Tuple (xs, ys) of float arrays, NaN for points outside the domain of the CRS.
+        """
+        lons = np.asarray(lons, dtype=float)
+        lats = np.asarray(lats, dtype=float)
+        if self._transformer is not None:
+            xs, ys = self._transformer.transform(lons, lats, errcheck=False)
+            xs, ys = np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)
+        else:
+            xs, ys = self._qgs_transform(lons, lats)
+        invalid = ~(np.isfinite(xs) & np.isfinite(ys))
+        xs[invalid] = ys[invalid] = np.nan
+        return xs, ys
+
+    def _qgs_transform(self, lons, lats):
+        if not len(lons):
+            return np.empty(0), np.empty(0)
+        line = QgsLineString(lons.tolist(), lats.tolist())
+        try:
+            line.transform(self._transform)
+            return np.array(line.xVector(), dtype=float), np.array(line.yVector(), dtype=float)
+        except QgsCsException:
+            # Some points are outside the domain of the CRS: transform them one by one.
+            xs = np.full(len(lons), np.nan)
+            ys = np.full(len(lons), np.nan)
+            for i, (lon, lat) in enumerate(zip(lons.tolist(), lats.tolist())):
+                try:
+                    point = self._transform.transform(QgsPointXY(lon, lat))
+                except QgsCsException:
+                    continue
+                xs[i], ys[i] = point.x(), point.y()
+            return xs, ys
+
+    def project_columns(self, columns):
+        """
+        Add the projected coordinates of a columnar track as the 'x' and 'y' columns.
+
+        :param columns: Dict of NumPy arrays keyed by the names in track.POINT_COLUMNS (not shifted).
+        :return: A new dict with the additional columns.
+        """
+        xs, ys = self.transform(columns['lon'], columns['lat'])
+        return dict(columns, x=xs, y=ys)
+
+    def project_parts(self, parts):
+        """
+        Transform the parts of a line from rotated longitudes (see shift_columns) into the target CRS.
+
+        Parts are split where vertices cannot be projected; pieces with fewer than two
+        vertices are dropped.
+
+        :param parts: List of parts, each a list of (lon, lat) tuples.
+        :return: List of parts, each a list of (x, y) tuples.
+        """
+        sizes = [len(part) for part in parts]
+        if not sum(sizes):
+            return []
+        coordinates = np.concatenate([np.asarray(part, dtype=float).reshape(-1, 2) for part in parts])
+        lons = coordinates[:, 0]
+        if self.central_meridian:
+            lons = np.clip(lons, SEAM_MARGIN - 180, 180 - SEAM_MARGIN) + self.central_meridian
+        xs, ys = self.transform(lons, coordinates[:, 1])
+
+        projected = []
+        valid = np.isfinite(xs)
+        for start, stop in zip(np.cumsum(sizes) - sizes, np.cumsum(sizes)):
+            # Runs of valid vertices within the part.
+            edges = np.diff(np.concatenate(([False], valid[start:stop], [False])).astype(np.int8))
+            for first, last in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)):
+                if last - first > 1:
+                    projected.append(list(zip(xs[start + first:start + last].tolist(),
+                                              ys[start + first:start + last].tolist())))
+        return projected
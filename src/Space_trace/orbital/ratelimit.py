@@ -0,0 +1,227 @@
+"""
+This module contains the client-side rate limiters shared by all SpaceTrack clients.
+
+SpaceTrack allows at most 30 requests per minute and 300 requests per hour per
+account. The spacetrack library throttles each client instance on its own, so
+several clients (pooled, async, CLI jobs) could exceed the limits together; the
+limiter of an account is shared by all of its clients.
+"""
+
+import time
+import asyncio
+import random
+import threading
+
+try:
+    from qgis import utils as qgis_utils
+    from qgis.PyQt.QtCore import QCoreApplication, QThread
+except ImportError:
+    qgis_utils = None
+
+
+class RateLimitExceeded(Exception):
+    """
+    Raised instead of waiting for the rate limit on the QGIS GUI thread.
+    """
+
+    def __init__(self, delay):
+        """
+        :param delay: Seconds until the request could be sent.
+        """
+        super().__init__(f"SpaceTrack rate limit reached, try again in {delay:.0f} s.")
+        self.delay = delay
+
+
+def may_block():
+    """
+    Check whether the calling thread may sleep while waiting for SpaceTrack.
+
+    Sleeping on the GUI thread of QGIS desktop would freeze the whole application;
+    worker threads, asyncio loops and the command line tool may wait.
+
+    :return: False on the QGIS desktop GUI thread, True otherwise.
+    """
+    if qgis_utils is None or getattr(qgis_utils, 'iface', None) is None:
+        return True
+    app = QCoreApplication.instance()
+    return app is None or QThread.currentThread() != app.thread()
+
+
+class TokenBucket:
+    """
+    Token bucket allowing ``capacity`` requests per ``period`` seconds.
+
+    Tokens are reserved immediately, so concurrent callers queue up fairly: a
+    reservation beyond the available tokens returns the delay the caller has to wait.
+    """
+
+    def __init__(self, capacity, period):
+        """
+        :param capacity: Maximum number of requests per period (burst size).
+        :param period: Period length in seconds.
+        """
+        self.capacity = capacity
+        self.rate = capacity / period
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    def reserve(self, now):
+        """
+        Take one token.
+
+        :param now: Current time.monotonic() value.
+        :return: Seconds to wait before the reserved request may be sent.
+        """
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        return max(0.0, -self._tokens / self.rate)
+
+    def release(self):
+        """
+        Give back the token of a reservation that will not be used.
+        """
+        self._tokens = min(self.capacity, self._tokens + 1)
+
+
+class RateLimiter:
+    """
+    Combines several token buckets and records metrics about throttling and retries.
+    """
+
+    def __init__(self, limits=((30, 60), (300, 3600))):
+        """
+        :param limits: Iterable of (requests, period seconds) pairs.
+        """
+        self._buckets = [TokenBucket(capacity, period) for capacity, period in limits]
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.throttled_requests = 0
+        self.throttled_seconds = 0.0
+        self.retries = 0
+
+    def _reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = max(bucket.reserve(now) for bucket in self._buckets)
+            self.requests += 1
+            if delay > 0:
+                self.throttled_requests += 1
+                self.throttled_seconds += delay
+            return delay
+
+    def _cancel(self, delay):
+        with self._lock:
+            for bucket in self._buckets:
+                bucket.release()
+            self.requests -= 1
+            if delay > 0:
+                self.throttled_requests -= 1
+                self.throttled_seconds -= delay
+
+    def acquire(self):
+        """
+        Block until a request may be sent.
+
+        :return: Seconds spent waiting.
+        :raises RateLimitExceeded: If the request would have to wait on the QGIS GUI thread.
+        """
+        delay = self._reserve()
+        if delay > 0:
+            if not may_block():
+                self._cancel(delay)
+                raise RateLimitExceeded(delay)
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self):
+        """
+        Wait without blocking the event loop until a request may be sent.
+
+        :return: Seconds spent waiting.
+        """
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def metrics(self):
+        """
+        :return: Dict with the request, throttling and retry counters.
+        """
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'throttled_requests': self.throttled_requests,
+                'throttled_seconds': round(self.throttled_seconds, 3),
+                'retries': self.retries,
+            }
+
+
+def backoff_delay(attempt, base_delay=2.0, max_delay=120.0, retry_after=None):
+    """
+    Compute the delay before a retry using exponential backoff with jitter.
+
+    :param attempt: Number of the retry (1 for the first retry).
+    :param base_delay: Delay of the first retry in seconds.
+    :param max_delay: Upper bound of the delay in seconds.
+    :param retry_after: Value of a Retry-After response header, if any.
+    :return: Delay in seconds.
+    """
+    if retry_after:
+        try:
+            return min(max_delay, float(retry_after))
+        except ValueError:
+            pass
+    delay = min(max_delay, base_delay * 2 ** (attempt - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+class AccountRateLimiters:
+    """
+    Keeps one RateLimiter per SpaceTrack account, as the limits apply per account.
+    """
+
+    def __init__(self, limits=((30, 60), (300, 3600))):
+        """
+        :param limits: Iterable of (requests, period seconds) pairs of every account.
+        """
+        self.limits = limits
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def get(self, username):
+        """
+        Return the limiter of an account, creating it on first use.
+
+        :param username: SpaceTrack account login (email).
+        :return: RateLimiter instance.
+        """
+        with self._lock:
+            limiter = self._limiters.get(username)
+            if limiter is None:
+                limiter = RateLimiter(self.limits)
+                self._limiters[username] = limiter
+            return limiter
+
+    def metrics(self):
+        """
+        :return: Dict with the counters of RateLimiter.metrics summed over all accounts.
+        """
+        with self._lock:
+            limiters = list(self._limiters.values())
+        totals = {'requests': 0, 'throttled_requests': 0, 'throttled_seconds': 0.0, 'retries': 0}
+        for limiter in limiters:
+            for key, value in limiter.metrics().items():
+                totals[key] += value
+        totals['throttled_seconds'] = round(totals['throttled_seconds'], 3)
+        return totals
+
+
+# Process-wide limiters shared by every SpaceTrack client of the plugin.
+default_rate_limiters = AccountRateLimiters()
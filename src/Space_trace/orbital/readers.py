@@ -0,0 +1,350 @@
+"""
+This module contains streaming readers for element set files.
+
+The readers are generators that consume the input line by line (or chunk by
+chunk), so files with thousands of objects are never loaded into memory at once
+and a search for one object stops as soon as it is found.
+"""
+
+import io
+import os
+import csv
+import json
+import math
+from datetime import date, datetime, timedelta
+from xml.etree import ElementTree
+
+# Size of the chunks read by the incremental JSON parser.
+JSON_CHUNK_SIZE = 64 * 1024
+
+
+def tle_checksum(line):
+    """
+    Compute the modulo-10 checksum of a TLE line.
+
+    Digits count as their value, minus signs as 1, every other character as 0.
+
+    :param line: TLE line (the checksum digit itself, column 69, is ignored).
+    :return: Checksum digit as int.
+    """
+    total = 0
+    for char in line[:68]:
+        if char.isdigit():
+            total += int(char)
+        elif char == '-':
+            total += 1
+    return total % 10
+
+
+def _check_line(line, number, line_no):
+    if len(line) < 68:
+        raise ValueError(f"Line {line_no}: TLE line {number} is too short.")
+    if len(line) >= 69 and line[68].isdigit() and int(line[68]) != tle_checksum(line):
+        raise ValueError(f"Line {line_no}: checksum mismatch in TLE line {number}.")
+
+
+def _open_text(source):
+    """
+    Return a text line iterator and whether it has to be closed by the caller.
+    """
+    if isinstance(source, (str, bytes)) or hasattr(source, '__fspath__'):
+        return io.open(source, 'r', encoding='utf-8', errors='replace'), True
+    return source, False
+
+
+def iter_tle(source, norad_id=None, validate=True):
+    """
+    Stream TLE records from a 2-line or 3-line (named) element set file.
+
+    :param source: File path, open text file or any iterable of lines.
+    :param norad_id: Optional NORAD ID; records of other objects are skipped
+                     without being validated.
+    :param validate: Check line lengths and checksums of the yielded records.
+    :return: Generator of tuples (name, tle_1, tle_2, inclination); name is None
+             for 2-line records.
+    :raises ValueError: If a yielded record is malformed.
+    """
+    wanted = None if norad_id is None else str(norad_id).strip().zfill(5)
+    lines, owned = _open_text(source)
+    try:
+        name = None
+        tle_1 = None
+        tle_1_no = 0
+        for line_no, raw in enumerate(lines, 1):
+            line = raw.rstrip('\r\n').rstrip()
+            if not line:
+                continue
+
+            if line.startswith('1 ') and len(line) >= 64:
+                tle_1, tle_1_no = line, line_no
+                continue
+            if line.startswith('2 ') and tle_1 is not None and line[2:7] == tle_1[2:7]:
+                record_name, tle_2 = name, line
+                first, first_no = tle_1, tle_1_no
+                name = tle_1 = None
+                if wanted is not None and first[2:7].replace(' ', '0') != wanted:
+                    continue
+                if validate:
+                    _check_line(first, 1, first_no)
+                    _check_line(tle_2, 2, line_no)
+                yield record_name, first, tle_2, float(tle_2[8:16])
+                continue
+
+            # Anything else is the name line of a 3-line record ("0 NAME" or plain "NAME").
+            name = line[2:].strip() if line.startswith('0 ') else line.strip()
+            tle_1 = None
+    finally:
+        if owned:
+            lines.close()
+
+
+def tle_epoch(tle_1):
+    """
+    Return the epoch of a TLE as a naive UTC datetime.
+
+    :param tle_1: First TLE line (epoch in columns 19-32, YYDDD.DDDDDDDD).
+    :return: datetime.
+    """
+    year = int(tle_1[18:20])
+    year += 2000 if year < 57 else 1900
+    return datetime(year, 1, 1) + timedelta(days=float(tle_1[20:32]) - 1)
+
+
+def read_tle(source, norad_id=None, validate=True):
+    """
+    Return the first TLE record of a file, optionally for a given object.
+
+    :return: Tuple (name, tle_1, tle_2, inclination) or None if nothing matches.
+    """
+    return next(iter_tle(source, norad_id, validate), None)
+
+
+def parse_epoch(value):
+    """
+    Parse an OMM epoch such as '2025-03-28T17:23:45.697344' into a naive UTC datetime.
+
+    :param value: Epoch string (ISO 8601, optional 'Z' suffix, any number of fraction digits).
+    :return: datetime.
+    """
+    value = str(value).strip().rstrip('Z').replace(' ', 'T')
+    if '.' in value:
+        value, fraction = value.split('.', 1)
+        value = f"{value}.{fraction[:6].ljust(6, '0')}"
+    return datetime.fromisoformat(value)
+
+
+def _as_datetime(value):
+    if value is None or isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return parse_epoch(value)
+
+
+def _tle_decimal(value):
+    """
+    Format a value below 1 as a TLE decimal with an implied leading zero (' .00032194').
+    """
+    return ('-' if value < 0 else ' ') + f"{abs(value):.8f}"[1:]
+
+
+def _tle_exponent(value):
+    """
+    Format a value in the TLE exponent notation (' 56484-3' for 0.56484e-3).
+    """
+    if value == 0:
+        return ' 00000-0'
+    exponent = math.floor(math.log10(abs(value))) + 1
+    mantissa = round(abs(value) / 10 ** exponent * 1e5)
+    if mantissa >= 100000:
+        mantissa //= 10
+        exponent += 1
+    return f"{'-' if value < 0 else ' '}{mantissa:05d}{'-' if exponent < 0 else '+'}{abs(exponent)}"
+
+
+def omm_to_tle(record):
+    """
+    Build the two TLE lines from the mean elements of an OMM record.
+
+    Used for OMM sources without TLE_LINE1/TLE_LINE2 (e.g. CSV or CCSDS XML exports).
+
+    :param record: OMM record dict.
+    :return: Tuple (tle_1, tle_2).
+    :raises ValueError: If a required element is missing.
+    """
+    def number(key, default=None):
+        value = record.get(key)
+        if value in (None, ''):
+            if default is None:
+                raise ValueError(f"OMM record is missing {key}.")
+            return default
+        return float(value)
+
+    norad_id = int(number('NORAD_CAT_ID'))
+    epoch = parse_epoch(record['EPOCH']) if record.get('EPOCH') else None
+    if epoch is None:
+        raise ValueError("OMM record is missing EPOCH.")
+    day_of_year = (epoch - datetime(epoch.year, 1, 1)).total_seconds() / 86400 + 1
+    object_id = str(record.get('OBJECT_ID') or '')
+    designator = object_id[2:4] + object_id[5:] if len(object_id) > 5 and object_id[4] == '-' else ''
+
+    tle_1 = (f"1 {norad_id:05d}{(record.get('CLASSIFICATION_TYPE') or 'U')[:1]} {designator:<8} "
+             f"{epoch.year % 100:02d}{day_of_year:012.8f} {_tle_decimal(number('MEAN_MOTION_DOT', 0.0))} "
+             f"{_tle_exponent(number('MEAN_MOTION_DDOT', 0.0))} {_tle_exponent(number('BSTAR', 0.0))} "
+             f"{int(number('EPHEMERIS_TYPE', 0.0))} {int(number('ELEMENT_SET_NO', 999.0)) % 10000:>4}")
+    eccentricity = round(number('ECCENTRICITY') * 1e7)
+    tle_2 = (f"2 {norad_id:05d} {number('INCLINATION'):8.4f} {number('RA_OF_ASC_NODE'):8.4f} "
+             f"{eccentricity:07d} {number('ARG_OF_PERICENTER'):8.4f} {number('MEAN_ANOMALY'):8.4f} "
+             f"{number('MEAN_MOTION'):11.8f}{int(number('REV_AT_EPOCH', 0.0)) % 100000:>5}")
+    return tle_1 + str(tle_checksum(tle_1)), tle_2 + str(tle_checksum(tle_2))
+
+
+def _iter_json(f):
+    """
+    Incrementally decode a JSON array of objects, or concatenated/line-delimited objects.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+    while True:
+        # Skip whitespace and the array punctuation between records.
+        while pos < len(buffer) and buffer[pos] in ' \t\r\n,[]':
+            pos += 1
+        if pos >= len(buffer):
+            if eof:
+                return
+            buffer = f.read(JSON_CHUNK_SIZE)
+            pos = 0
+            eof = not buffer
+            continue
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = f.read(JSON_CHUNK_SIZE)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+        pos = end
+        if pos > JSON_CHUNK_SIZE:
+            buffer = buffer[pos:]
+            pos = 0
+        if isinstance(value, list):
+            yield from value
+        else:
+            yield value
+
+
+def _local_name(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def _iter_xml(f):
+    """
+    Incrementally parse CCSDS OMM XML (<omm> elements) or SpaceTrack XML (<item> elements).
+
+    A standalone OMM document, whose root is the <omm> element, is one record.
+    Every leaf element becomes a key of the record; USER_DEFINED values are keyed by
+    their 'parameter' attribute.
+    """
+    depth = 0
+    record_depth = None
+    root = None
+    for event, element in ElementTree.iterparse(f, events=('start', 'end')):
+        name = _local_name(element.tag)
+        if event == 'start':
+            depth += 1
+            if root is None:
+                root = element
+            if record_depth is None and name in ('omm', 'item'):
+                record_depth = depth
+            continue
+
+        if depth == record_depth:
+            record = {}
+            for child in element.iter():
+                if len(child):
+                    continue
+                key = _local_name(child.tag)
+                if key == 'USER_DEFINED':
+                    key = child.get('parameter', key)
+                record[key] = (child.text or '').strip()
+            yield record
+            # Drop parsed records so the tree never grows with the file.
+            element.clear()
+            root.clear()
+            record_depth = None
+        depth -= 1
+
+
+def _iter_csv(f):
+    for row in csv.DictReader(f):
+        yield {key.strip().upper(): value for key, value in row.items() if key}
+
+
+def detect_omm_format(path):
+    """
+    Guess the OMM encoding from the file extension, or from the first character.
+
+    :param path: File path.
+    :return: 'json', 'xml' or 'csv'.
+    """
+    extension = os.path.splitext(path)[1][1:].lower()
+    if extension in ('json', 'xml', 'csv'):
+        return extension
+    with io.open(path, 'r', encoding='utf-8', errors='replace') as f:
+        head = f.read(256).lstrip()
+    if head[:1] in ('[', '{'):
+        return 'json'
+    if head[:1] == '<':
+        return 'xml'
+    return 'csv'
+
+
+def iter_omm(path, file_format=None, norad_id=None, epoch_start=None, epoch_end=None):
+    """
+    Stream OMM records from a JSON, XML or CSV file.
+
+    Records are dicts keyed like SpaceTrack's JSON output (NORAD_CAT_ID, EPOCH,
+    INCLINATION, TLE_LINE1, ...) and are produced one at a time, so memory stays
+    bounded regardless of the file size.
+
+    :param path: File path.
+    :param file_format: 'json', 'xml' or 'csv'; detected from the file when None.
+    :param norad_id: Optional NORAD ID to keep.
+    :param epoch_start: Optional lower epoch bound (datetime, date or string), inclusive.
+    :param epoch_end: Optional upper epoch bound (datetime, date or string), inclusive.
+    :return: Generator of record dicts.
+    :raises ValueError: If the format is not supported.
+    """
+    file_format = (file_format or detect_omm_format(path)).lower()
+    wanted = None if norad_id is None else str(int(norad_id))
+    epoch_start, epoch_end = _as_datetime(epoch_start), _as_datetime(epoch_end)
+
+    if file_format == 'json':
+        f = io.open(path, 'r', encoding='utf-8')
+        records = _iter_json(f)
+    elif file_format == 'xml':
+        f = io.open(path, 'rb')
+        records = _iter_xml(f)
+    elif file_format == 'csv':
+        f = io.open(path, 'r', encoding='utf-8', newline='')
+        records = _iter_csv(f)
+    else:
+        raise ValueError(f"Unsupported OMM format: {file_format}")
+
+    try:
+        for record in records:
+            if wanted is not None and str(record.get('NORAD_CAT_ID', '')).strip().lstrip('0') != wanted:
+                continue
+            if epoch_start is not None or epoch_end is not None:
+                epoch = parse_epoch(record['EPOCH'])
+                if (epoch_start is not None and epoch < epoch_start) or \
+                        (epoch_end is not None and epoch > epoch_end):
+                    continue
+            yield record
+    finally:
+        f.close()
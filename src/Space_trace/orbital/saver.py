@@ -3,245 +3,868 @@ from abc import ABC, abstractmethod
 from qgis.core import (
     QgsVectorFileWriter,
     QgsVectorLayer,
+    QgsVectorLayerTemporalProperties,
+    QgsVectorDataProvider,
+    QgsUnitTypes,
     QgsField,
     QgsFeature,
     QgsGeometry,
     QgsPointXY,
     QgsFields,
-    QgsField
+    QgsField,
+    QgsFeatureSink,
+    QgsWkbTypes,
+    QgsCoordinateReferenceSystem,
+    QgsCoordinateTransformContext
 )
 
-from PyQt5.QtCore import QVariant, QDateTime
+from PyQt5.QtCore import QVariant, QDateTime, Qt
+import os
+import json
+import math
+import numpy as np
+
+from .track import columns_to_points, points_to_columns, lonlatalt_to_ecef, decimate_columns
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional, only the Parquet and Arrow savers need it
+    pa = None
 
 class FileSaver(ABC):
+    # Whether QGIS can open the output with the OGR provider.
+    OGR_READABLE = True
+    # Whether the output can be written in another CRS than WGS 84 (see crs).
+    SUPPORTS_CRS = True
+    # Whether the saver writes the track.STATE_COLUMNS positions, so they should be computed.
+    USES_STATE_VECTORS = False
+    # CRS of the projected 'x'/'y' track columns and line geometries, None for WGS 84.
+    crs = None
+
     @abstractmethod
     def save_points(self, points, output_path):
         pass
 
     @abstractmethod
-    def save_lines(self, geometries, output_path):
+    def save_lines(self, geometries, output_path, segments=None):
+        """
+        Save line geometries.
+
+        :param geometries: List of QgsGeometry line geometries.
+        :param output_path: Output file path.
+        :param segments: Optional dict of segment attribute arrays keyed by the names in
+                         SEGMENT_ATTRIBUTES, one value per geometry.
+        """
         pass
 
+    def save_track(self, columns, output_path):
+        """
+        Save a columnar track as points.
+
+        :param columns: Dict of NumPy arrays keyed by the names in track.POINT_COLUMNS.
+        :param output_path: Output file path.
+        """
+        self.save_points(columns_to_points(columns), output_path)
+
 class ShpSaver(FileSaver):
     def save_points(self, points, output_path):
-        layer = QgsVectorLayer("Point?crs=EPSG:4326", "points", "memory")
-        provider = layer.dataProvider()
-        provider.addAttributes([
-            QgsField("Point_ID", QVariant.Int),
-            QgsField("Date_Time", QVariant.DateTime), 
-            QgsField("Latitude", QVariant.Double),
-            QgsField("Longitude", QVariant.Double),
-            QgsField("Altitude", QVariant.Double),
-            QgsField("Velocity", QVariant.Double),
-            QgsField("Azimuth", QVariant.Double),
-            QgsField("Elevation", QVariant.Double),
-            QgsField("TrueAnomaly", QVariant.Double),
-            QgsField("Inclination", QVariant.Double),
-        ])
-        layer.updateFields()
-
-        features = []
-        for i, point in enumerate(points):
-            current_time, lon, lat, alt, velocity, azimuth, elevation, true_anomaly, inc = point
-            qdt = QDateTime(
-                current_time.year, current_time.month, current_time.day,
-                current_time.hour, current_time.minute, current_time.second
-            )
-            feat = QgsFeature()
-            feat.setAttributes([
-                i, qdt, lat, lon, alt, velocity, azimuth, elevation, true_anomaly, inc
-            ])
-            feat.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(lon, lat)))
-            features.append(feat)
+        self.save_track(points_to_columns(points), output_path)
 
-        provider.addFeatures(features)
+    def save_track(self, columns, output_path):
+        layer = MemoryLayerSaver().save_track(columns, "points", crs=self.crs, temporal=False)
         QgsVectorFileWriter.writeAsVectorFormat(layer, output_path, "UTF-8", layer.crs(), "ESRI Shapefile")
 
-    def save_lines(self, geometries, output_path):
-        layer = QgsVectorLayer("LineString?crs=EPSG:4326", "lines", "memory")
-        provider = layer.dataProvider()
-        provider.addAttributes([QgsField("ID", QVariant.Int)])
-        layer.updateFields()
-
-        features = []
-        for i, geom in enumerate(geometries):
-            feat = QgsFeature()
-            feat.setAttributes([i + 1])
-            feat.setGeometry(geom)
-            features.append(feat)
-
-        provider.addFeatures(features)
+    def save_lines(self, geometries, output_path, segments=None):
+        layer = MemoryLayerSaver().save_lines(geometries, "lines", segments, crs=self.crs)
         QgsVectorFileWriter.writeAsVectorFormat(layer, output_path, "UTF-8", layer.crs(), "ESRI Shapefile")
 class GpkgSaver(FileSaver):
+    # Fields that get an attribute index in the written file.
+    INDEXED_FIELDS = ("Date_Time", "Start_Time", "Revolution")
 
     def save_points(self, points, output_path):
-        layer = QgsVectorLayer("Point?crs=EPSG:4326", "temp_points", "memory")
-        provider = layer.dataProvider()
-        provider.addAttributes([
-            QgsField("Point_ID", QVariant.Int),
-            QgsField("Date_Time", QVariant.DateTime), 
-            QgsField("Latitude", QVariant.Double),
-            QgsField("Longitude", QVariant.Double),
-            QgsField("Altitude", QVariant.Double),
-            QgsField("Velocity", QVariant.Double),
-            QgsField("Azimuth", QVariant.Double),
-            QgsField("Elevation", QVariant.Double),
-            QgsField("TrueAnomaly", QVariant.Double),
-            QgsField("Inclination", QVariant.Double),
-        ])
-        layer.updateFields()
-        features = []
-        for i, point in enumerate(points):
-            current_time, lon, lat, alt, velocity, azimuth, elevation, true_anomaly, inc = point
-            qdt = QDateTime(
-                current_time.year, current_time.month, current_time.day,
-                current_time.hour, current_time.minute, current_time.second
-            )
-            feat = QgsFeature()
-            feat.setAttributes([
-                i, qdt, lat, lon, alt, velocity, azimuth, elevation, true_anomaly, inc
-            ])
-            feat.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(lon, lat)))
-            features.append(feat)
-        provider.addFeatures(features)
+        self.save_track(points_to_columns(points), output_path)
+
+    def save_track(self, columns, output_path):
+        layer = MemoryLayerSaver().save_track(columns, "temp_points", crs=self.crs, temporal=False)
         QgsVectorFileWriter.writeAsVectorFormat(layer, output_path, "UTF-8", layer.crs(), "GPKG")
+        self._create_indexes(output_path)
 
-    def save_lines(self, geometries, output_path):
-        layer = QgsVectorLayer("LineString?crs=EPSG:4326", "temp_lines", "memory")
-        provider = layer.dataProvider()
-        layer.updateFields()
-        features = []
-        for i, geom in enumerate(geometries):
-            feat = QgsFeature()
-            feat.setAttributes([i + 1])
-            feat.setGeometry(geom)
-            features.append(feat)
-        provider.addFeatures(features)
+    def save_lines(self, geometries, output_path, segments=None):
+        layer = MemoryLayerSaver().save_lines(geometries, "temp_lines", segments, crs=self.crs)
         QgsVectorFileWriter.writeAsVectorFormat(layer, output_path, "UTF-8", layer.crs(), "GPKG")
+        self._create_indexes(output_path)
+
+    def save_track_levels(self, levels, output_path):
+        """
+        Save decimated copies of a track as the tables of one GeoPackage (a level-of-detail pyramid).
+
+        :param levels: List of (factor, columns) pairs, finest first, e.g. [(1, full), (4, ...), (16, ...)].
+        :param output_path: Output file path.
+        """
+        saver = MemoryLayerSaver()
+        self._write_levels([(factor, saver.save_track(columns, "temp_points", crs=self.crs, temporal=False))
+                            for factor, columns in levels], output_path)
+
+    def save_lines_levels(self, levels, output_path):
+        """
+        Save line layers built from decimated tracks as the tables of one GeoPackage.
+
+        :param levels: List of (factor, geometries, segments) tuples, finest first.
+        :param output_path: Output file path.
+        """
+        self._write_levels([(factor, MemoryLayerSaver().save_lines(geometries, "temp_lines", segments, crs=self.crs))
+                            for factor, geometries, segments in levels], output_path)
+
+    @classmethod
+    def _write_levels(cls, layers, output_path):
+        """
+        Write one table per level and store its scale range as the default style of the table,
+        so QGIS draws the finest level only when zoomed in and a coarser one further out.
+        """
+        factors = [factor for factor, _ in layers]
+        for number, (factor, layer) in enumerate(layers):
+            table = lod_table_name(output_path, factor)
+            options = QgsVectorFileWriter.SaveVectorOptions()
+            options.driverName = "GPKG"
+            options.fileEncoding = "UTF-8"
+            options.layerName = table
+            options.actionOnExistingFile = (QgsVectorFileWriter.CreateOrOverwriteLayer if number
+                                            else QgsVectorFileWriter.CreateOrOverwriteFile)
+            QgsVectorFileWriter.writeAsVectorFormatV3(layer, output_path, QgsCoordinateTransformContext(), options)
+
+            uri = f"{output_path}|layername={table}"
+            cls._create_indexes(uri)
+            written = QgsVectorLayer(uri, table, "ogr")
+            if not written.isValid():
+                continue
+            # A scale of 0 means no limit in that direction.
+            written.setScaleBasedVisibility(True)
+            written.setMaximumScale(factor * LOD_BASE_SCALE if number else 0)
+            written.setMinimumScale(factors[number + 1] * LOD_BASE_SCALE if number + 1 < len(factors) else 0)
+            written.saveStyleToDatabase(table, f"Level of detail x{factor}", True, "")
+
+    @classmethod
+    def _create_indexes(cls, output_path):
+        """
+        Create SQLite indexes on the time and revolution fields of a written GeoPackage,
+        so selections by orbit number or time range do not scan the whole table.
+
+        :param output_path: GeoPackage path, optionally with a '|layername=' suffix.
+        """
+        layer = QgsVectorLayer(output_path, "indexed", "ogr")
+        provider = layer.dataProvider()
+        if not layer.isValid() or not provider.capabilities() & QgsVectorDataProvider.CreateAttributeIndex:
+            return
+        for name in cls.INDEXED_FIELDS:
+            index = layer.fields().indexOf(name)
+            if index >= 0:
+                provider.createAttributeIndex(index)
 
 class GeoJsonSaver(FileSaver):
 
     def save_points(self, points, output_path):
-        layer = QgsVectorLayer("Point?crs=EPSG:4326", "temp_points", "memory")
-        provider = layer.dataProvider()
-        provider.addAttributes([
-            QgsField("Point_ID", QVariant.Int),
-            QgsField("Date_Time", QVariant.DateTime),  
-            QgsField("Latitude", QVariant.Double),
-            QgsField("Longitude", QVariant.Double),
-            QgsField("Altitude", QVariant.Double),
-            QgsField("Velocity", QVariant.Double),
-            QgsField("Azimuth", QVariant.Double),
-            QgsField("Elevation", QVariant.Double),
-            QgsField("TrueAnomaly", QVariant.Double),
-            QgsField("Inclination", QVariant.Double),
-        ])
-        layer.updateFields()
-        features = []
-        for i, point in enumerate(points):
-            current_time, lon, lat, alt, velocity, azimuth, elevation, true_anomaly, inc = point
-            qdt = QDateTime(
-                current_time.year, current_time.month, current_time.day,
-                current_time.hour, current_time.minute, current_time.second
-            )
-            feat = QgsFeature()
-            feat.setAttributes([
-                i, qdt, lat, lon, alt, velocity, azimuth, elevation, true_anomaly, inc
-            ])
-            feat.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(lon, lat)))
-            features.append(feat)
-        provider.addFeatures(features)
-        QgsVectorFileWriter.writeAsVectorFormat(layer, output_path, "UTF-8", layer.crs(), "GeoJSON")    
+        self.save_track(points_to_columns(points), output_path)
 
-    def save_lines(self, geometries, output_path):
-        layer = QgsVectorLayer("LineString?crs=EPSG:4326", "temp_lines", "memory")
-        provider = layer.dataProvider()
-        provider.addAttributes([QgsField("ID", QVariant.Int)])
-        layer.updateFields()
+    def save_track(self, columns, output_path):
+        layer = MemoryLayerSaver().save_track(columns, "temp_points", crs=self.crs, temporal=False)
+        QgsVectorFileWriter.writeAsVectorFormat(layer, output_path, "UTF-8", layer.crs(), "GeoJSON")
+
+    def save_lines(self, geometries, output_path, segments=None):
+        layer = MemoryLayerSaver().save_lines(geometries, "temp_lines", segments, crs=self.crs)
+        QgsVectorFileWriter.writeAsVectorFormat(layer, output_path, "UTF-8", layer.crs(), "GeoJSON")
+        
+# Scale denominator per unit of decimation: a level decimated by a factor f takes over
+# from the next finer one at scales smaller than 1:(f * LOD_BASE_SCALE).
+LOD_BASE_SCALE = 1000000
+
+
+def lod_table_name(output_path, factor):
+    """
+    Return the GeoPackage table name of a level-of-detail level.
+
+    :param output_path: GeoPackage path.
+    :param factor: Decimation factor of the level (1 for the full track).
+    :return: The file name without extension, with an '_x<factor>' suffix for decimated levels.
+    """
+    name = os.path.splitext(os.path.basename(output_path))[0]
+    return name if factor <= 1 else f"{name}_x{factor}"
+
+
+# Attribute names of the point savers, keyed by track column.
+POINT_ATTRIBUTES = (
+    ('lat', 'Latitude'), ('lon', 'Longitude'), ('alt', 'Altitude'), ('velocity', 'Velocity'),
+    ('azimuth', 'Azimuth'), ('elevation', 'Elevation'), ('true_anomaly', 'TrueAnomaly'),
+    ('inclination', 'Inclination'),
+)
+
+# Attribute names of the optional state vector columns (see track.STATE_COLUMNS),
+# at most 10 characters so that Shapefile output keeps them.
+STATE_ATTRIBUTES = (
+    ('eci_x', 'ECI_X'), ('eci_y', 'ECI_Y'), ('eci_z', 'ECI_Z'),
+    ('eci_vx', 'ECI_VX'), ('eci_vy', 'ECI_VY'), ('eci_vz', 'ECI_VZ'),
+    ('ecef_x', 'ECEF_X'), ('ecef_y', 'ECEF_Y'), ('ecef_z', 'ECEF_Z'),
+    ('ecef_vx', 'ECEF_VX'), ('ecef_vy', 'ECEF_VY'), ('ecef_vz', 'ECEF_VZ'),
+    ('ground_speed', 'GroundSpd'),
+)
+
+
+def has_state_vectors(columns):
+    """
+    Return whether a columnar track carries the state vector columns.
+    """
+    return all(column in columns for column, _ in STATE_ATTRIBUTES)
+
+
+def point_fields(with_revolution=False, with_state_vectors=False):
+    """
+    Return the fields of a track point layer: Point_ID, Date_Time, POINT_ATTRIBUTES and,
+    optionally, Revolution and the STATE_ATTRIBUTES.
+    """
+    fields = QgsFields()
+    fields.append(QgsField("Point_ID", QVariant.Int))
+    fields.append(QgsField("Date_Time", QVariant.DateTime))
+    for _, name in POINT_ATTRIBUTES:
+        fields.append(QgsField(name, QVariant.Double))
+    if with_revolution:
+        fields.append(QgsField("Revolution", QVariant.Int))
+    if with_state_vectors:
+        for _, name in STATE_ATTRIBUTES:
+            fields.append(QgsField(name, QVariant.Double))
+    return fields
+
+
+def point_feature_chunks(columns, chunk_size, start_id=0):
+    """
+    Build point features from a columnar track, chunk by chunk.
+
+    Attribute rows are taken positionally from the column arrays (converted to
+    Python lists once per chunk), so no field is looked up by name per feature.
+
+    :param columns: Dict of NumPy arrays keyed by the names in track.POINT_COLUMNS,
+                    optionally with 'revolution', with the state vector columns and with projected
+                    'x' and 'y' coordinates (see projection.TrackProjection) used for the geometry
+                    instead of lon/lat.
+    :param chunk_size: Number of features per chunk.
+    :param start_id: Point_ID of the first feature.
+    :return: Generator of lists of QgsFeature with the attributes of point_fields.
+    """
+    names = [column for column, _ in POINT_ATTRIBUTES]
+    if 'revolution' in columns:
+        names.append('revolution')
+    if has_state_vectors(columns):
+        names.extend(column for column, _ in STATE_ATTRIBUTES)
+    times = columns['time'].astype('datetime64[ms]').astype(np.int64)
+    xs = columns.get('x', columns['lon'])
+    ys = columns.get('y', columns['lat'])
+    for start in range(0, len(times), chunk_size):
+        stop = start + chunk_size
+        values = [columns[column][start:stop].tolist() for column in names]
         features = []
-        for i, geom in enumerate(geometries):
+        for i, (msecs, x, y, *attributes) in enumerate(zip(times[start:stop].tolist(), xs[start:stop].tolist(),
+                                                           ys[start:stop].tolist(), *values), start_id + start):
             feat = QgsFeature()
-            feat.setAttributes([i + 1])
-            feat.setGeometry(geom)
+            feat.setAttributes([i, QDateTime.fromMSecsSinceEpoch(msecs, Qt.UTC), *attributes])
+            # Points outside the domain of the target CRS have NaN coordinates and no geometry.
+            if not math.isnan(x):
+                feat.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(x, y)))
             features.append(feat)
-        provider.addFeatures(features)
-        options = QgsVectorFileWriter.SaveVectorOptions()
-        QgsVectorFileWriter.writeAsVectorFormat(layer, output_path, "UTF-8", layer.crs(), "GeoJSON")
-        
+        yield features
+
+
+# Attributes of the line savers, keyed by segment column.
+SEGMENT_ATTRIBUTES = (
+    ('start_time', 'Start_Time', QVariant.DateTime), ('end_time', 'End_Time', QVariant.DateTime),
+    ('revolution', 'Revolution', QVariant.Int), ('ascending', 'Ascending', QVariant.Bool),
+)
+
+
+def line_fields(segment_columns=None):
+    """
+    Return the fields of a track line layer: ID and the SEGMENT_ATTRIBUTES present.
+
+    :param segment_columns: Names of the segment columns to include (all when None).
+    """
+    fields = QgsFields()
+    fields.append(QgsField("ID", QVariant.Int))
+    for column, name, field_type in SEGMENT_ATTRIBUTES:
+        if segment_columns is None or column in segment_columns:
+            fields.append(QgsField(name, field_type))
+    return fields
+
+
+def line_features(geometries, segments=None, start_id=1):
+    """
+    Build line features with the ID and, if given, the segment attributes.
+
+    :param geometries: List of QgsGeometry line geometries.
+    :param segments: Optional dict of segment attribute arrays keyed by the names in SEGMENT_ATTRIBUTES.
+    :param start_id: ID of the first line.
+    :return: List of QgsFeature with the attributes of line_fields(segments).
+    """
+    values = []
+    for column, _, field_type in SEGMENT_ATTRIBUTES:
+        if segments is None or column not in segments:
+            continue
+        if field_type == QVariant.DateTime:
+            msecs = segments[column].astype('datetime64[ms]').astype(np.int64).tolist()
+            values.append([QDateTime.fromMSecsSinceEpoch(value, Qt.UTC) for value in msecs])
+        else:
+            values.append(segments[column].tolist())
+    features = []
+    for i, (geom, *row) in enumerate(zip(geometries, *values), start_id):
+        feat = QgsFeature()
+        feat.setGeometry(geom)
+        feat.setAttributes([i, *row])
+        features.append(feat)
+    return features
+
+
+def line_geometry_type(geometries):
+    """
+    Return the WKB type of a line layer for the geometries: MultiLineString if any is multipart.
+    """
+    if any(geom.isMultipart() for geom in geometries):
+        return QgsWkbTypes.MultiLineString
+    return QgsWkbTypes.LineString
+
+
+def configure_temporal(layer, step_minutes=None, field="Date_Time"):
+    """
+    Enable the temporal properties of a track layer and index its time field.
+
+    Each feature is shown at the instant of its time attribute, for the duration of
+    one time step, so the temporal controller animates the track without per-frame
+    filter expressions. Where the provider supports it (GPKG, shapefile) an attribute
+    index on the time field lets it answer the frame filter without a full scan.
+
+    :param layer: QgsVectorLayer with a DateTime field.
+    :param step_minutes: Time step of the track; each point stays visible this long.
+    :param field: Name of the time field.
+    :return: True if the layer has the field and was configured.
+    """
+    index = layer.fields().indexOf(field)
+    if index < 0:
+        return False
+    properties = layer.temporalProperties()
+    properties.setMode(QgsVectorLayerTemporalProperties.ModeFeatureDateTimeInstantFromField)
+    properties.setStartField(field)
+    if step_minutes:
+        properties.setDurationUnits(QgsUnitTypes.TemporalMinutes)
+        properties.setFixedDuration(step_minutes)
+    properties.setIsActive(True)
+
+    provider = layer.dataProvider()
+    capabilities = provider.capabilities()
+    if capabilities & QgsVectorDataProvider.CreateAttributeIndex:
+        provider.createAttributeIndex(index)
+    if capabilities & QgsVectorDataProvider.CreateSpatialIndex:
+        provider.createSpatialIndex()
+    return True
+
+
 class MemoryLayerSaver:
     """Class to create in-memory QGIS layers for points and lines."""
 
-    def save_points(self, points, layer_name):
+    # Number of features handed to the provider per addFeatures call.
+    CHUNK_SIZE = 50000
+
+    def save_points(self, points, layer_name, step_minutes=None):
         """
         Create an in-memory point layer from a list of points.
 
+        Points are expected in time order; the layer is set up for the temporal controller.
+
         :param points: List of tuples (datetime, lon, lat, alt, velocity, azimuth, elevation, true_anomaly, inc).
         :param layer_name: Name of the layer.
+        :param step_minutes: Time step of the track, used as the display duration of each point.
+        :return: QgsVectorLayer containing the points.
+        """
+        return self.save_track(points_to_columns(points), layer_name, step_minutes)
+
+    def save_track(self, columns, layer_name, step_minutes=None, crs=None, temporal=True):
+        """
+        Create an in-memory point layer from a columnar track.
+
+        :param columns: Dict of NumPy arrays keyed by the names in track.POINT_COLUMNS.
+        :param layer_name: Name of the layer.
+        :param step_minutes: Time step of the track, used as the display duration of each point.
+        :param crs: CRS of the 'x'/'y' columns, None for WGS 84 longitude/latitude.
+        :param temporal: Set up the temporal properties and indexes; file savers that only
+                         write the layer out and discard it pass False.
         :return: QgsVectorLayer containing the points.
         """
         point_layer = QgsVectorLayer("Point?crs=EPSG:4326", layer_name, "memory")
+        if crs:
+            point_layer.setCrs(QgsCoordinateReferenceSystem(crs))
         provider = point_layer.dataProvider()
-        fields = QgsFields()
-        fields.append(QgsField("Point_ID", QVariant.Int))
-        fields.append(QgsField("Date_Time", QVariant.DateTime))
-        fields.append(QgsField("Latitude", QVariant.Double))
-        fields.append(QgsField("Longitude", QVariant.Double))
-        fields.append(QgsField("Altitude", QVariant.Double))
-        fields.append(QgsField("Velocity", QVariant.Double))
-        fields.append(QgsField("Azimuth", QVariant.Double))
-        fields.append(QgsField("Elevation", QVariant.Double))
-        fields.append(QgsField("TrueAnomaly", QVariant.Double))
-        fields.append(QgsField("Inclination", QVariant.Double))
+        fields = point_fields('revolution' in columns, has_state_vectors(columns))
         provider.addAttributes(fields)
         point_layer.updateFields()
 
-        features = []
-        for i, point in enumerate(points):
-            current_time, lon, lat, alt, velocity, azimuth, elevation, true_anom, inc = point
-            qdt = QDateTime(current_time.year, current_time.month, current_time.day,
-                            current_time.hour, current_time.minute, current_time.second)
-            feat = QgsFeature()
-            feat.setFields(fields)
-            feat.setAttribute("Point_ID", i)
-            feat.setAttribute("Date_Time", qdt)
-            feat.setAttribute("Latitude", lat)
-            feat.setAttribute("Longitude", lon)
-            feat.setAttribute("Altitude", alt)
-            feat.setAttribute("Velocity", velocity)
-            feat.setAttribute("Azimuth", azimuth)
-            feat.setAttribute("Elevation", elevation)
-            feat.setAttribute("TrueAnomaly", true_anom)
-            feat.setAttribute("Inclination", inc)
-            feat.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(lon, lat)))
-            features.append(feat)
-
-        if features:
-            provider.addFeatures(features)
-            point_layer.updateExtents()
+        self.append_track(point_layer, columns)
+        if temporal:
+            configure_temporal(point_layer, step_minutes)
         return point_layer
 
-    def save_lines(self, geometries, layer_name):
+    def append_points(self, point_layer, points, start_id=0):
+        """
+        Append points to an existing in-memory point layer.
+
+        :param point_layer: Layer created by save_points.
+        :param points: List of tuples (datetime, lon, lat, alt, velocity, azimuth, elevation, true_anomaly, inc).
+        :param start_id: Point_ID of the first appended point.
+        :return: List of feature IDs assigned to the appended features.
+        """
+        return self.append_track(point_layer, points_to_columns(points), start_id)
+
+    def append_track(self, point_layer, columns, start_id=0):
+        """
+        Append a columnar track to an existing in-memory point layer.
+
+        Features are built positionally from the column arrays and handed to the
+        provider in chunks of CHUNK_SIZE.
+
+        :param point_layer: Layer created by save_points or save_track.
+        :param columns: Dict of NumPy arrays keyed by the names in track.POINT_COLUMNS.
+        :param start_id: Point_ID of the first appended point.
+        :return: List of feature IDs assigned to the appended features.
+        """
+        fids = []
+        for features in point_feature_chunks(columns, self.CHUNK_SIZE, start_id):
+            fids.extend(self._add_features(point_layer, features))
+        return fids
+
+    def save_lines(self, geometries, layer_name, segments=None, crs=None):
         """
         Create an in-memory line layer from a list of geometries.
 
-        :param points: List of tuples (datetime, lon, lat, ...), passed for compatibility.
         :param geometries: List of QgsGeometry objects representing line segments.
         :param layer_name: Name of the layer.
+        :param segments: Optional dict of segment attribute arrays (see SEGMENT_ATTRIBUTES);
+                         without it the layer only has the ID field.
+        :param crs: CRS of the geometries, None for WGS 84 longitude/latitude.
         :return: QgsVectorLayer containing the lines.
         """
-        line_layer = QgsVectorLayer("LineString?crs=EPSG:4326", layer_name, "memory")
+        geometry_type = QgsWkbTypes.displayString(line_geometry_type(geometries))
+        line_layer = QgsVectorLayer(f"{geometry_type}?crs=EPSG:4326", layer_name, "memory")
+        if crs:
+            line_layer.setCrs(QgsCoordinateReferenceSystem(crs))
         provider = line_layer.dataProvider()
-        provider.addAttributes([QgsField("ID", QVariant.Int)])
+        provider.addAttributes(line_fields(() if segments is None else segments))
         line_layer.updateFields()
 
-        line_features = []
-        for i, geom in enumerate(geometries):
-            feat = QgsFeature()
-            feat.setGeometry(geom)
-            feat.setAttributes([i + 1])
-            line_features.append(feat)
-
-        if line_features:
-            provider.addFeatures(line_features)
-            line_layer.updateExtents()
-        return line_layer
\ No newline at end of file
+        self.append_lines(line_layer, geometries, segments=segments)
+        return line_layer
+
+    def append_lines(self, line_layer, geometries, start_id=1, segments=None):
+        """
+        Append line geometries to an existing in-memory line layer.
+
+        :param line_layer: Layer created by save_lines.
+        :param geometries: List of QgsGeometry objects representing line segments.
+        :param start_id: ID of the first appended line.
+        :param segments: Optional dict of segment attribute arrays (see SEGMENT_ATTRIBUTES).
+        :return: List of feature IDs assigned to the appended features.
+        """
+        return self._add_features(line_layer, line_features(geometries, segments, start_id))
+
+    @staticmethod
+    def _add_features(layer, features):
+        if not features:
+            return []
+        _, added = layer.dataProvider().addFeatures(features, QgsFeatureSink.FastInsert)
+        layer.updateExtents()
+        return [feat.id() for feat in added]
+
+
+# Little-endian WKB point: byte order, geometry type, x, y.
+_WKB_POINT = np.dtype([('order', 'u1'), ('type', '<u4'), ('x', '<f8'), ('y', '<f8')])
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ValueError("pyarrow is required for Parquet and Arrow output.")
+
+
+def _binary_array(data, offsets):
+    """
+    Wrap a contiguous byte buffer and its offsets as an Arrow binary array without copying.
+    """
+    return pa.Array.from_buffers(pa.binary(), len(offsets) - 1,
+                                 [None, pa.py_buffer(offsets), pa.py_buffer(data)])
+
+
+def _geo_metadata(geometry_types, lons=(), lats=()):
+    """
+    GeoParquet 1.0 file metadata for a WKB geometry column in WGS 84 (OGC:CRS84).
+
+    :param geometry_types: List of every geometry type present in the column, e.g. ['Point'].
+    """
+    column = {'encoding': 'WKB', 'geometry_types': geometry_types}
+    if len(lons):
+        column['bbox'] = [float(np.min(lons)), float(np.min(lats)), float(np.max(lons)), float(np.max(lats))]
+    return {b'geo': json.dumps({
+        'version': '1.0.0',
+        'primary_column': 'geometry',
+        'columns': {'geometry': column},
+    }).encode('utf-8')}
+
+
+def track_table(columns):
+    """
+    Build an Arrow table from a columnar track.
+
+    Numeric columns wrap the NumPy buffers without copying; point geometries are
+    encoded to WKB in one vectorized pass.
+
+    :param columns: Dict of NumPy arrays keyed by the names in track.POINT_COLUMNS,
+                    optionally with 'revolution' and the state vector columns.
+    :return: pyarrow.Table with GeoParquet metadata.
+    """
+    _require_pyarrow()
+    count = len(columns['time'])
+    wkb = np.empty(count, dtype=_WKB_POINT)
+    wkb['order'] = 1
+    wkb['type'] = 1
+    wkb['x'] = columns['lon']
+    wkb['y'] = columns['lat']
+    offsets = np.arange(0, (count + 1) * _WKB_POINT.itemsize, _WKB_POINT.itemsize, dtype=np.int32)
+
+    times = np.ascontiguousarray(columns['time'], dtype='datetime64[ms]').view(np.int64)
+    arrays = [pa.array(np.arange(count, dtype=np.int32)),
+              pa.array(times, type=pa.timestamp('ms', tz='UTC'))]
+    names = ['Point_ID', 'Date_Time']
+    for column, name in POINT_ATTRIBUTES:
+        arrays.append(pa.array(np.ascontiguousarray(columns[column], dtype=np.float64)))
+        names.append(name)
+    if 'revolution' in columns:
+        arrays.append(pa.array(np.ascontiguousarray(columns['revolution'], dtype=np.int32)))
+        names.append('Revolution')
+    if has_state_vectors(columns):
+        for column, name in STATE_ATTRIBUTES:
+            arrays.append(pa.array(np.ascontiguousarray(columns[column], dtype=np.float64)))
+            names.append(name)
+    arrays.append(_binary_array(wkb.view(np.uint8), offsets))
+    names.append('geometry')
+
+    table = pa.Table.from_arrays(arrays, names=names)
+    return table.replace_schema_metadata(_geo_metadata(['Point'], columns['lon'], columns['lat']))
+
+
+def lines_table(geometries, segments=None):
+    """
+    Build an Arrow table with the WKB of line geometries.
+
+    :param geometries: List of QgsGeometry line geometries.
+    :param segments: Optional dict of segment attribute arrays keyed by the names in SEGMENT_ATTRIBUTES.
+    :return: pyarrow.Table with GeoParquet metadata.
+    """
+    _require_pyarrow()
+    blobs = [bytes(geom.asWkb()) for geom in geometries]
+    offsets = np.zeros(len(blobs) + 1, dtype=np.int32)
+    np.cumsum([len(blob) for blob in blobs], out=offsets[1:])
+    boxes = [geom.boundingBox() for geom in geometries]
+    lons = [value for box in boxes for value in (box.xMinimum(), box.xMaximum())]
+    lats = [value for box in boxes for value in (box.yMinimum(), box.yMaximum())]
+
+    arrays = [pa.array(np.arange(1, len(blobs) + 1, dtype=np.int32))]
+    names = ['ID']
+    for column, name, field_type in SEGMENT_ATTRIBUTES:
+        if segments is None or column not in segments:
+            continue
+        if field_type == QVariant.DateTime:
+            times = np.ascontiguousarray(segments[column], dtype='datetime64[ms]').view(np.int64)
+            arrays.append(pa.array(times, type=pa.timestamp('ms', tz='UTC')))
+        elif field_type == QVariant.Int:
+            arrays.append(pa.array(np.asarray(segments[column], dtype=np.int32)))
+        else:
+            arrays.append(pa.array(np.asarray(segments[column], dtype=bool)))
+        names.append(name)
+    arrays.append(_binary_array(b''.join(blobs), offsets))
+    names.append('geometry')
+
+    # Single and multipart lines can be mixed; the metadata lists every type present.
+    multipart = {geom.isMultipart() for geom in geometries}
+    geometry_types = [name for name, is_multi in (('LineString', False), ('MultiLineString', True))
+                      if is_multi in multipart]
+    table = pa.Table.from_arrays(arrays, names=names)
+    return table.replace_schema_metadata(_geo_metadata(geometry_types, lons, lats))
+
+
+def day_row_groups(times):
+    """
+    Split a track into row ranges covering one UTC day each.
+
+    :param times: Sorted array of numpy.datetime64 times.
+    :return: List of (start, stop) row index pairs.
+    """
+    days = np.asarray(times).astype('datetime64[D]')
+    cuts = np.flatnonzero(days[1:] != days[:-1]) + 1
+    bounds = [0, *cuts.tolist(), len(days)]
+    return [(start, stop) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+
+class ParquetSaver(FileSaver):
+    """
+    Writes tracks as GeoParquet with one row group per day of track.
+    """
+
+    # The GeoParquet metadata declares WGS 84 longitude/latitude.
+    SUPPORTS_CRS = False
+
+    def __init__(self, compression='zstd'):
+        """
+        :param compression: Parquet compression codec ('zstd', 'snappy', 'gzip' or 'none').
+        """
+        self.compression = compression
+
+    def save_points(self, points, output_path):
+        self.save_track(points_to_columns(points), output_path)
+
+    def save_track(self, columns, output_path):
+        table = track_table(columns)
+        with pq.ParquetWriter(output_path, table.schema, compression=self.compression) as writer:
+            for start, stop in day_row_groups(columns['time']):
+                writer.write_table(table.slice(start, stop - start))
+
+    def save_lines(self, geometries, output_path, segments=None):
+        pq.write_table(lines_table(geometries, segments), output_path, compression=self.compression)
+
+    def save_tracks(self, tracks, output_path):
+        """
+        Write the tracks of several satellites into one file, one row group per satellite and day.
+
+        :param tracks: Iterable of (norad_id, columns) pairs.
+        :param output_path: Output file path.
+        """
+        writer = None
+        try:
+            for norad_id, columns in tracks:
+                table = track_table(columns)
+                table = table.add_column(0, 'NORAD_ID', pa.array(np.full(table.num_rows, norad_id, dtype=np.int32)))
+                if writer is None:
+                    # The bounding box of the whole file is not known up front, so it is omitted.
+                    schema = table.schema.with_metadata(_geo_metadata(['Point']))
+                    writer = pq.ParquetWriter(output_path, schema, compression=self.compression)
+                for start, stop in day_row_groups(columns['time']):
+                    writer.write_table(table.slice(start, stop - start))
+        finally:
+            if writer is not None:
+                writer.close()
+
+
+class ArrowSaver(FileSaver):
+    """
+    Writes tracks as Arrow IPC (Feather v2) files with WKB geometries.
+    """
+
+    SUPPORTS_CRS = False
+
+    def __init__(self, compression='zstd'):
+        """
+        :param compression: IPC buffer compression ('zstd', 'lz4' or None).
+        """
+        self.compression = compression
+
+    def save_points(self, points, output_path):
+        self.save_track(points_to_columns(points), output_path)
+
+    def save_track(self, columns, output_path):
+        table = track_table(columns)
+        self._write(table, output_path, day_row_groups(columns['time']))
+
+    def save_lines(self, geometries, output_path, segments=None):
+        table = lines_table(geometries, segments)
+        self._write(table, output_path, [(0, table.num_rows)])
+
+    def _write(self, table, output_path, ranges):
+        """
+        Write a table as one record batch per row range.
+        """
+        options = pa.ipc.IpcWriteOptions(compression=self.compression)
+        with pa.OSFile(output_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+                for start, stop in ranges:
+                    writer.write_table(table.slice(start, stop - start))
+
+
+class FlatGeobufSaver(FileSaver):
+    """
+    Writes FlatGeobuf files with a packed Hilbert R-tree.
+
+    With the index QGIS reads only the features inside the visible extent, so large
+    outputs stay fast to pan over. Features are streamed to the writer in batches
+    straight from the track columns.
+    """
+
+    BATCH_SIZE = 10000
+
+    def save_points(self, points, output_path):
+        self.save_track(points_to_columns(points), output_path)
+
+    def save_track(self, columns, output_path):
+        fields = point_fields('revolution' in columns, has_state_vectors(columns))
+
+        writer = self._create_writer(output_path, fields, QgsWkbTypes.Point)
+        for features in point_feature_chunks(columns, self.BATCH_SIZE):
+            writer.addFeatures(features)
+        del writer
+
+    def save_lines(self, geometries, output_path, segments=None):
+        writer = self._create_writer(output_path, line_fields(() if segments is None else segments),
+                                     line_geometry_type(geometries))
+        writer.addFeatures(line_features(geometries, segments))
+        del writer
+
+    def _create_writer(self, output_path, fields, geometry_type):
+        options = QgsVectorFileWriter.SaveVectorOptions()
+        options.driverName = "FlatGeobuf"
+        options.fileEncoding = "UTF-8"
+        options.layerOptions = ["SPATIAL_INDEX=YES"]
+        writer = QgsVectorFileWriter.create(output_path, fields, geometry_type,
+                                            QgsCoordinateReferenceSystem(self.crs or "EPSG:4326"),
+                                            QgsCoordinateTransformContext(), options)
+        if writer.hasError() != QgsVectorFileWriter.NoError:
+            raise ValueError(f"Cannot create {output_path}: {writer.errorMessage()}")
+        return writer
+
+
+class CzmlSaver(FileSaver):
+    """
+    Writes tracks as CZML documents for Cesium-based 3D viewers.
+
+    The whole track is a single packet whose position is a sampled Earth-fixed
+    cartesian property: the propagated positions at a coarse node step are the
+    interpolation nodes and the viewer fills in the motion between them with
+    Lagrange interpolation, so the file stays compact.
+    """
+
+    OGR_READABLE = False
+    # CZML positions are Earth-fixed cartesian coordinates.
+    SUPPORTS_CRS = False
+    USES_STATE_VECTORS = True
+
+    def __init__(self, interpolation_degree=5, trail_minutes=90, node_minutes=3):
+        """
+        :param interpolation_degree: Degree of the Lagrange interpolation between nodes.
+        :param trail_minutes: Length of the path drawn behind (and ahead of) the object.
+        :param node_minutes: Time between interpolation nodes; finer tracks are thinned out to it.
+        """
+        self.interpolation_degree = interpolation_degree
+        self.trail_minutes = trail_minutes
+        self.node_minutes = node_minutes
+
+    def save_points(self, points, output_path):
+        self.save_track(points_to_columns(points), output_path)
+
+    def save_track(self, columns, output_path):
+        name = os.path.splitext(os.path.basename(output_path))[0]
+        times = columns['time'].astype('datetime64[ms]')
+        packets = [self._document(name, times)]
+        if len(times):
+            nodes = decimate_columns(columns, self._node_factor(times))
+            seconds = (nodes['time'].astype('datetime64[ms]') - times[0]) / np.timedelta64(1, 's')
+            if has_state_vectors(nodes):
+                # The propagated Earth-fixed positions, without a round trip through geodetic coordinates.
+                x, y, z = nodes['ecef_x'], nodes['ecef_y'], nodes['ecef_z']
+            else:
+                x, y, z = lonlatalt_to_ecef(nodes['lon'], nodes['lat'], nodes['alt'])
+            # CZML cartesian positions are in metres.
+            samples = np.column_stack((seconds, x * 1000, y * 1000, z * 1000))
+            trail = self.trail_minutes * 60
+            packets.append({
+                'id': name,
+                'name': name,
+                'availability': self._interval(times),
+                'position': {
+                    'epoch': _czml_time(times[0]),
+                    'referenceFrame': 'FIXED',
+                    'interpolationAlgorithm': 'LAGRANGE',
+                    'interpolationDegree': self.interpolation_degree,
+                    'cartesian': np.round(samples, 3).ravel().tolist(),
+                },
+                'point': {'pixelSize': 8, 'color': {'rgba': [255, 255, 0, 255]}},
+                'path': {
+                    'leadTime': trail,
+                    'trailTime': trail,
+                    'resolution': 120,
+                    'width': 1,
+                    'material': {'solidColor': {'color': {'rgba': [255, 255, 0, 160]}}},
+                },
+            })
+        self._write(packets, output_path)
+
+    def save_lines(self, geometries, output_path, segments=None):
+        name = os.path.splitext(os.path.basename(output_path))[0]
+        packets = [self._document(name)]
+        for i, geom in enumerate(geometries, 1):
+            properties = {}
+            for column, field_name, field_type in SEGMENT_ATTRIBUTES:
+                if segments is not None and column in segments:
+                    value = segments[column][i - 1]
+                    properties[field_name] = _czml_time(value) if field_type == QVariant.DateTime else value.item()
+            parts = geom.asMultiPolyline() if geom.isMultipart() else [geom.asPolyline()]
+            for part_number, part in enumerate(parts):
+                packet = {
+                    'id': f"{name}_{i}" if part_number == 0 else f"{name}_{i}_{part_number}",
+                    'polyline': {
+                        'positions': {'cartographicDegrees': [value for point in part
+                                                              for value in (point.x(), point.y(), 0.0)]},
+                        'clampToGround': True,
+                        'width': 1,
+                        'material': {'solidColor': {'color': {'rgba': [255, 255, 0, 255]}}},
+                    },
+                }
+                if properties:
+                    packet['properties'] = properties
+                packets.append(packet)
+        self._write(packets, output_path)
+
+    def _node_factor(self, times):
+        """
+        Return how many track points make up one node step, keeping enough nodes for the interpolation.
+        """
+        if len(times) < 2:
+            return 1
+        step = np.median(np.diff(times).astype(np.int64)) / 60000
+        factor = int(self.node_minutes // step) if step > 0 else 1
+        while factor > 1 and (len(times) - 1) // factor < self.interpolation_degree:
+            factor //= 2
+        return max(factor, 1)
+
+    def _document(self, name, times=()):
+        document = {'id': 'document', 'name': name, 'version': '1.0'}
+        if len(times):
+            document['clock'] = {'interval': self._interval(times), 'currentTime': _czml_time(times[0]),
+                                 'multiplier': 60, 'range': 'LOOP_STOP', 'step': 'SYSTEM_CLOCK_MULTIPLIER'}
+        return document
+
+    @staticmethod
+    def _interval(times):
+        return f"{_czml_time(times[0])}/{_czml_time(times[-1])}"
+
+    @staticmethod
+    def _write(packets, output_path):
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(packets, f, separators=(',', ':'))
+
+
+def _czml_time(value):
+    """
+    Format a numpy.datetime64 as an ISO 8601 UTC time for CZML.
+    """
+    return f"{np.datetime_as_string(value, unit='ms')}Z"
+
+
+# Savers by output file format (the file extension without the dot).
+FILE_SAVERS = {
+    'shp': ShpSaver,
+    'gpkg': GpkgSaver,
+    'geojson': GeoJsonSaver,
+    'fgb': FlatGeobufSaver,
+    'parquet': ParquetSaver,
+    'arrow': ArrowSaver,
+    'feather': ArrowSaver,
+    'czml': CzmlSaver,
+}
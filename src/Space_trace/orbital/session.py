@@ -0,0 +1,129 @@
+"""
+This module contains the SpaceTrackSessionPool class which shares authenticated
+SpaceTrack clients between plugin runs.
+"""
+
+import asyncio
+import threading
+
+from spacetrack.base import BASE_URL
+
+from .spacetrack_client import SpacetrackClientWrapper, AsyncSpacetrackClientWrapper
+
+
+class SpaceTrackSessionPool:
+    """
+    Keeps one long-lived SpacetrackClientWrapper per account.
+
+    Reusing the wrapper keeps its HTTP connection pool and session cookie, so only
+    the first request of a session (or one after expiry) pays for the login.
+    AsyncSpacetrackClientWrapper instances are pooled the same way; they live on an
+    event loop owned by the pool, running in a background thread.
+    """
+
+    def __init__(self, base_url=BASE_URL):
+        """
+        :param base_url: SpaceTrack server URL, e.g. a local mock server in tests.
+        """
+        self.base_url = base_url
+        self._clients = {}
+        self._async_clients = {}
+        self._lock = threading.Lock()
+        self._loop = None
+        self._loop_thread = None
+
+    def get_client(self, username, password):
+        """
+        Return the shared client for an account, creating it on first use.
+
+        :param username: SpaceTrack account login (email).
+        :param password: SpaceTrack account password.
+        :return: SpacetrackClientWrapper instance.
+        """
+        with self._lock:
+            client = self._clients.get((username, password))
+            if client is None:
+                client = SpacetrackClientWrapper(username, password, base_url=self.base_url)
+                self._clients[(username, password)] = client
+            return client
+
+    def _get_loop(self):
+        # Called with self._lock held.
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(target=self._loop.run_forever, name='SpaceTrackSessionPool',
+                                                 daemon=True)
+            self._loop_thread.start()
+        return self._loop
+
+    def run(self, coroutine):
+        """
+        Run a coroutine on the pool's event loop and wait for its result.
+
+        :param coroutine: Coroutine using clients returned by get_async_client.
+        :return: Result of the coroutine.
+        """
+        with self._lock:
+            loop = self._get_loop()
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+    def get_async_client(self, username, password):
+        """
+        Return the shared asynchronous client for an account, creating it on first use.
+
+        The client must only be used from coroutines passed to run.
+
+        :param username: SpaceTrack account login (email).
+        :param password: SpaceTrack account password.
+        :return: AsyncSpacetrackClientWrapper instance.
+        """
+        with self._lock:
+            client = self._async_clients.get((username, password))
+            if client is None:
+                async def create():
+                    return AsyncSpacetrackClientWrapper(username, password, base_url=self.base_url)
+                # Create it on the loop thread so its semaphore and lock belong to that loop.
+                client = asyncio.run_coroutine_threadsafe(create(), self._get_loop()).result()
+                self._async_clients[(username, password)] = client
+            return client
+
+    def fetch_many(self, username, password, sat_ids, track_day=None, data_format='TLE', latest=False,
+                   history=False):
+        """
+        Blocking helper that runs get_many with the account's shared asynchronous client.
+
+        :param username: SpaceTrack account login (email).
+        :param password: SpaceTrack account password.
+        :param sat_ids: Iterable of NORAD IDs.
+        :param track_day: Date of the track (ignored when latest is True).
+        :param data_format: 'TLE' or 'OMM'.
+        :param latest: Fetch the current element sets instead of historical ones.
+        :param history: Fetch every element set around track_day instead of the closest one.
+        :return: Dict mapping each NORAD ID to its data, or to the exception raised for it.
+        """
+        client = self.get_async_client(username, password)
+        return self.run(client.get_many(sat_ids, track_day, data_format, latest, history))
+
+    def close(self):
+        """
+        Close all clients and their connection pools, and stop the event loop.
+        """
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            async_clients = list(self._async_clients.values())
+            self._async_clients.clear()
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        for client in clients:
+            client.close()
+        if loop is not None:
+            for client in async_clients:
+                asyncio.run_coroutine_threadsafe(client.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+
+# Process-wide pool used by the dialog, the Processing algorithms and the CLI.
+default_session_pool = SpaceTrackSessionPool()
@@ -0,0 +1,139 @@
+"""
+This module contains geodesic line simplification for track export.
+
+Ground tracks are sampled every step_minutes, which gives far more vertices than a
+small-scale map needs. The Douglas-Peucker algorithm here measures the deviation of
+the dropped vertices on the ground, so the tolerance is a distance in km, the same at
+every latitude. It is measured from the line as it is written: the straight line in
+longitude/latitude between the kept vertices, or the great circle through them when
+the line is densified along great circles afterwards.
+"""
+
+import numpy as np
+
+from .geodesic import unit_vectors
+from .track import EARTH_EQUATORIAL_RADIUS_KM
+
+# Samples of a longitude/latitude chord searched for the point nearest to each vertex,
+# and golden-section steps refining it between the neighbouring samples.
+CHORD_SAMPLES = 64
+CHORD_REFINEMENTS = 40
+
+_GOLDEN = (np.sqrt(5) - 1) / 2
+
+
+def _great_circle_distances(inner, start, end):
+    """
+    Angular distances of the points inner from the great circle through start and end.
+    """
+    normal = np.cross(start, end)
+    norm = np.linalg.norm(normal)
+    if norm > 1e-12:
+        return np.abs(np.arcsin(np.clip(inner @ (normal / norm), -1.0, 1.0)))
+    # Coincident (or antipodal) ends: use the distance to the first one.
+    return np.arccos(np.clip(inner @ start, -1.0, 1.0))
+
+
+def _chord_distances(inner, start, end):
+    """
+    Angular distances of the points inner from the straight longitude/latitude line
+    between start and end.
+
+    The nearest point of the chord is searched among CHORD_SAMPLES samples and refined
+    by golden-section search around the best one. Every value is the distance to an
+    actual point of the chord, so it never underestimates the true distance.
+
+    :param inner: Unit vectors of the points, one row per point.
+    :param start: (lon, lat) of the start of the chord in degrees.
+    :param end: (lon, lat) of the end of the chord in degrees.
+    :return: Array of angular distances in radians.
+    """
+    start = np.asarray(start, dtype=float)
+    delta = np.asarray(end, dtype=float) - start
+
+    def cosines(fractions):
+        # Cosine of the angle between every point and the chord point at its fraction.
+        chord = unit_vectors(start[0] + fractions * delta[0], start[1] + fractions * delta[1])
+        return np.einsum('ij,ij->i', inner, chord)
+
+    samples = np.linspace(0.0, 1.0, CHORD_SAMPLES + 1)
+    chord = unit_vectors(start[0] + samples * delta[0], start[1] + samples * delta[1])
+    sample_cosines = inner @ chord.T
+    nearest = np.argmax(sample_cosines, axis=1)
+    best = sample_cosines[np.arange(len(inner)), nearest]
+    low = samples[np.maximum(nearest - 1, 0)]
+    high = samples[np.minimum(nearest + 1, CHORD_SAMPLES)]
+    for _ in range(CHORD_REFINEMENTS):
+        left = high - _GOLDEN * (high - low)
+        right = low + _GOLDEN * (high - low)
+        left_cosines = cosines(left)
+        right_cosines = cosines(right)
+        best = np.maximum(best, np.maximum(left_cosines, right_cosines))
+        closer_left = left_cosines > right_cosines
+        high = np.where(closer_left, right, high)
+        low = np.where(closer_left, low, left)
+    return np.arccos(np.clip(best, -1.0, 1.0))
+
+
+def simplify_mask(lons, lats, tolerance_km, geodesic=False):
+    """
+    Select the vertices of a line kept by geodesic Douglas-Peucker simplification.
+
+    Each step handles one span between kept vertices and computes the ground
+    distances of all vertices in the span with array operations; the Python loop
+    runs once per kept vertex, never per dropped one.
+
+    :param lons: Longitudes in degrees.
+    :param lats: Latitudes in degrees.
+    :param tolerance_km: Maximum distance of a dropped vertex from the simplified line.
+    :param geodesic: Measure the distance from the great circle through the kept vertices
+                     (for lines densified along great circles) instead of the straight
+                     longitude/latitude line between them.
+    :return: Boolean array, True for the vertices to keep (always the first and last).
+    """
+    count = len(lons)
+    if tolerance_km <= 0 or count < 3:
+        return np.ones(count, dtype=bool)
+    keep = np.zeros(count, dtype=bool)
+    keep[[0, -1]] = True
+
+    lons = np.asarray(lons, dtype=float)
+    lats = np.asarray(lats, dtype=float)
+    points = unit_vectors(lons, lats)
+    tolerance = tolerance_km / EARTH_EQUATORIAL_RADIUS_KM
+    spans = [(0, count - 1)]
+    while spans:
+        first, last = spans.pop()
+        if last - first < 2:
+            continue
+        inner = points[first + 1:last]
+        if geodesic:
+            distances = _great_circle_distances(inner, points[first], points[last])
+        else:
+            distances = _chord_distances(inner, (lons[first], lats[first]), (lons[last], lats[last]))
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            spans.append((first, split))
+            spans.append((split, last))
+    return keep
+
+
+def simplify_segments(segments, tolerance_km, geodesic=False):
+    """
+    Simplify line segments given as lists of (lon, lat) tuples.
+
+    :param segments: List of segments, each a list of (lon, lat) tuples.
+    :param tolerance_km: Tolerance in km; segments are returned unchanged when it is not positive.
+    :param geodesic: Measure deviations from great circles (see simplify_mask).
+    :return: List of simplified segments.
+    """
+    if tolerance_km <= 0:
+        return segments
+    simplified = []
+    for segment in segments:
+        coordinates = np.asarray(segment, dtype=float).reshape(-1, 2)
+        mask = simplify_mask(coordinates[:, 0], coordinates[:, 1], tolerance_km, geodesic)
+        simplified.append([segment[i] for i in np.flatnonzero(mask).tolist()])
+    return simplified
@@ -3,11 +3,42 @@ This module contains the SpacetrackClientWrapper class for SpaceTrack API commun
 It provides methods to retrieve TLE and OMM data.
 """
 
+import time
+import asyncio
+import threading
 from datetime import date, timedelta
+import httpx
 import spacetrack.operators as op
-from spacetrack import SpaceTrackClient
+from spacetrack import SpaceTrackClient, AsyncSpaceTrackClient
+from spacetrack.base import BASE_URL
 import json
 
+from .ratelimit import default_rate_limiters, backoff_delay, may_block
+from .readers import iter_tle
+
+
+class SpaceTrackError(Exception):
+    """
+    Raised when SpaceTrack returns no data for a request.
+    """
+
+
+def _is_retryable(error):
+    """
+    Return True for errors worth retrying: throttling, server errors and network failures.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+def _retry_after(error):
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.headers.get('Retry-After')
+    return None
+
+
 class SpacetrackClientWrapper:
     """
     Wrapper for SpaceTrack API.
@@ -15,16 +46,109 @@ class SpacetrackClientWrapper:
     This class encapsulates the logic to retrieve satellite data (TLE or OMM) using the SpaceTrack API.
     """
 
-    def __init__(self, username, password):
+    # Space-Track session cookies expire after about two hours of use.
+    SESSION_LIFETIME = 90 * 60
+
+    def __init__(self, username, password, session_lifetime=SESSION_LIFETIME, rate_limiter=None,
+                 max_retries=4, base_url=BASE_URL):
         """
         Initialize the SpaceTrack client with user credentials.
 
+        The client keeps its HTTP connection pool and session cookie for its whole
+        lifetime, so reusing one wrapper avoids a login round-trip per request.
+
         :param username: SpaceTrack account login (email).
         :param password: SpaceTrack account password.
+        :param session_lifetime: Seconds after which the session is renewed.
+        :param rate_limiter: RateLimiter shared with other clients (defaults to the account's one).
+        :param max_retries: Number of retries on HTTP 429, 5xx and network errors.
+        :param base_url: SpaceTrack server URL, e.g. a local mock server in tests.
         """
         self.username = username
         self.password = password
-        self.client = SpaceTrackClient(identity=username, password=password)
+        self.base_url = base_url
+        self.session_lifetime = session_lifetime
+        self.rate_limiter = rate_limiter if rate_limiter is not None else default_rate_limiters.get(username)
+        self.max_retries = max_retries
+        self.client = self._create_client()
+        self._login_time = None
+        # The pool hands one wrapper to several threads (dialog, Processing, CLI): the
+        # session state is only changed under this lock, so one thread renews it at a time.
+        self._login_lock = threading.Lock()
+        # Number of the current session, so that concurrent requests rejected with
+        # HTTP 401 renew it only once.
+        self._session = 0
+        # Clients of expired sessions, kept open for requests still in flight on them.
+        self._expired_clients = []
+
+    def _create_client(self):
+        return SpaceTrackClient(identity=self.username, password=self.password, base_url=self.base_url)
+
+    def _request(self, class_name, **kwargs):
+        """
+        Send a request through the shared rate limiter.
+
+        Logs in first if there is no valid session, and retries with exponential
+        backoff on HTTP 429, 5xx and network errors.
+
+        :param class_name: SpaceTrack request class ('gp', 'gp_history', ...).
+        :param kwargs: Request predicates.
+        :return: Response data.
+        """
+        self._login()
+        attempt = 0
+        relogged = False
+        while True:
+            with self._login_lock:
+                session, client = self._session, self.client
+            self.rate_limiter.acquire()
+            try:
+                return getattr(client, class_name)(**kwargs)
+            except (httpx.HTTPStatusError, httpx.TransportError) as e:
+                if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 401 and not relogged:
+                    # The session expired on the server side before our estimate.
+                    self._login(rejected_session=session)
+                    relogged = True
+                    continue
+                attempt += 1
+                # Do not freeze the QGIS GUI thread with the backoff sleep.
+                if not _is_retryable(e) or attempt > self.max_retries or not may_block():
+                    raise
+                self.rate_limiter.record_retry()
+                time.sleep(backoff_delay(attempt, retry_after=_retry_after(e)))
+
+    def _login(self, rejected_session=None):
+        """
+        Log in when there is no valid session, or renew a session the server rejected.
+
+        :param rejected_session: Number of the session a request was rejected with (HTTP 401);
+                                 nothing is done if another thread has renewed it meanwhile.
+        """
+        with self._login_lock:
+            if rejected_session is None:
+                if self._login_time is not None and time.monotonic() - self._login_time <= self.session_lifetime:
+                    return
+            elif rejected_session != self._session:
+                return
+            if self._login_time is not None:
+                # SpaceTrackClient logs in only once per instance: renew the session with a new client.
+                # Its own throttle starts afresh; the account's shared rate limiter keeps the pace.
+                self._expired_clients.append(self.client)
+                self.client = self._create_client()
+            self.rate_limiter.acquire()
+            self.client.authenticate()
+            self._login_time = time.monotonic()
+            self._session += 1
+
+    def close(self):
+        """
+        Close the HTTP connection pools.
+        """
+        with self._login_lock:
+            clients = self._expired_clients + [self.client]
+            self._expired_clients = []
+        for client in clients:
+            client.close()
 
     def get_tle(self, sat_id, track_day=None, latest=False):
         """
@@ -35,22 +159,11 @@ class SpacetrackClientWrapper:
                           the latest TLE data is used.
         :param latest: Boolean flag to force retrieval of the latest TLE.
         :return: Tuple (tle_1, tle_2, orb_incl) containing the TLE lines and orbital inclination.
-        :raises Exception: If TLE data cannot be retrieved.
+        :raises SpaceTrackError: If TLE data cannot be retrieved.
         """
-        if latest or (track_day is None or track_day > date.today()):
-            data = self.client.gp(norad_cat_id=sat_id, orderby='epoch desc', limit=1, format='tle')
-        else:
-            daterange = op.inclusive_range(track_day, track_day + timedelta(days=1))
-            data = self.client.gp_history(norad_cat_id=sat_id, orderby='epoch desc', limit=1,
-                                          format='tle', epoch=daterange)
-
-        if not data:
-            raise Exception(f'Failed to retrieve TLE for satellite with ID {sat_id}')
-
-        tle_1 = data[0:69]
-        tle_2 = data[70:139]
-        orb_incl = data[78:86]
-        return tle_1, tle_2, orb_incl
+        class_name, predicates = _build_query(sat_id, track_day, latest, 'tle')
+        data = self._request(class_name, **predicates)
+        return _parse_tle(data, sat_id)
 
     def get_omm(self, sat_id, track_day=None, latest=False):
         """
@@ -61,17 +174,271 @@ class SpacetrackClientWrapper:
                           the latest OMM data is used.
         :param latest: Boolean flag to force retrieval of the latest OMM.
         :return: OMM data as a JSON object.
-        :raises Exception: If OMM data cannot be retrieved.
+        :raises SpaceTrackError: If OMM data cannot be retrieved.
         """
-        if latest or (track_day is None or track_day > date.today()):
-            data = self.client.gp(norad_cat_id=sat_id, orderby='epoch desc',
-                                  limit=1, format='json')
-        else:
-            daterange = op.inclusive_range(track_day, track_day + timedelta(days=1))
-            data = self.client.gp_history(norad_cat_id=sat_id, orderby='epoch desc',
-                                          limit=1, format='json', epoch=daterange)
-
+        class_name, predicates = _build_query(sat_id, track_day, latest, 'json')
+        data = self._request(class_name, **predicates)
         if not data:
-            raise Exception(f'Failed to retrieve OMM data for satellite {sat_id}')
+            raise SpaceTrackError(f'Failed to retrieve OMM data for satellite {sat_id}')
 
         return data
+
+    def get_tle_history(self, sat_id, start_time, end_time, margin_days=1):
+        """
+        Retrieve every TLE of a satellite with an epoch near a time window.
+
+        :param sat_id: Satellite NORAD ID.
+        :param start_time: Start of the window (datetime or date).
+        :param end_time: End of the window (datetime or date).
+        :param margin_days: Days added on both sides, so the first and last time steps
+                            also have an element set close to them.
+        :return: List of tuples (tle_1, tle_2, orb_incl), newest first.
+        :raises SpaceTrackError: If no TLE was published for the window.
+        """
+        class_name, predicates = _build_history_query(sat_id, start_time, end_time, margin_days, 'tle')
+        return _parse_tle_history(self._request(class_name, **predicates), sat_id)
+
+    def get_omm_history(self, sat_id, start_time, end_time, margin_days=1):
+        """
+        Retrieve every OMM record of a satellite with an epoch near a time window.
+
+        :return: OMM records as a JSON string, newest first, see get_tle_history.
+        :raises SpaceTrackError: If no OMM record was published for the window.
+        """
+        class_name, predicates = _build_history_query(sat_id, start_time, end_time, margin_days, 'json')
+        return _check_omm_history(self._request(class_name, **predicates), sat_id)
+
+
+class AsyncSpacetrackClientWrapper:
+    """
+    Asynchronous wrapper for SpaceTrack API.
+
+    Runs many gp/gp_history requests concurrently through the library's
+    AsyncSpaceTrackClient, so multi-object pulls overlap their network waits. The
+    number of requests in flight is capped by max_concurrency, and the client's
+    built-in throttling keeps them within SpaceTrack's published rate limits.
+
+    Like SpacetrackClientWrapper, one instance keeps its session across calls; it is
+    bound to the event loop it is first used on (see session.SpaceTrackSessionPool).
+    """
+
+    def __init__(self, username, password, max_concurrency=5, rate_limiter=None, max_retries=4,
+                 base_url=BASE_URL, session_lifetime=SpacetrackClientWrapper.SESSION_LIFETIME):
+        """
+        :param username: SpaceTrack account login (email).
+        :param password: SpaceTrack account password.
+        :param max_concurrency: Maximum number of requests in flight.
+        :param rate_limiter: RateLimiter shared with other clients (defaults to the account's one).
+        :param max_retries: Number of retries on HTTP 429, 5xx and network errors.
+        :param base_url: SpaceTrack server URL, e.g. a local mock server in tests.
+        :param session_lifetime: Seconds after which the session is renewed.
+        """
+        self.username = username
+        self.password = password
+        self.base_url = base_url
+        self.session_lifetime = session_lifetime
+        self.client = self._create_client()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else default_rate_limiters.get(username)
+        self.max_retries = max_retries
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._login_lock = asyncio.Lock()
+        self._login_time = None
+        # Number of the current session, so that concurrent requests rejected with
+        # HTTP 401 renew it only once.
+        self._session = 0
+        # Clients of expired sessions, kept open for requests still in flight on them.
+        self._expired_clients = []
+
+    def _create_client(self):
+        return AsyncSpaceTrackClient(identity=self.username, password=self.password, base_url=self.base_url)
+
+    async def _login(self, rejected_session=None):
+        """
+        Log in when there is no valid session, or renew a session the server rejected.
+
+        :param rejected_session: Number of the session a request was rejected with (HTTP 401);
+                                 nothing is done if another request has renewed it meanwhile.
+        """
+        async with self._login_lock:
+            if rejected_session is None:
+                if self._login_time is not None and time.monotonic() - self._login_time <= self.session_lifetime:
+                    return
+            elif rejected_session != self._session:
+                return
+            if self._login_time is not None:
+                # AsyncSpaceTrackClient logs in only once per instance: renew the session with a new client.
+                self._expired_clients.append(self.client)
+                self.client = self._create_client()
+            await self.rate_limiter.acquire_async()
+            await self.client.authenticate()
+            self._login_time = time.monotonic()
+            self._session += 1
+
+    async def _request(self, class_name, **kwargs):
+        async with self._semaphore:
+            await self._login()
+            attempt = 0
+            relogged = False
+            while True:
+                session = self._session
+                await self.rate_limiter.acquire_async()
+                try:
+                    return await getattr(self.client, class_name)(**kwargs)
+                except (httpx.HTTPStatusError, httpx.TransportError) as e:
+                    if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 401 and not relogged:
+                        # The session expired on the server side before our estimate.
+                        await self._login(rejected_session=session)
+                        relogged = True
+                        continue
+                    attempt += 1
+                    if not _is_retryable(e) or attempt > self.max_retries:
+                        raise
+                    self.rate_limiter.record_retry()
+                    await asyncio.sleep(backoff_delay(attempt, retry_after=_retry_after(e)))
+
+    async def get_tle(self, sat_id, track_day=None, latest=False):
+        """
+        Retrieve TLE data for the specified satellite.
+
+        :return: Tuple (tle_1, tle_2, orb_incl), see SpacetrackClientWrapper.get_tle.
+        :raises SpaceTrackError: If TLE data cannot be retrieved.
+        """
+        class_name, predicates = _build_query(sat_id, track_day, latest, 'tle')
+        return _parse_tle(await self._request(class_name, **predicates), sat_id)
+
+    async def get_omm(self, sat_id, track_day=None, latest=False):
+        """
+        Retrieve OMM data for the specified satellite in JSON format.
+
+        :return: OMM data as a JSON string, see SpacetrackClientWrapper.get_omm.
+        :raises SpaceTrackError: If OMM data cannot be retrieved.
+        """
+        class_name, predicates = _build_query(sat_id, track_day, latest, 'json')
+        data = await self._request(class_name, **predicates)
+        if not data:
+            raise SpaceTrackError(f'Failed to retrieve OMM data for satellite {sat_id}')
+        return data
+
+    async def get_tle_history(self, sat_id, start_time, end_time, margin_days=1):
+        """
+        Retrieve every TLE of a satellite with an epoch near a time window.
+
+        :return: List of tuples (tle_1, tle_2, orb_incl), see SpacetrackClientWrapper.get_tle_history.
+        :raises SpaceTrackError: If no TLE was published for the window.
+        """
+        class_name, predicates = _build_history_query(sat_id, start_time, end_time, margin_days, 'tle')
+        return _parse_tle_history(await self._request(class_name, **predicates), sat_id)
+
+    async def get_omm_history(self, sat_id, start_time, end_time, margin_days=1):
+        """
+        Retrieve every OMM record of a satellite with an epoch near a time window.
+
+        :return: OMM records as a JSON string, see SpacetrackClientWrapper.get_omm_history.
+        :raises SpaceTrackError: If no OMM record was published for the window.
+        """
+        class_name, predicates = _build_history_query(sat_id, start_time, end_time, margin_days, 'json')
+        return _check_omm_history(await self._request(class_name, **predicates), sat_id)
+
+    async def get_many(self, sat_ids, track_day=None, data_format='TLE', latest=False, history=False):
+        """
+        Retrieve TLE or OMM data for several satellites concurrently.
+
+        :param sat_ids: Iterable of satellite NORAD IDs.
+        :param track_day: Date for which data is needed.
+        :param data_format: 'TLE' or 'OMM'.
+        :param latest: Boolean flag to force retrieval of the latest data.
+        :param history: Retrieve every element set around track_day (see get_tle_history)
+                        instead of the one closest to it.
+        :return: Dict mapping each NORAD ID to its data, or to the exception raised for it.
+        """
+        sat_ids = list(sat_ids)
+        if history:
+            fetch = self.get_tle_history if data_format == 'TLE' else self.get_omm_history
+            requests = (fetch(sat_id, track_day, track_day + timedelta(days=1)) for sat_id in sat_ids)
+        else:
+            fetch = self.get_tle if data_format == 'TLE' else self.get_omm
+            requests = (fetch(sat_id, track_day, latest) for sat_id in sat_ids)
+        results = await asyncio.gather(*requests, return_exceptions=True)
+        return dict(zip(sat_ids, results))
+
+    async def close(self):
+        """
+        Close the HTTP connection pools.
+        """
+        for client in self._expired_clients + [self.client]:
+            await client.close()
+        self._expired_clients = []
+
+
+def _parse_tle_history(data, sat_id):
+    """
+    Parse the response of a TLE history query.
+
+    :return: List of tuples (tle_1, tle_2, orb_incl).
+    :raises SpaceTrackError: If the response holds no TLE.
+    """
+    element_sets = [(tle_1, tle_2, inc) for _, tle_1, tle_2, inc in iter_tle(data.splitlines())] \
+        if data else []
+    if not element_sets:
+        raise SpaceTrackError(f'Failed to retrieve TLE history for satellite with ID {sat_id}')
+    return element_sets
+
+
+def _check_omm_history(data, sat_id):
+    """
+    Check that the response of an OMM history query holds records.
+
+    :return: The response JSON string.
+    :raises SpaceTrackError: If the response is empty.
+    """
+    if not data or data.strip() == '[]':
+        raise SpaceTrackError(f'Failed to retrieve OMM history for satellite {sat_id}')
+    return data
+
+
+def _build_query(sat_id, track_day, latest, data_format):
+    """
+    Build the request class and predicates for a single-object element set query.
+
+    :param sat_id: Satellite NORAD ID.
+    :param track_day: Date for which data is needed. If None or in the future,
+                      the latest data is used.
+    :param latest: Boolean flag to force retrieval of the latest data.
+    :param data_format: SpaceTrack response format ('tle' or 'json').
+    :return: Tuple (class_name, predicates).
+    """
+    if latest or (track_day is None or track_day > date.today()):
+        return 'gp', dict(norad_cat_id=sat_id, orderby='epoch desc', limit=1, format=data_format)
+    daterange = op.inclusive_range(track_day, track_day + timedelta(days=1))
+    return 'gp_history', dict(norad_cat_id=sat_id, orderby='epoch desc', limit=1,
+                              format=data_format, epoch=daterange)
+
+
+def _build_history_query(sat_id, start_time, end_time, margin_days, data_format):
+    """
+    Build the gp_history query for all element sets of an object within a window.
+
+    :return: Tuple (class_name, predicates).
+    """
+    first = start_time - timedelta(days=margin_days)
+    last = end_time + timedelta(days=margin_days)
+    first = first.date() if hasattr(first, 'date') else first
+    last = last.date() if hasattr(last, 'date') else last
+    return 'gp_history', dict(norad_cat_id=sat_id, orderby='epoch desc', format=data_format,
+                              epoch=op.inclusive_range(first, last))
+
+
+def _parse_tle(data, sat_id):
+    """
+    Split a TLE response into its lines and inclination.
+
+    :return: Tuple (tle_1, tle_2, orb_incl).
+    :raises SpaceTrackError: If the response is empty.
+    """
+    if not data:
+        raise SpaceTrackError(f'Failed to retrieve TLE for satellite with ID {sat_id}')
+
+    tle_1 = data[0:69]
+    tle_2 = data[70:139]
+    orb_incl = data[78:86]
+    return tle_1, tle_2, orb_incl
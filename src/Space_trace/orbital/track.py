@@ -0,0 +1,206 @@
+"""
+This module contains helpers for orbital tracks in columnar form (a dict of NumPy
+arrays): conversion from and to the row form (a list of point tuples), slicing and
+decimation, and the coordinate transforms between ECI (TEME), Earth-fixed (ECEF)
+and geodetic coordinates used to build the track and state vector columns.
+"""
+
+import numpy as np
+from pyorbital import astronomy
+
+# WGS-84 ellipsoid.
+EARTH_EQUATORIAL_RADIUS_KM = 6378.137
+EARTH_FLATTENING = 1 / 298.257223563
+# Upper bound of the iterations of the geodetic latitude in eci_to_lonlatalt.
+LATITUDE_ITERATIONS = 20
+# Rotation rate of the Earth in rad/s.
+EARTH_ROTATION_RATE = 7.2921150e-5
+# Gravitational parameter of the Earth in km^3/s^2.
+EARTH_GM = 398600.4418
+
+# Column names in the order of the point tuple fields.
+POINT_COLUMNS = ('time', 'lon', 'lat', 'alt', 'velocity', 'azimuth',
+                 'elevation', 'true_anomaly', 'inclination')
+
+# Optional state vector columns: ECI (TEME) and Earth-fixed positions in km and
+# velocities in km/s, and the speed of the sub-satellite point in km/s.
+STATE_COLUMNS = ('eci_x', 'eci_y', 'eci_z', 'eci_vx', 'eci_vy', 'eci_vz',
+                 'ecef_x', 'ecef_y', 'ecef_z', 'ecef_vx', 'ecef_vy', 'ecef_vz', 'ground_speed')
+
+
+def points_to_columns(points):
+    """
+    Convert a list of point tuples into columnar form.
+
+    :param points: List of tuples (datetime, lon, lat, alt, velocity, azimuth, elevation, true_anomaly, inc).
+    :return: Dict mapping column names to NumPy arrays.
+    """
+    if not points:
+        columns = {name: np.empty(0, dtype=float) for name in POINT_COLUMNS}
+        columns['time'] = np.empty(0, dtype='datetime64[ms]')
+        return columns
+
+    rows = list(zip(*points))
+    columns = {'time': np.array(rows[0], dtype='datetime64[ms]')}
+    for name, values in zip(POINT_COLUMNS[1:], rows[1:]):
+        columns[name] = np.asarray(values, dtype=float)
+    return columns
+
+
+def columns_to_points(columns):
+    """
+    Convert columnar track data back into a list of point tuples.
+
+    :param columns: Dict mapping column names to NumPy arrays.
+    :return: List of tuples (datetime, lon, lat, alt, velocity, azimuth, elevation, true_anomaly, inc).
+    """
+    times = columns['time'].astype('datetime64[ms]').tolist()
+    values = [columns[name].tolist() for name in POINT_COLUMNS[1:]]
+    return list(zip(times, *values))
+
+
+def concat_columns(first, second):
+    """
+    Concatenate two columnar tracks.
+    """
+    return {name: np.concatenate((first[name], second[name])) for name in first}
+
+
+def slice_columns(columns, start, stop):
+    """
+    Return the rows [start:stop] of a columnar track.
+    """
+    return {name: column[start:stop] for name, column in columns.items()}
+
+
+def decimate_columns(columns, factor):
+    """
+    Keep every factor-th row of a columnar track, and always the last one.
+    """
+    count = len(columns['time'])
+    if factor <= 1 or count == 0:
+        return columns
+    indices = np.arange(0, count, int(factor))
+    if indices[-1] != count - 1:
+        indices = np.append(indices, count - 1)
+    return {name: column[indices] for name, column in columns.items()}
+
+
+def columns_nbytes(columns):
+    """
+    Return the total memory size of the track columns in bytes.
+    """
+    return sum(column.nbytes for column in columns.values())
+
+
+def track_length(columns):
+    """
+    Return the number of points in a columnar track.
+    """
+    return len(columns['time'])
+
+
+def eci_to_lonlatalt(x, y, z, times):
+    """
+    Convert ECI (TEME) positions into geodetic coordinates on the WGS-84 ellipsoid.
+
+    This is the vectorized equivalent of pyorbital's Orbital.get_lonlatalt, applied to
+    positions that have already been propagated.
+
+    :param x: ECI x coordinates in km.
+    :param y: ECI y coordinates in km.
+    :param z: ECI z coordinates in km.
+    :param times: Array of numpy.datetime64 times matching the positions.
+    :return: Tuple (lon, lat, alt) of arrays in degrees, degrees and km; NaN where a position is NaN.
+    """
+    x, y, z = np.asarray(x, dtype=float), np.asarray(y, dtype=float), np.asarray(z, dtype=float)
+    lon = (np.arctan2(y, x) - astronomy.gmst(times)) % (2 * np.pi)
+    lon = np.where(lon > np.pi, lon - 2 * np.pi, lon)
+
+    r = np.hypot(x, y)
+    e2 = EARTH_FLATTENING * (2 - EARTH_FLATTENING)
+    lat = np.arctan2(z, r)
+    # The error shrinks by a factor of about e2 per iteration; NaN positions (objects
+    # the propagator failed for) never converge and only give NaN results.
+    for _ in range(LATITUDE_ITERATIONS):
+        previous = lat
+        c = EARTH_EQUATORIAL_RADIUS_KM / np.sqrt(1 - e2 * np.sin(previous) ** 2)
+        lat = np.arctan2(z + c * e2 * np.sin(previous), r)
+        difference = np.abs(lat - previous)
+        if np.all(difference[np.isfinite(difference)] < 1e-10):
+            break
+    alt = r / np.cos(lat) - c
+    return np.degrees(lon), np.degrees(lat), alt
+
+
+def lonlatalt_to_ecef(lon, lat, alt):
+    """
+    Convert geodetic coordinates on the WGS-84 ellipsoid into Earth-fixed (ECEF) positions.
+
+    :param lon: Longitudes in degrees.
+    :param lat: Latitudes in degrees.
+    :param alt: Altitudes in km.
+    :return: Tuple (x, y, z) of arrays in km.
+    """
+    lon = np.radians(np.asarray(lon, dtype=float))
+    lat = np.radians(np.asarray(lat, dtype=float))
+    alt = np.asarray(alt, dtype=float)
+    e2 = EARTH_FLATTENING * (2 - EARTH_FLATTENING)
+    c = EARTH_EQUATORIAL_RADIUS_KM / np.sqrt(1 - e2 * np.sin(lat) ** 2)
+    x = (c + alt) * np.cos(lat) * np.cos(lon)
+    y = (c + alt) * np.cos(lat) * np.sin(lon)
+    z = (c * (1 - e2) + alt) * np.sin(lat)
+    return x, y, z
+
+
+def eci_to_ecef(positions, velocities, times):
+    """
+    Rotate ECI (TEME) state vectors into the Earth-fixed frame.
+
+    The rotation is by the Greenwich mean sidereal time, as in eci_to_lonlatalt;
+    polar motion is ignored, so the frame is the pseudo Earth-fixed one.
+
+    :param positions: Tuple (x, y, z) of ECI positions in km.
+    :param velocities: Tuple (vx, vy, vz) of ECI velocities in km/s.
+    :param times: Array of numpy.datetime64 times matching the states.
+    :return: Tuple (positions, velocities) of Earth-fixed (x, y, z) arrays.
+    """
+    x, y, z = (np.asarray(value, dtype=float) for value in positions)
+    vx, vy, vz = (np.asarray(value, dtype=float) for value in velocities)
+    theta = astronomy.gmst(times)
+    cos_theta, sin_theta = np.cos(theta), np.sin(theta)
+    ecef_x = cos_theta * x + sin_theta * y
+    ecef_y = cos_theta * y - sin_theta * x
+    # The frame rotates with the Earth: subtract the rotation velocity (omega x r).
+    ecef_vx = cos_theta * vx + sin_theta * vy + EARTH_ROTATION_RATE * ecef_y
+    ecef_vy = cos_theta * vy - sin_theta * vx - EARTH_ROTATION_RATE * ecef_x
+    return (ecef_x, ecef_y, z.copy()), (ecef_vx, ecef_vy, vz.copy())
+
+
+def state_vector_columns(positions, velocities, times, lons, lats):
+    """
+    Compute the state vector columns (see STATE_COLUMNS) from propagated ECI states.
+
+    The ground speed is the horizontal Earth-fixed speed scaled down from the
+    satellite's radius to the radius of the ellipsoid below it.
+
+    :param positions: Tuple (x, y, z) of ECI positions in km.
+    :param velocities: Tuple (vx, vy, vz) of ECI velocities in km/s.
+    :param times: Array of numpy.datetime64 times matching the states.
+    :param lons: Geodetic longitudes of the states in degrees.
+    :param lats: Geodetic latitudes of the states in degrees.
+    :return: Dict of float arrays keyed by the names in STATE_COLUMNS.
+    """
+    eci = [np.asarray(value, dtype=float) for value in (*positions, *velocities)]
+    ecef_positions, ecef_velocities = eci_to_ecef(positions, velocities, times)
+
+    r = np.stack(ecef_positions)
+    v = np.stack(ecef_velocities)
+    radius = np.linalg.norm(r, axis=0)
+    radial_speed = np.einsum('ij,ij->j', r, v) / radius
+    horizontal_speed = np.sqrt(np.maximum(np.einsum('ij,ij->j', v, v) - radial_speed ** 2, 0))
+    surface_radius = np.linalg.norm(np.stack(lonlatalt_to_ecef(lons, lats, 0)), axis=0)
+
+    columns = dict(zip(STATE_COLUMNS, eci + list(ecef_positions) + list(ecef_velocities)))
+    columns['ground_speed'] = horizontal_speed * surface_radius / radius
+    return columns
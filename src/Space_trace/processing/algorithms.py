@@ -0,0 +1,470 @@
+"""
+This module contains the QGIS Processing algorithms of the Space trace plugin.
+
+The algorithms build on OrbitalOrchestrator and OrbitalLogicHandler, so they can be
+run in batch mode, used in the model builder and executed in the background.
+"""
+
+import json
+from datetime import date, datetime, timedelta, timezone
+
+from qgis.core import (QgsProcessing, QgsProcessingAlgorithm, QgsProcessingException,
+                       QgsProcessingParameterNumber, QgsProcessingParameterFile,
+                       QgsProcessingParameterEnum, QgsProcessingParameterString,
+                       QgsProcessingParameterDateTime, QgsProcessingParameterBoolean,
+                       QgsProcessingParameterDefinition,
+                       QgsProcessingParameterFeatureSink, QgsProcessingParameterPoint,
+                       QgsProcessingLayerPostProcessorInterface,
+                       QgsFeatureSink, QgsFeature, QgsFields, QgsField, QgsGeometry,
+                       QgsPointXY, QgsWkbTypes, QgsCoordinateReferenceSystem)
+from qgis.PyQt.QtCore import Qt, QCoreApplication, QVariant, QDateTime
+from pyorbital.orbital import Orbital
+
+from ..orbital.orchestrator import OrbitalOrchestrator
+from ..orbital.handler import OrbitalLogicHandler
+from ..orbital.saver import (configure_temporal, point_fields as track_point_fields,
+                             line_fields as track_line_fields)
+from ..orbital.session import default_session_pool
+from ...config.orbital import OrbitalConfig
+
+DATA_FORMATS = ['TLE', 'OMM']
+
+
+class SpaceTraceAlgorithm(QgsProcessingAlgorithm):
+    """
+    Base class with the data source parameters shared by all Space trace algorithms.
+    """
+
+    SAT_ID = 'SAT_ID'
+    DATA_FILE = 'DATA_FILE'
+    DATA_FORMAT = 'DATA_FORMAT'
+    LOGIN = 'LOGIN'
+    PASSWORD = 'PASSWORD'
+    TRACK_DAY = 'TRACK_DAY'
+    EPOCH_SERIES = 'EPOCH_SERIES'
+    REVOLUTION_LINES = 'REVOLUTION_LINES'
+    SIMPLIFY_KM = 'SIMPLIFY_KM'
+    DENSIFY_KM = 'DENSIFY_KM'
+    STATE_VECTORS = 'STATE_VECTORS'
+
+    def tr(self, message):
+        return QCoreApplication.translate('SpaceTraceProcessing', message)
+
+    def createInstance(self):
+        return type(self)()
+
+    def group(self):
+        return self.tr('Orbital tracks')
+
+    def groupId(self):
+        return 'orbitaltracks'
+
+    def _add_source_parameters(self, with_sat_id=True):
+        """
+        Add the data source and track day parameters.
+
+        :param with_sat_id: Whether to add the single NORAD ID parameter.
+        """
+        if with_sat_id:
+            self.addParameter(QgsProcessingParameterNumber(
+                self.SAT_ID, self.tr('Satellite NORAD ID'),
+                type=QgsProcessingParameterNumber.Integer, minValue=1, optional=True))
+        self.addParameter(QgsProcessingParameterFile(
+            self.DATA_FILE, self.tr('Local TLE/OMM file (instead of SpaceTrack)'),
+            optional=True, fileFilter='TLE/OMM (*.txt *.tle *.json *.xml *.csv)'))
+        self.addParameter(QgsProcessingParameterEnum(
+            self.DATA_FORMAT, self.tr('Data format'), options=DATA_FORMATS, defaultValue=0))
+        self.addParameter(QgsProcessingParameterString(
+            self.LOGIN, self.tr('SpaceTrack login'), optional=True))
+        self.addParameter(QgsProcessingParameterString(
+            self.PASSWORD, self.tr('SpaceTrack password'), optional=True))
+        self.addParameter(QgsProcessingParameterDateTime(
+            self.TRACK_DAY, self.tr('Track day'), type=QgsProcessingParameterDateTime.Date))
+        epoch_series = QgsProcessingParameterBoolean(
+            self.EPOCH_SERIES, self.tr('Use all element sets of the day (nearest epoch)'), defaultValue=False)
+        epoch_series.setFlags(epoch_series.flags() | QgsProcessingParameterDefinition.FlagAdvanced)
+        self.addParameter(epoch_series)
+
+    def _add_state_vector_parameter(self):
+        """
+        Add the advanced parameter that adds state vector fields to the track points.
+        """
+        state_vectors = QgsProcessingParameterBoolean(
+            self.STATE_VECTORS, self.tr('Add ECI/ECEF state vectors and ground speed to the points'),
+            defaultValue=False)
+        state_vectors.setFlags(state_vectors.flags() | QgsProcessingParameterDefinition.FlagAdvanced)
+        self.addParameter(state_vectors)
+
+    def _add_line_parameters(self):
+        """
+        Add the optional line output and the line mode parameter.
+        """
+        self.addParameter(QgsProcessingParameterFeatureSink(
+            self.OUTPUT_LINES, self.tr('Track lines'), QgsProcessing.TypeVectorLine,
+            optional=True, createByDefault=True))
+        self.addParameter(QgsProcessingParameterBoolean(
+            self.REVOLUTION_LINES, self.tr('One line per revolution'), defaultValue=False))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.SIMPLIFY_KM, self.tr('Line simplification tolerance (km, 0 = off)'),
+            type=QgsProcessingParameterNumber.Double, defaultValue=0, minValue=0))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.DENSIFY_KM, self.tr('Great-circle densification spacing (km, 0 = off)'),
+            type=QgsProcessingParameterNumber.Double, defaultValue=0, minValue=0))
+
+    def _create_orchestrator(self, parameters, context, feedback):
+        login = self.parameterAsString(parameters, self.LOGIN, context) or None
+        password = self.parameterAsString(parameters, self.PASSWORD, context) or None
+        return OrbitalOrchestrator(login, password, log_callback=_feedback_logger(feedback),
+                                   client=default_session_pool.get_client(login, password))
+
+    def _load_as_temporal(self, context, dest_id, step_minutes):
+        """
+        Enable the temporal properties of an output point layer once it is loaded.
+        """
+        if not context.willLoadLayerOnCompletion(dest_id):
+            return
+        # The post processor must outlive processAlgorithm, so the algorithm keeps it.
+        self._post_processor = TemporalPostProcessor(step_minutes)
+        context.layerToLoadOnCompletionDetails(dest_id).setPostProcessor(self._post_processor)
+
+    def _create_config(self, parameters, context, sat_id, step_minutes=1, create_line_layer=False):
+        data_file_path = self.parameterAsFile(parameters, self.DATA_FILE, context)
+        if not data_file_path and not sat_id:
+            raise QgsProcessingException(self.tr('Enter a satellite NORAD ID or a local data file.'))
+        login = self.parameterAsString(parameters, self.LOGIN, context)
+        password = self.parameterAsString(parameters, self.PASSWORD, context)
+        if not data_file_path and not (login and password):
+            raise QgsProcessingException(self.tr('SpaceTrack login and password are required.'))
+        return OrbitalConfig(
+            sat_id=sat_id or None,
+            track_day=self.parameterAsDate(parameters, self.TRACK_DAY, context).toPyDate(),
+            step_minutes=step_minutes,
+            output_path='',
+            file_format=None,
+            add_layer=False,
+            login=login or None,
+            password=password or None,
+            data_format=DATA_FORMATS[self.parameterAsEnum(parameters, self.DATA_FORMAT, context)],
+            create_line_layer=create_line_layer,
+            save_data=False,
+            data_file_path=data_file_path,
+            save_data_path=None,
+            epoch_series=self.parameterAsBoolean(parameters, self.EPOCH_SERIES, context),
+            revolution_lines=self.parameterAsBoolean(parameters, self.REVOLUTION_LINES, context),
+            simplify_km=self.parameterAsDouble(parameters, self.SIMPLIFY_KM, context),
+            densify_km=self.parameterAsDouble(parameters, self.DENSIFY_KM, context),
+            state_vectors=self.parameterAsBoolean(parameters, self.STATE_VECTORS, context)
+        )
+
+
+class GenerateTrackAlgorithm(SpaceTraceAlgorithm):
+    """
+    Generates the point and line track of one satellite for a day.
+    """
+
+    STEP = 'STEP'
+    OUTPUT_POINTS = 'OUTPUT_POINTS'
+    OUTPUT_LINES = 'OUTPUT_LINES'
+
+    def name(self):
+        return 'generatetrack'
+
+    def displayName(self):
+        return self.tr('Generate track')
+
+    def shortHelpString(self):
+        return self.tr('Computes the ground track of a satellite for one day from SpaceTrack '
+                       'or a local TLE/OMM file.')
+
+    def initAlgorithm(self, config=None):
+        self._add_source_parameters()
+        self.addParameter(QgsProcessingParameterNumber(
+            self.STEP, self.tr('Time step (minutes)'),
+            type=QgsProcessingParameterNumber.Double, defaultValue=1, minValue=0.001))
+        self.addParameter(QgsProcessingParameterFeatureSink(
+            self.OUTPUT_POINTS, self.tr('Track points'), QgsProcessing.TypeVectorPoint))
+        self._add_state_vector_parameter()
+        self._add_line_parameters()
+
+    def processAlgorithm(self, parameters, context, feedback):
+        sat_id = self.parameterAsInt(parameters, self.SAT_ID, context)
+        step_minutes = self.parameterAsDouble(parameters, self.STEP, context)
+        create_lines = parameters.get(self.OUTPUT_LINES) is not None
+        config = self._create_config(parameters, context, sat_id, step_minutes, create_lines)
+
+        result = self._create_orchestrator(parameters, context, feedback).process_in_memory_track(config)
+        if not result:
+            raise QgsProcessingException(self.tr('No data received.'))
+        point_layer, line_layer = result
+
+        outputs = {}
+        outputs[self.OUTPUT_POINTS] = _copy_to_sink(self, parameters, self.OUTPUT_POINTS, context,
+                                                    point_layer, QgsWkbTypes.Point)
+        self._load_as_temporal(context, outputs[self.OUTPUT_POINTS], step_minutes)
+        if line_layer is not None:
+            outputs[self.OUTPUT_LINES] = _copy_to_sink(self, parameters, self.OUTPUT_LINES, context,
+                                                       line_layer, line_layer.wkbType())
+        return outputs
+
+
+class GenerateConstellationTracksAlgorithm(SpaceTraceAlgorithm):
+    """
+    Generates the tracks of several satellites into one point and one line layer.
+    """
+
+    SAT_IDS = 'SAT_IDS'
+    STEP = 'STEP'
+    OUTPUT_POINTS = 'OUTPUT_POINTS'
+    OUTPUT_LINES = 'OUTPUT_LINES'
+
+    def name(self):
+        return 'generateconstellationtracks'
+
+    def displayName(self):
+        return self.tr('Generate constellation tracks')
+
+    def shortHelpString(self):
+        return self.tr('Computes the ground tracks of several satellites for one day. Features '
+                       'of every satellite carry its NORAD ID; points are written in time order.')
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(QgsProcessingParameterString(
+            self.SAT_IDS, self.tr('Satellite NORAD IDs (comma separated)')))
+        self._add_source_parameters(with_sat_id=False)
+        self.addParameter(QgsProcessingParameterNumber(
+            self.STEP, self.tr('Time step (minutes)'),
+            type=QgsProcessingParameterNumber.Double, defaultValue=1, minValue=0.001))
+        self.addParameter(QgsProcessingParameterFeatureSink(
+            self.OUTPUT_POINTS, self.tr('Track points'), QgsProcessing.TypeVectorPoint))
+        self._add_state_vector_parameter()
+        self._add_line_parameters()
+
+    def processAlgorithm(self, parameters, context, feedback):
+        try:
+            sat_ids = [int(value) for value in
+                       self.parameterAsString(parameters, self.SAT_IDS, context).replace(';', ',').split(',')
+                       if value.strip()]
+        except ValueError:
+            raise QgsProcessingException(self.tr('NORAD IDs must be integers.'))
+        if not sat_ids:
+            raise QgsProcessingException(self.tr('Enter at least one NORAD ID.'))
+        step_minutes = self.parameterAsDouble(parameters, self.STEP, context)
+        create_lines = parameters.get(self.OUTPUT_LINES) is not None
+
+        revolution_lines = self.parameterAsBoolean(parameters, self.REVOLUTION_LINES, context)
+        state_vectors = self.parameterAsBoolean(parameters, self.STATE_VECTORS, context)
+        point_fields = _with_norad_id(track_point_fields(with_revolution=True, with_state_vectors=state_vectors))
+        line_fields = _with_norad_id(track_line_fields(
+            ('start_time', 'end_time', 'revolution') if revolution_lines else None))
+        line_type = QgsWkbTypes.MultiLineString if revolution_lines else QgsWkbTypes.LineString
+        crs = QgsCoordinateReferenceSystem('EPSG:4326')
+        point_sink, point_dest = self.parameterAsSink(parameters, self.OUTPUT_POINTS, context,
+                                                      point_fields, QgsWkbTypes.Point, crs)
+        if point_sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT_POINTS))
+        line_sink, line_dest = (None, None)
+        if create_lines:
+            line_sink, line_dest = self.parameterAsSink(parameters, self.OUTPUT_LINES, context,
+                                                        line_fields, line_type, crs)
+            if line_sink is None:
+                raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT_LINES))
+
+        orchestrator = self._create_orchestrator(parameters, context, feedback)
+        prefetched = self._prefetch(parameters, context, feedback, sat_ids)
+        point_features = []
+        for number, sat_id in enumerate(sat_ids):
+            if feedback.isCanceled():
+                break
+            config = self._create_config(parameters, context, sat_id, step_minutes, create_lines)
+            if sat_id in prefetched:
+                data = prefetched[sat_id]
+                if isinstance(data, Exception):
+                    feedback.reportError(str(data))
+                    continue
+                result = orchestrator.logic_handler.create_in_memory_layers(
+                    data, config.data_format, config.track_day, step_minutes, create_lines,
+                    config.revolution_lines, config.simplify_km, config.densify_km,
+                    state_vectors=config.state_vectors)
+            else:
+                result = orchestrator.process_in_memory_track(config)
+            if not result:
+                feedback.reportError(self.tr('No data received for {}.').format(sat_id))
+                continue
+            point_layer, line_layer = result
+            point_features.extend(_with_norad_id_features(point_layer, point_fields, sat_id))
+            if line_sink is not None and line_layer is not None:
+                line_sink.addFeatures(_with_norad_id_features(line_layer, line_fields, sat_id),
+                                      QgsFeatureSink.FastInsert)
+            feedback.setProgress(100 * (number + 1) / len(sat_ids))
+
+        # Every track is in time order; merging them keeps the whole layer time-ordered,
+        # so the temporal controller's frames read neighbouring features.
+        time_index = point_fields.indexOf("Date_Time")
+        point_features.sort(key=lambda feat: feat.attribute(time_index).toMSecsSinceEpoch())
+        point_sink.addFeatures(point_features, QgsFeatureSink.FastInsert)
+        self._load_as_temporal(context, point_dest, step_minutes)
+
+        outputs = {self.OUTPUT_POINTS: point_dest}
+        if line_dest:
+            outputs[self.OUTPUT_LINES] = line_dest
+        return outputs
+
+    def _prefetch(self, parameters, context, feedback, sat_ids):
+        """
+        Fetch the elements of all satellites from SpaceTrack concurrently.
+
+        :return: Dict mapping NORAD IDs to data or to the exception raised for them;
+                 empty when a local data file is used.
+        """
+        if self.parameterAsFile(parameters, self.DATA_FILE, context):
+            return {}
+        config = self._create_config(parameters, context, sat_ids[0])
+        feedback.pushInfo(self.tr('Fetching elements for {} satellites.').format(len(sat_ids)))
+        latest = config.track_day > date.today()
+        # Like the orchestrator, past days with epoch_series use every element set of the day.
+        results = default_session_pool.fetch_many(
+            config.login, config.password, sat_ids, config.track_day, config.data_format,
+            latest=latest, history=config.epoch_series and not latest)
+        if config.data_format == 'OMM':
+            results = {sat_id: json.loads(data) if isinstance(data, str) else data
+                       for sat_id, data in results.items()}
+        return results
+
+
+class PassesAlgorithm(SpaceTraceAlgorithm):
+    """
+    Finds the passes of a satellite over a ground location.
+    """
+
+    LOCATION = 'LOCATION'
+    ALTITUDE = 'ALTITUDE'
+    HORIZON = 'HORIZON'
+    DAYS = 'DAYS'
+    OUTPUT = 'OUTPUT'
+
+    def name(self):
+        return 'passes'
+
+    def displayName(self):
+        return self.tr('Passes over location')
+
+    def shortHelpString(self):
+        return self.tr('Finds the passes of a satellite over a ground location starting at the '
+                       'track day. Each pass is a point at the sub-satellite position of its '
+                       'highest elevation.')
+
+    def initAlgorithm(self, config=None):
+        self._add_source_parameters()
+        self.addParameter(QgsProcessingParameterPoint(self.LOCATION, self.tr('Observer location')))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.ALTITUDE, self.tr('Observer altitude (m)'),
+            type=QgsProcessingParameterNumber.Double, defaultValue=0))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.HORIZON, self.tr('Minimum elevation (degrees)'),
+            type=QgsProcessingParameterNumber.Double, defaultValue=0, minValue=0, maxValue=90))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.DAYS, self.tr('Number of days'),
+            type=QgsProcessingParameterNumber.Integer, defaultValue=1, minValue=1))
+        self.addParameter(QgsProcessingParameterFeatureSink(
+            self.OUTPUT, self.tr('Passes'), QgsProcessing.TypeVectorPoint))
+
+    def processAlgorithm(self, parameters, context, feedback):
+        sat_id = self.parameterAsInt(parameters, self.SAT_ID, context)
+        config = self._create_config(parameters, context, sat_id)
+        crs = QgsCoordinateReferenceSystem('EPSG:4326')
+        location = self.parameterAsPoint(parameters, self.LOCATION, context, crs)
+        altitude_km = self.parameterAsDouble(parameters, self.ALTITUDE, context) / 1000
+        horizon = self.parameterAsDouble(parameters, self.HORIZON, context)
+        days = self.parameterAsInt(parameters, self.DAYS, context)
+
+        data = self._create_orchestrator(parameters, context, feedback).retrieve_data(config)
+        if not data:
+            raise QgsProcessingException(self.tr('No data received.'))
+        tle_1, tle_2, _ = OrbitalLogicHandler.resolve_elements(data, config.data_format)
+        orb = Orbital("N", line1=tle_1, line2=tle_2)
+
+        fields = QgsFields()
+        fields.append(QgsField("Pass_ID", QVariant.Int))
+        fields.append(QgsField("Rise_Time", QVariant.DateTime))
+        fields.append(QgsField("Max_Time", QVariant.DateTime))
+        fields.append(QgsField("Set_Time", QVariant.DateTime))
+        fields.append(QgsField("Duration", QVariant.Double))
+        fields.append(QgsField("Max_Elevation", QVariant.Double))
+        sink, dest_id = self.parameterAsSink(parameters, self.OUTPUT, context, fields, QgsWkbTypes.Point, crs)
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        start_time = datetime(config.track_day.year, config.track_day.month, config.track_day.day)
+        passes = orb.get_next_passes(start_time, days * 24, location.x(), location.y(), altitude_km,
+                                     horizon=horizon)
+        for i, (rise_time, set_time, max_time) in enumerate(passes, 1):
+            if feedback.isCanceled():
+                break
+            _, max_elevation = orb.get_observer_look(max_time, location.x(), location.y(), altitude_km)
+            lon, lat, _ = orb.get_lonlatalt(max_time)
+            feat = QgsFeature(fields)
+            feat.setAttributes([
+                i, _qdatetime(rise_time), _qdatetime(max_time), _qdatetime(set_time),
+                (set_time - rise_time) / timedelta(seconds=1), float(max_elevation)
+            ])
+            feat.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(float(lon), float(lat))))
+            sink.addFeature(feat, QgsFeatureSink.FastInsert)
+        feedback.pushInfo(self.tr('{} passes found.').format(len(passes)))
+        return {self.OUTPUT: dest_id}
+
+
+def _feedback_logger(feedback):
+    """
+    Build an orchestrator log callback that writes to the Processing feedback.
+    """
+    def log(message, level="INFO"):
+        if level.upper() == "ERROR":
+            feedback.reportError(message)
+        elif level.upper() == "DEBUG":
+            feedback.pushDebugInfo(message)
+        else:
+            feedback.pushInfo(message)
+    return log
+
+
+def _copy_to_sink(algorithm, parameters, name, context, layer, geometry_type):
+    sink, dest_id = algorithm.parameterAsSink(parameters, name, context, layer.fields(),
+                                              geometry_type, layer.crs())
+    if sink is None:
+        raise QgsProcessingException(algorithm.invalidSinkError(parameters, name))
+    sink.addFeatures(layer.getFeatures(), QgsFeatureSink.FastInsert)
+    return dest_id
+
+
+def _with_norad_id(fields):
+    fields = QgsFields(fields)
+    fields.append(QgsField("NORAD_ID", QVariant.Int))
+    return fields
+
+
+def _with_norad_id_features(layer, fields, sat_id):
+    features = []
+    for source in layer.getFeatures():
+        feat = QgsFeature(fields)
+        feat.setGeometry(source.geometry())
+        feat.setAttributes(source.attributes() + [sat_id])
+        features.append(feat)
+    return features
+
+
+class TemporalPostProcessor(QgsProcessingLayerPostProcessorInterface):
+    """
+    Enables the temporal properties of a track layer loaded after an algorithm has run.
+    """
+
+    def __init__(self, step_minutes):
+        super().__init__()
+        self.step_minutes = step_minutes
+
+    def postProcessLayer(self, layer, context, feedback):
+        configure_temporal(layer, self.step_minutes)
+
+
+def _qdatetime(value):
+    # pyorbital returns naive UTC datetimes; keep them in UTC like the track time fields.
+    return QDateTime.fromMSecsSinceEpoch(int(value.replace(tzinfo=timezone.utc).timestamp() * 1000), Qt.UTC)
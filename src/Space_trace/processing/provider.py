@@ -0,0 +1,32 @@
+"""
+This module contains the QGIS Processing provider of the Space trace plugin.
+"""
+
+import os
+
+from qgis.core import QgsProcessingProvider
+from qgis.PyQt.QtGui import QIcon
+
+from .algorithms import (GenerateTrackAlgorithm, GenerateConstellationTracksAlgorithm,
+                         PassesAlgorithm)
+
+
+class SpaceTraceProvider(QgsProcessingProvider):
+    """
+    Processing provider exposing track generation as batch-capable algorithms.
+    """
+
+    def loadAlgorithms(self):
+        self.addAlgorithm(GenerateTrackAlgorithm())
+        self.addAlgorithm(GenerateConstellationTracksAlgorithm())
+        self.addAlgorithm(PassesAlgorithm())
+
+    def id(self):
+        return 'spacetrace'
+
+    def name(self):
+        return 'Space trace'
+
+    def icon(self):
+        plugin_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+        return QIcon(os.path.join(plugin_dir, 'icon.png'))
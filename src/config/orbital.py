@@ -6,7 +6,9 @@ class OrbitalConfig:
     """
     def __init__(self, sat_id, track_day, step_minutes, output_path, file_format,
                  add_layer, login, password, data_format, create_line_layer, save_data, data_file_path,
-                 save_data_path):
+                 save_data_path, epoch_series=False, revolution_lines=False,
+                 simplify_km=0, lod_levels=(), densify_km=0, target_crs=None,
+                 state_vectors=False):
         
         self.sat_id             = sat_id            # Satellite NORAD ID (None if local file is used)
         self.track_day          = track_day         # Date for track computation
@@ -21,3 +23,10 @@ class OrbitalConfig:
         self.save_data          = save_data         # Flag to save received data
         self.data_file_path     = data_file_path    # Local data file path (if provided)
         self.save_data_path     = save_data_path
+        self.epoch_series       = epoch_series      # Use every element set of the day, nearest epoch first
+        self.revolution_lines   = revolution_lines  # One line feature per revolution instead of per segment
+        self.simplify_km        = simplify_km       # Line simplification tolerance in km (0 = off)
+        self.lod_levels         = lod_levels        # Decimation factors of extra GeoPackage LOD tables
+        self.densify_km         = densify_km        # Great-circle vertex spacing of lines in km (0 = off)
+        self.target_crs         = target_crs        # CRS of the output layers (e.g. 'EPSG:3413'), None for WGS 84
+        self.state_vectors      = state_vectors     # Add ECI/ECEF state vector and ground speed fields to the points
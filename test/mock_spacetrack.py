@@ -0,0 +1,220 @@
+# coding=utf-8
+"""Local stand-in for the SpaceTrack API used by tests and benchmarks.
+
+The server replays recorded ``gp``/``gp_history`` element sets (see
+test/data/spacetrack_gp_history.json) in TLE or JSON format, with an optional
+per-request latency and a rate limit answered with HTTP 429, so the fetch path
+can be measured offline and deterministically::
+
+    with MockSpaceTrackServer(latency=0.05) as server:
+        client = SpacetrackClientWrapper("user", "password", base_url=server.base_url)
+"""
+
+import os
+import json
+import time
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+RECORDS_PATH = os.path.join(os.path.dirname(__file__), 'data', 'spacetrack_gp_history.json')
+
+SESSION_COOKIE = 'chocolatechip'
+
+# Subset of the SpaceTrack model definition, enough for predicate validation.
+MODELDEF = [
+    {'Field': 'NORAD_CAT_ID', 'Type': 'int(10) unsigned', 'Null': 'YES', 'Default': ''},
+    {'Field': 'OBJECT_NAME', 'Type': 'varchar(60)', 'Null': 'YES', 'Default': ''},
+    {'Field': 'EPOCH', 'Type': 'datetime(6)', 'Null': 'YES', 'Default': ''},
+    {'Field': 'INCLINATION', 'Type': 'decimal(7,4)', 'Null': 'YES', 'Default': ''},
+    {'Field': 'TLE_LINE1', 'Type': 'varchar(71)', 'Null': 'YES', 'Default': ''},
+    {'Field': 'TLE_LINE2', 'Type': 'varchar(71)', 'Null': 'YES', 'Default': ''},
+]
+
+
+def load_records(path=RECORDS_PATH):
+    """
+    Load recorded gp_history element sets.
+
+    :param path: JSON file with a list of GP records.
+    :return: List of dicts.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def filter_records(records, class_name, predicates):
+    """
+    Apply SpaceTrack query predicates to recorded element sets.
+
+    :param records: List of GP records.
+    :param class_name: 'gp' (newest element set per object) or 'gp_history'.
+    :param predicates: Dict of lower-case predicate names to URL-decoded values.
+    :return: Filtered list of records.
+    """
+    selected = records
+    if 'norad_cat_id' in predicates:
+        ids = set(predicates['norad_cat_id'].split(','))
+        selected = [r for r in selected if str(r['NORAD_CAT_ID']) in ids]
+    if 'epoch' in predicates and '--' in predicates['epoch']:
+        start, end = predicates['epoch'].split('--')
+        selected = [r for r in selected if start <= r['EPOCH'][:len(end)] <= end]
+
+    selected = sorted(selected, key=lambda r: r['EPOCH'], reverse=True)
+    if class_name == 'gp':
+        newest = {}
+        for record in selected:
+            newest.setdefault(record['NORAD_CAT_ID'], record)
+        selected = list(newest.values())
+    if predicates.get('orderby', '').lower().endswith('asc'):
+        selected.reverse()
+    if 'limit' in predicates:
+        selected = selected[:int(predicates['limit'])]
+    return selected
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = 'MockSpaceTrack/1.0'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type='application/json', headers=None):
+        body = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        mock = self.server.mock
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        if self.path.rstrip('/') != '/ajaxauth/login':
+            self._send(404, '""')
+            return
+        mock._record('login', self.path)
+        self._send(200, '""', headers={'Set-Cookie': f'{SESSION_COOKIE}=session{mock.session}; Path=/'})
+
+    def do_GET(self):
+        mock = self.server.mock
+        parts = [unquote(part) for part in self.path.strip('/').split('/')]
+        if len(parts) < 4 or parts[2] != 'class':
+            self._send(404, '""')
+            return
+
+        if f'{SESSION_COOKIE}=session{mock.session}' not in self.headers.get('Cookie', ''):
+            self._send(401, '{"error": "You must be logged in to complete this action"}')
+            return
+        if parts[1] == 'modeldef':
+            self._send(200, json.dumps({'controller': parts[0], 'data': MODELDEF}))
+            return
+
+        retry_after = mock._throttle()
+        mock._record('query', self.path)
+        if retry_after is not None:
+            self._send(429, '{"error": "Rate limit exceeded"}',
+                       headers={'Retry-After': f'{retry_after:g}'})
+            return
+        if mock.latency:
+            time.sleep(mock.latency)
+
+        class_name = parts[3]
+        predicates = {parts[i].lower(): parts[i + 1] for i in range(4, len(parts) - 1, 2)}
+        records = filter_records(mock.records, class_name, predicates)
+        if predicates.get('format') == 'tle':
+            body = ''.join(f"{r['TLE_LINE1']}\r\n{r['TLE_LINE2']}\r\n" for r in records)
+            self._send(200, body, content_type='text/plain')
+        else:
+            self._send(200, json.dumps(records))
+
+
+class MockSpaceTrackServer:
+    """
+    Threaded HTTP server replaying recorded SpaceTrack responses on localhost.
+
+    Counts logins and queries so tests can assert on caching and batching.
+    """
+
+    def __init__(self, records=None, latency=0.0, rate_limit=None, retry_after=1):
+        """
+        :param records: List of GP records to serve (defaults to the recorded file).
+        :param latency: Delay in seconds added to every query.
+        :param rate_limit: Optional (requests, period seconds); queries beyond it get HTTP 429.
+        :param retry_after: Value of the Retry-After header sent with HTTP 429.
+        """
+        self.records = records if records is not None else load_records()
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.logins = 0
+        self.session = 0
+        self.queries = []
+        self.throttled = 0
+        self._recent = deque()
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/'
+
+    def start(self):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def expire_sessions(self):
+        """
+        Invalidate all session cookies handed out so far, as a server-side session timeout would.
+        """
+        with self._lock:
+            self.session += 1
+
+    def _record(self, kind, path):
+        with self._lock:
+            if kind == 'login':
+                self.logins += 1
+            else:
+                self.queries.append(path)
+
+    def _throttle(self):
+        """
+        Register a query against the rate limit.
+
+        :return: None if the query is allowed, otherwise the Retry-After value.
+        """
+        if self.rate_limit is None:
+            return None
+        limit, period = self.rate_limit
+        with self._lock:
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] >= period:
+                self._recent.popleft()
+            if len(self._recent) >= limit:
+                self.throttled += 1
+                return self.retry_after
+            self._recent.append(now)
+            return None
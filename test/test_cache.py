@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.Space_trace.orbital.cache import TrackCache
+from src.Space_trace.orbital.track import points_to_columns, columns_to_points
+
+
+def make_columns(n):
+    start = datetime(2025, 3, 28)
+    points = [(start + timedelta(minutes=i), float(i), float(-i), 420.0, 7.6, 90.0, 0.0, 10.0, 51.6)
+              for i in range(n)]
+    return points_to_columns(points)
+
+
+class TrackCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_make_key_depends_on_window_and_step(self):
+        start = datetime(2025, 3, 28)
+        end = start + timedelta(days=1)
+        key = TrackCache.make_key("L1", "L2", start, end, 1)
+        self.assertEqual(key, TrackCache.make_key("L1 ", "L2", start, end, 1.0))
+        self.assertNotEqual(key, TrackCache.make_key("L1", "L2", start, end, 2))
+        self.assertNotEqual(key, TrackCache.make_key("L1", "L2", start, end + timedelta(days=1), 1))
+
+    def test_put_returns_read_only_copy(self):
+        cache = TrackCache()
+        columns = cache.put("key", make_columns(10))
+        self.assertIs(cache.get("key"), columns)
+        with self.assertRaises(ValueError):
+            columns['lon'][0] = 1.0
+
+    def test_lru_eviction_by_size(self):
+        columns = make_columns(100)
+        size = sum(c.nbytes for c in columns.values())
+        cache = TrackCache(max_bytes=2 * size)
+        cache.put("a", columns)
+        cache.put("b", columns)
+        cache.get("a")
+        cache.put("c", columns)
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_disk_cache_round_trip(self):
+        columns = make_columns(50)
+        TrackCache(cache_dir=self.tmp_dir).put("key", columns)
+        self.assertTrue(os.path.exists(os.path.join(self.tmp_dir, "key.npz")))
+
+        restored = TrackCache(cache_dir=self.tmp_dir).get("key")
+        self.assertEqual(columns_to_points(restored), columns_to_points(columns))
+        np.testing.assert_array_equal(restored['time'], columns['time'])
+
+    def test_unwritable_disk_cache_keeps_memory_entry(self):
+        # A cache directory below a regular file can never be created.
+        blocker = os.path.join(self.tmp_dir, "file")
+        open(blocker, "w").close()
+        cache = TrackCache(cache_dir=os.path.join(blocker, "cache"))
+
+        with self.assertLogs("TrackCache", level="WARNING"):
+            cache.put("key", make_columns(50))
+        self.assertEqual(len(cache.get("key")['time']), 50)
+
+    def test_disk_eviction_skips_temporary_files(self):
+        tmp_path = os.path.join(self.tmp_dir, "other.npz.tmp")
+        with open(tmp_path, "wb") as file:
+            file.write(b"\0" * 4096)
+        cache = TrackCache(cache_dir=self.tmp_dir, max_disk_bytes=0)
+        cache.put("key", make_columns(50))
+
+        # The finished file is evicted at once, the one being written by another process is not.
+        self.assertEqual(os.listdir(self.tmp_dir), ["other.npz.tmp"])
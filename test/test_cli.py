@@ -0,0 +1,61 @@
+import os
+import sys
+import json
+import shutil
+import subprocess
+import tempfile
+import unittest
+from datetime import date
+
+from src.Space_trace.cli import load_jobs, build_config, jobs_from_args, parse_args
+
+
+class CliTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_load_jobs_applies_defaults(self):
+        path = os.path.join(self.tmp_dir, "jobs.json")
+        with open(path, "w") as f:
+            json.dump({"defaults": {"step_minutes": 5, "data_format": "OMM"},
+                       "jobs": [{"sat_id": 25544}, {"sat_id": 20580, "step_minutes": 1}]}, f)
+
+        jobs = load_jobs(path)
+
+        self.assertEqual(jobs, [
+            {"step_minutes": 5, "data_format": "OMM", "sat_id": 25544},
+            {"step_minutes": 1, "data_format": "OMM", "sat_id": 20580},
+        ])
+
+    def test_jobs_from_args_single_job(self):
+        args = parse_args(["--sat-id", "25544", "--day", "2025-03-28", "--output", "iss.gpkg",
+                           "--login", "user", "--password", "secret"])
+        jobs = jobs_from_args(args)
+
+        self.assertEqual(len(jobs), 1)
+        config = build_config(jobs[0])
+        self.assertEqual(config.sat_id, 25544)
+        self.assertEqual(config.track_day, date(2025, 3, 28))
+        self.assertEqual(config.file_format, "gpkg")
+        self.assertTrue(config.create_line_layer)
+
+    def test_build_config_requires_output(self):
+        with self.assertRaises(ValueError):
+            build_config({"sat_id": 25544, "login": "user", "password": "secret"})
+
+    def test_build_config_rejects_unknown_format(self):
+        with self.assertRaises(ValueError):
+            build_config({"data_file_path": "iss.txt", "output_path": "iss.kml"})
+
+    def test_runs_as_space_trace_module(self):
+        src_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(path for path in sys.path if path))
+        result = subprocess.run([sys.executable, "-m", "Space_trace", "--help"], cwd=src_dir, env=env,
+                                capture_output=True, text=True, timeout=120)
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertTrue(result.stdout.startswith("usage: python -m Space_trace"))
+
@@ -0,0 +1,59 @@
+import unittest
+
+import numpy as np
+
+from src.Space_trace.orbital.geodesic import (MERIDIAN_PLANE, EQUATOR_PLANE, unit_vectors, to_lonlat, interpolate,
+                                              plane_crossings, densify, densify_segments)
+
+
+class GeodesicTest(unittest.TestCase):
+    def test_unit_vectors_round_trip(self):
+        lons, lats = to_lonlat(unit_vectors([-179.5, 0, 45, 120], [-60, 0, 30, 89]))
+        np.testing.assert_allclose(lons, [-179.5, 0, 45, 120], atol=1e-9)
+        np.testing.assert_allclose(lats, [-60, 0, 30, 89], atol=1e-9)
+
+    def test_antimeridian_crossing(self):
+        # A symmetric arc crosses halfway, north of its ends: great circles bulge poleward.
+        points = unit_vectors([170, 160], [40, -20])
+        ends = unit_vectors([-170, 170], [40, 10])
+        fractions = plane_crossings(points, ends, MERIDIAN_PLANE)
+        self.assertAlmostEqual(fractions[0], 0.5)
+        lons, lats = to_lonlat(interpolate(points, ends, fractions))
+        np.testing.assert_allclose(np.abs(lons), [180, 180], atol=1e-9)
+        # Vertex of the great circle: tan(lat) = tan(40) / cos(10).
+        self.assertAlmostEqual(lats[0], np.degrees(np.arctan(np.tan(np.radians(40)) / np.cos(np.radians(10)))))
+
+    def test_equator_crossing(self):
+        starts = unit_vectors([10, 10], [-5, 0])
+        ends = unit_vectors([20, 20], [5, 5])
+        fractions = plane_crossings(starts, ends, EQUATOR_PLANE)
+        self.assertAlmostEqual(fractions[0], 0.5)
+        self.assertEqual(fractions[1], 0)
+        lons, lats = to_lonlat(interpolate(starts, ends, fractions))
+        np.testing.assert_allclose(lats, [0, 0], atol=1e-9)
+        self.assertAlmostEqual(lons[0], 15)
+
+    def test_densify_spacing(self):
+        lons, lats = densify([0, 10, 10.1], [0, 0, 0], 100)
+        # 10 degrees on the equator are 1113 km: 12 parts, plus the short last edge.
+        self.assertEqual(len(lons), 14)
+        self.assertEqual((lons[0], lons[12], lons[13]), (0, 10, 10.1))
+        np.testing.assert_allclose(lats, 0, atol=1e-9)
+        self.assertTrue(np.all(np.diff(lons) > 0))
+
+    def test_densify_keeps_antimeridian_side(self):
+        lons, lats = densify([-180, -175], [50, 52], 50)
+        self.assertEqual(lons[0], -180)
+        self.assertTrue(np.all(lons[1:] > -180))
+        lons, _ = densify([175, 180], [52, 50], 50)
+        self.assertEqual(lons[-1], 180)
+        self.assertTrue(np.all(lons[:-1] > 170))
+
+    def test_densify_segments(self):
+        segments = [[(0.0, 0.0), (1.0, 0.0)]]
+        self.assertIs(densify_segments(segments, 0), segments)
+        self.assertEqual(len(densify_segments(segments, 50)[0]), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,18 @@
 import unittest
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from unittest.mock import patch
 from src.Space_trace.orbital.handler import OrbitalLogicHandler
+from src.Space_trace.orbital.cache import TrackCache
 import numpy as np
 
+from .utilities import get_qgis_app
+
+QGIS_APP = get_qgis_app()[0]
+
 class OrbitalLogicHandlerTest(unittest.TestCase):
     def setUp(self):
-        self.handler = OrbitalLogicHandler()
+        # A cache per test: the process-wide one would carry tracks over between test cases.
+        self.handler = OrbitalLogicHandler(track_cache=TrackCache())
 
     @patch('pyorbital.orbital.Orbital')
     def test_generate_points_valid_tle(self, mock_orbital):
@@ -44,5 +50,224 @@ class OrbitalLogicHandlerTest(unittest.TestCase):
         self.assertEqual(len(segments), 2)
         self.assertEqual(segments[0], [(-179.0, 0.0), (-180.0, 0.5)])
         self.assertEqual(segments[1], [(180.0, 0.5), (179.0, 1.0)])
-        
-    
\ No newline at end of file
+
+    def test_segment_ranges_match_line_segments(self):
+        lons = [170.0, 175.0, 179.0, -179.0, -175.0, 179.5, 178.0]
+        lats = [float(i) for i in range(len(lons))]
+        segments = self.handler.get_line_segments(list(zip(lons, lats)))
+        ranges = self.handler._segment_ranges(np.array(lons))
+
+        self.assertEqual(len(ranges), len(segments))
+        self.assertEqual(ranges, [(0, 2), (3, 4), (5, 6)])
+
+    def test_track_segments_attributes(self):
+        # South to north through the ascending node and the antimeridian, then turning south.
+        columns = {
+            'time': np.datetime64('2025-03-28T00:00', 'ms') + np.arange(6) * np.timedelta64(1, 'm'),
+            'lon': np.array([170.0, 174.0, 178.0, -178.0, -174.0, -170.0]),
+            'lat': np.array([-2.0, -1.0, 1.0, 3.0, 4.0, 2.0]),
+        }
+        segments, attributes = self.handler.get_track_segments(columns, first_revolution=7)
+
+        self.assertEqual(segments[0], [(170.0, -2.0), (174.0, -1.0), (176.0, 0.0)])
+        self.assertEqual(segments[1], [(176.0, 0.0), (178.0, 1.0), (180.0, 2.0)])
+        self.assertEqual(segments[2], [(-180.0, 2.0), (-178.0, 3.0), (-174.0, 4.0)])
+        self.assertEqual(segments[3], [(-174.0, 4.0), (-170.0, 2.0)])
+        self.assertEqual(attributes['revolution'].tolist(), [7, 8, 8, 8])
+        self.assertEqual(attributes['ascending'].tolist(), [True, True, True, False])
+        self.assertEqual(attributes['start_time'].astype(str).tolist(), [
+            '2025-03-28T00:00:00.000', '2025-03-28T00:01:30.000', '2025-03-28T00:02:30.000',
+            '2025-03-28T00:04:00.000'])
+        np.testing.assert_array_equal(attributes['end_time'][:-1], attributes['start_time'][1:])
+        self.assertEqual(attributes['end_time'][-1], columns['time'][-1])
+
+    def test_revolution_numbers_and_lines(self):
+        # Two ascending node crossings; the second revolution also crosses the antimeridian.
+        columns = {
+            'time': np.datetime64('2025-03-28T00:00', 'ms') + np.arange(8) * np.timedelta64(1, 'm'),
+            'lon': np.array([0.0, 10.0, 20.0, 30.0, 40.0, 170.0, -170.0, -160.0]),
+            'lat': np.array([-1.0, 1.0, 2.0, -2.0, -1.0, 1.0, 2.0, 3.0]),
+            'azimuth': np.array([10.0, 10.0, 10.0, 170.0, 10.0, 10.0, 10.0, 10.0]),
+        }
+        revolutions = self.handler.revolution_numbers(columns, 100)
+        self.assertEqual(revolutions.tolist(), [100, 101, 101, 101, 101, 102, 102, 102])
+
+        segments, attributes = self.handler.get_track_segments({**columns, 'revolution': revolutions})
+        self.assertEqual(attributes['revolution'][0], 100)
+        lines, line_attributes = self.handler.get_revolution_lines(segments, attributes)
+
+        self.assertEqual(line_attributes['revolution'].tolist(), [100, 101, 102])
+        self.assertEqual(lines[0], [[(0.0, -1.0), (5.0, 0.0)]])
+        self.assertEqual(lines[1], [[(5.0, 0.0), (10.0, 1.0), (20.0, 2.0), (30.0, -2.0), (40.0, -1.0),
+                                     (105.0, 0.0)]])
+        self.assertEqual(len(lines[2]), 2)
+        self.assertEqual(lines[2][0][-1][0], 180.0)
+        self.assertEqual(lines[2][1][0][0], -180.0)
+        np.testing.assert_array_equal(line_attributes['start_time'][1:], line_attributes['end_time'][:-1])
+
+    def test_revolutions_at_coarse_steps(self):
+        tle_data = (
+            "1 25544U 98067A   25087.72483446  .00032194  00000-0  56484-3 0  9999",
+            "2 25544  51.6386 345.5386 0004029  59.5799 332.6073 15.50242233502686",
+            51.6386
+        )
+        # A 60 minute step is longer than half an ISS orbit and can skip a whole hemisphere.
+        for step_minutes in (30, 60):
+            columns = self.handler.with_revolutions(
+                self.handler.generate_track(tle_data, 'TLE', date(2025, 3, 28), step_minutes), tle_data, 'TLE')
+            expected = self.handler.orbit_number(tle_data, 'TLE', columns['time'][-1])
+
+            self.assertEqual(columns['revolution'][-1], expected)
+            _, attributes = self.handler.get_track_segments(columns)
+            self.assertEqual(attributes['revolution'][-1], expected)
+            self.assertEqual(np.unique(attributes['revolution']).tolist(),
+                             list(range(columns['revolution'][0], expected + 1)))
+
+    def test_time_grid_aligned_to_origin(self):
+        origin = datetime(2025, 3, 28)
+        times = self.handler._time_grid(datetime(2025, 3, 28, 0, 2, 30), datetime(2025, 3, 28, 0, 6),
+                                        1, origin=origin)
+        expected = np.array(['2025-03-28T00:03', '2025-03-28T00:04', '2025-03-28T00:05'],
+                            dtype='datetime64[us]')
+        np.testing.assert_array_equal(times, expected)
+
+    def test_series_uses_nearest_epoch(self):
+        newer = ("1 25544U 98067A   25087.72483446  .00032194  00000-0  56484-3 0  9999",
+                 "2 25544  51.6386 345.5386 0004029  59.5799 332.6073 15.50242233502686", 51.6386)
+        older = ("1 25544U 98067A   25087.20000000  .00031800  00000-0  55900-3 0  9998",
+                 "2 25544  51.6387 348.1204 0004015  58.9021 301.2488 15.50228745502607", 51.6387)
+        element_sets = OrbitalLogicHandler.resolve_element_series([newer, older, newer], 'TLE')
+        self.assertEqual(element_sets, [older, newer])
+
+        times = OrbitalLogicHandler._time_grid(datetime(2025, 3, 28), datetime(2025, 3, 29), 1)
+        columns = self.handler.compute_series_columns(element_sets, times)
+        self.assertEqual(columns['inclination'][0], 51.6387)
+        self.assertEqual(columns['inclination'][-1], 51.6386)
+        # The sets switch halfway between both epochs (2025-03-28 11:05:45 UTC).
+        self.assertEqual(int(np.argmax(columns['inclination'] == 51.6386)), 666)
+
+        self.handler.blend_minutes = 30
+        blended = self.handler.compute_series_columns(element_sets, times)
+        np.testing.assert_array_equal(blended['lon'][:650], columns['lon'][:650])
+        jumps = np.abs(np.diff(blended['lat'][650:680]))
+        self.assertLess(jumps.max(), np.abs(np.diff(columns['lat'][650:680])).max() + 1e-9)
+
+    def test_state_vector_columns(self):
+        tle_data = ("1 25544U 98067A   25087.72483446  .00032194  00000-0  56484-3 0  9999",
+                    "2 25544  51.6386 345.5386 0004029  59.5799 332.6073 15.50242233502686", 51.6386)
+        columns = self.handler.generate_track(tle_data, 'TLE', date(2025, 3, 28), 10)
+        self.assertNotIn('ecef_x', columns)
+
+        with_states = self.handler.generate_track(tle_data, 'TLE', date(2025, 3, 28), 10, state_vectors=True)
+        self.assertIn('ground_speed', with_states)
+        np.testing.assert_array_equal(with_states['lon'], columns['lon'])
+        np.testing.assert_allclose(np.linalg.norm([with_states['eci_vx'], with_states['eci_vy'],
+                                                   with_states['eci_vz']], axis=0), columns['velocity'])
+
+    def test_nan_positions(self):
+        # Failed propagation gives NaN positions: they must not stall the conversion.
+        class FailedOrbital:
+            class tle:
+                excentricity, mean_anomaly, mean_motion = 0.0004, 5.8, 0.0676
+                epoch = np.datetime64('2025-03-28T00:00')
+
+            @staticmethod
+            def get_position(times, normalize=False):
+                return np.full((3, len(times)), np.nan), np.full((3, len(times)), np.nan)
+
+        times = np.datetime64('2025-03-28T00:00') + np.arange(3) * np.timedelta64(1, 'm')
+        columns = self.handler.compute_orbital_columns(FailedOrbital(), times, 51.6, state_vectors=True)
+        self.assertTrue(np.isnan(columns['lat']).all())
+        self.assertTrue(np.isnan(columns['ground_speed']).all())
+
+    def test_lod_levels(self):
+        self.assertEqual(OrbitalLogicHandler.lod_factors([16, 4, 4, 1]), [1, 4, 16])
+        self.assertEqual(OrbitalLogicHandler.lod_factors(()), [1])
+
+        tle_data = ("1 25544U 98067A   25087.72483446  .00032194  00000-0  56484-3 0  9999",
+                    "2 25544  51.6386 345.5386 0004029  59.5799 332.6073 15.50242233502686", 51.6386)
+        with patch('src.Space_trace.orbital.saver.GpkgSaver.save_track_levels') as save_track_levels, \
+                patch('src.Space_trace.orbital.saver.GpkgSaver.save_lines_levels') as save_lines_levels:
+            self.handler.create_persistent_orbital_track(tle_data, 'TLE', date(2025, 3, 28), 1, 'track.gpkg',
+                                                         'gpkg', True, lod_levels=(4, 16))
+        levels, path = save_track_levels.call_args[0]
+        self.assertEqual(path, 'track.gpkg')
+        self.assertEqual([(factor, len(columns['time'])) for factor, columns in levels], [(1, 1440), (4, 361), (16, 91)])
+        line_levels, line_path = save_lines_levels.call_args[0]
+        self.assertEqual(line_path, 'track_line.gpkg')
+        self.assertEqual([level[0] for level in line_levels], [1, 4, 16])
+
+        with self.assertRaises(ValueError):
+            self.handler.create_persistent_orbital_track(tle_data, 'TLE', date(2025, 3, 28), 1, 'track.shp',
+                                                         'shp', True, lod_levels=(4,))
+
+    def test_geodesic_track_segments(self):
+        columns = {
+            'time': np.array(['2025-03-28T00:00', '2025-03-28T00:10'], dtype='datetime64[ms]'),
+            'lon': np.array([170.0, -170.0]),
+            'lat': np.array([40.0, 40.0]),
+        }
+        linear, _ = self.handler.get_track_segments(columns)
+        geodesic, attributes = self.handler.get_track_segments(columns, geodesic=True)
+        self.assertEqual(linear[0][-1], (180.0, 40.0))
+        self.assertEqual(geodesic[0][-1][0], 180.0)
+        self.assertAlmostEqual(geodesic[0][-1][1], 40.4325, places=4)
+        self.assertEqual(geodesic[1][0], (-180.0, geodesic[0][-1][1]))
+        self.assertEqual(attributes['end_time'][0], np.datetime64('2025-03-28T00:05'))
+
+        # Each half is about 850 km long: 9 parts of at most 100 km.
+        geometries, _ = self.handler.generate_track_segments(columns, densify_km=100)
+        self.assertEqual([len(geometry.asPolyline()) for geometry in geometries], [10, 10])
+
+
+@unittest.skipIf(QGIS_APP is None, "QGIS is not available")
+class RollingLayersTest(unittest.TestCase):
+    TLE = (
+        "1 25544U 98067A   25087.72483446  .00032194  00000-0  56484-3 0  9999",
+        "2 25544  51.6386 345.5386 0004029  59.5799 332.6073 15.50242233502686",
+        51.6386
+    )
+
+    def setUp(self):
+        self.handler = OrbitalLogicHandler(track_cache=TrackCache(max_bytes=0))
+        self.start = datetime(2025, 3, 28)
+        self.window = timedelta(hours=3)
+
+    def line_vertices(self, line_layer):
+        features = sorted(line_layer.getFeatures(), key=lambda feature: feature.id())
+        return [[(point.x(), point.y()) for point in feature.geometry().asPolyline()] for feature in features]
+
+    def assert_continuous(self, lines, columns):
+        self.assertAlmostEqual(lines[0][0][0], columns['lon'][0], places=6)
+        self.assertAlmostEqual(lines[-1][-1][1], columns['lat'][-1], places=6)
+        for previous, line in zip(lines, lines[1:]):
+            # Consecutive features meet on the antimeridian at the same latitude.
+            self.assertEqual(abs(previous[-1][0]), 180)
+            self.assertEqual(previous[-1][0], -line[0][0])
+            self.assertAlmostEqual(previous[-1][1], line[0][1], places=9)
+
+    def test_advance_twice(self):
+        rolling = self.handler.create_rolling_layers(self.TLE, 'TLE', self.start, self.start + self.window, 1, True)
+        self.assertEqual(rolling.point_layer.featureCount(), 180)
+        fids = list(rolling.point_fids)
+
+        for minutes, expected_fids in ((20, fids[20:]), (50, fids[50:])):
+            start = self.start + timedelta(minutes=minutes)
+            removed, added = self.handler.advance_rolling_layers(rolling, self.TLE, 'TLE', start, start + self.window)
+
+            self.assertEqual(rolling.point_layer.featureCount(), 180)
+            self.assertEqual(rolling.point_fids[:len(expected_fids)], expected_fids)
+            self.assertEqual(sorted(feature.id() for feature in rolling.point_layer.getFeatures()),
+                             sorted(rolling.point_fids))
+            lines = self.line_vertices(rolling.line_layer)
+            self.assertEqual(len(lines), rolling.line_layer.featureCount())
+            self.assert_continuous(lines, rolling.columns)
+
+            # The advanced layers match a track built from scratch for the same window.
+            fresh = self.handler.create_rolling_layers(self.TLE, 'TLE', start, start + self.window, 1, True)
+            np.testing.assert_allclose(rolling.columns['lon'], fresh.columns['lon'])
+            fresh_lines = self.line_vertices(fresh.line_layer)
+            self.assertEqual([len(line) for line in lines], [len(line) for line in fresh_lines])
+            for line, fresh_line in zip(lines, fresh_lines):
+                np.testing.assert_allclose(line, fresh_line, atol=1e-9)
+        self.assertEqual((removed, added), (30, 30))
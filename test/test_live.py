@@ -0,0 +1,39 @@
+import unittest
+from datetime import datetime
+
+import numpy as np
+
+from .utilities import get_qgis_app
+
+QGIS_APP = get_qgis_app()[0]
+
+ISS = ("ISS",
+       "1 25544U 98067A   25087.72483446  .00032194  00000-0  56484-3 0  9999",
+       "2 25544  51.6386 345.5386 0004029  59.5799 332.6073 15.50242233502686")
+NOAA_19 = ("NOAA 19",
+           "1 33591U 09005A   25087.51234567  .00000123  00000-0  89012-4 0  9990",
+           "2 33591  99.0912 123.4567 0013456 123.4567 236.7890 14.12654321826547")
+
+
+@unittest.skipIf(QGIS_APP is None, "QGIS is not available")
+class LivePositionLayerTest(unittest.TestCase):
+    def test_failed_objects_have_no_position(self):
+        from src.Space_trace.orbital.live import LivePositionLayer, SatrecArray
+
+        live = LivePositionLayer()
+        live.set_objects([ISS, NOAA_19])
+        # The low-orbit ISS elements have decayed by mid-2027 (sgp4 error 6).
+        now = datetime(2027, 6, 1)
+        lons, lats, alts = live.propagate_now(now)
+        if SatrecArray is not None:
+            self.assertTrue(np.isnan(lats[0]))
+        self.assertTrue(np.isfinite(lats[1]) and 700 < alts[1] < 950)
+
+        live.update(now)
+        features = list(live.layer.getFeatures())
+        self.assertEqual(len(features), 2)
+        self.assertFalse(features[1].geometry().isNull())
+
+
+if __name__ == '__main__':
+    unittest.main()
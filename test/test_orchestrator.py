@@ -1,10 +1,13 @@
 import unittest
 from unittest.mock import Mock, patch
 from src.Space_trace.orbital.orchestrator import OrbitalOrchestrator
+from src.Space_trace.orbital.cache import default_track_cache
 from datetime import date
 
 class OrbitalOrchestratorTest(unittest.TestCase):
     def setUp(self):
+        # The orchestrator uses the process-wide track cache: start every test without cached tracks.
+        default_track_cache.clear()
         self.orchestrator = OrbitalOrchestrator("test@example.com", "password")
         self.config = Mock(
             sat_id=25544,
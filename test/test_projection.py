@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+
+from src.Space_trace.orbital.cache import TrackCache
+from src.Space_trace.orbital.handler import OrbitalLogicHandler
+from .utilities import get_qgis_app
+
+QGIS_APP = get_qgis_app()[0]
+
+# Half the circumference of the WGS 84 equator: x of the edges of an equirectangular map.
+HALF_WORLD = np.pi * 6378137
+
+
+@unittest.skipIf(QGIS_APP is None, "QGIS is not available")
+class TrackProjectionTest(unittest.TestCase):
+    def setUp(self):
+        self.columns = {
+            'time': np.array(['2025-03-28T00:00', '2025-03-28T00:10', '2025-03-28T00:20'], dtype='datetime64[ms]'),
+            'lon': np.array([-100.0, -80.0, -60.0]),
+            'lat': np.array([10.0, 12.0, 14.0]),
+        }
+
+    def test_seam(self):
+        from src.Space_trace.orbital.projection import TrackProjection
+
+        self.assertEqual(TrackProjection('EPSG:3857').seam, -180)
+        self.assertIsNone(TrackProjection('EPSG:3413').seam)
+        projection = TrackProjection('+proj=eqc +lon_0=90 +datum=WGS84 +units=m +no_defs')
+        self.assertEqual(projection.seam, -90)
+        np.testing.assert_allclose(projection.shift_columns(self.columns)['lon'], [170, -170, -150])
+
+    def test_split_at_seam(self):
+        from src.Space_trace.orbital.projection import TrackProjection
+
+        projection = TrackProjection('+proj=eqc +lon_0=90 +datum=WGS84 +units=m +no_defs')
+        geometries, attributes = OrbitalLogicHandler(track_cache=TrackCache()).generate_track_segments(
+            self.columns, projection=projection)
+        self.assertEqual(len(geometries), 2)
+        first, second = (geometry.asPolyline() for geometry in geometries)
+        self.assertAlmostEqual(first[0].x(), HALF_WORLD * 170 / 180, delta=1)
+        self.assertAlmostEqual(first[-1].x(), HALF_WORLD, delta=1)
+        self.assertAlmostEqual(second[0].x(), -HALF_WORLD, delta=1)
+        self.assertAlmostEqual(first[-1].y(), second[0].y())
+        self.assertEqual(attributes['end_time'][0], np.datetime64('2025-03-28T00:05'))
+
+    def test_project_columns(self):
+        from src.Space_trace.orbital.projection import TrackProjection
+
+        columns = TrackProjection('EPSG:3857').project_columns(self.columns)
+        np.testing.assert_allclose(columns['x'], HALF_WORLD * self.columns['lon'] / 180)
+        self.assertTrue(np.all(columns['y'] > 0))
+        np.testing.assert_array_equal(columns['lon'], self.columns['lon'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from unittest.mock import patch
+
+from src.Space_trace.orbital.ratelimit import (
+    TokenBucket, RateLimiter, RateLimitExceeded, AccountRateLimiters, backoff_delay
+)
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_burst_then_delay(self):
+        bucket = TokenBucket(capacity=3, period=60)
+        now = bucket._updated
+
+        self.assertEqual([bucket.reserve(now) for _ in range(3)], [0.0, 0.0, 0.0])
+        # Each token beyond the burst waits for one more refill interval.
+        self.assertAlmostEqual(bucket.reserve(now), 20.0)
+        self.assertAlmostEqual(bucket.reserve(now), 40.0)
+
+    def test_refill(self):
+        bucket = TokenBucket(capacity=2, period=10)
+        now = bucket._updated
+        bucket.reserve(now)
+        bucket.reserve(now)
+
+        self.assertEqual(bucket.reserve(now + 5), 0.0)
+
+
+class RateLimiterTest(unittest.TestCase):
+    def test_strictest_limit_wins_and_is_recorded(self):
+        limiter = RateLimiter(limits=((100, 1), (2, 60)))
+        limiter._reserve()
+        limiter._reserve()
+        delay = limiter._reserve()
+
+        self.assertAlmostEqual(delay, 30.0, places=2)
+        metrics = limiter.metrics()
+        self.assertEqual(metrics['requests'], 3)
+        self.assertEqual(metrics['throttled_requests'], 1)
+        self.assertAlmostEqual(metrics['throttled_seconds'], 30.0, places=1)
+
+    @patch('src.Space_trace.orbital.ratelimit.may_block', return_value=False)
+    def test_gui_thread_does_not_wait(self, mock_may_block):
+        limiter = RateLimiter(limits=((1, 60),))
+        self.assertEqual(limiter.acquire(), 0.0)
+
+        with self.assertRaises(RateLimitExceeded) as raised:
+            limiter.acquire()
+        self.assertAlmostEqual(raised.exception.delay, 60.0, places=1)
+        # The rejected request gives its token back and is not counted.
+        self.assertAlmostEqual(limiter._reserve(), 60.0, places=1)
+        self.assertEqual(limiter.metrics()['requests'], 2)
+
+    def test_limiters_per_account(self):
+        limiters = AccountRateLimiters(limits=((1, 60),))
+        first = limiters.get("first@example.com")
+
+        self.assertIs(limiters.get("first@example.com"), first)
+        self.assertEqual(first._reserve(), 0.0)
+        self.assertEqual(limiters.get("second@example.com")._reserve(), 0.0)
+        self.assertGreater(first._reserve(), 0.0)
+        metrics = limiters.metrics()
+        self.assertEqual(metrics['requests'], 3)
+        self.assertEqual(metrics['throttled_requests'], 1)
+
+    def test_backoff_delay(self):
+        self.assertEqual(backoff_delay(1, retry_after="7"), 7.0)
+        for attempt in range(1, 10):
+            delay = backoff_delay(attempt, base_delay=2, max_delay=60)
+            expected = min(60, 2 * 2 ** (attempt - 1))
+            self.assertTrue(expected / 2 <= delay <= expected)
@@ -0,0 +1,154 @@
+import io
+import os
+import json
+import tempfile
+import unittest
+from datetime import date, datetime
+from unittest.mock import patch
+
+from src.Space_trace.orbital.readers import iter_tle, read_tle, tle_checksum, iter_omm, omm_to_tle
+
+ISS = ("1 25544U 98067A   25087.72483446  .00032194  00000-0  56484-3 0  9999",
+       "2 25544  51.6386 345.5386 0004029  59.5799 332.6073 15.50242233502686")
+NOAA = ("1 33591U 09005A   25087.51234567  .00000123  00000-0  89012-4 0  9990",
+        "2 33591  99.0912 123.4567 0013456 123.4567 236.7890 14.12654321826547")
+
+
+class TleReaderTest(unittest.TestCase):
+    def test_checksum(self):
+        self.assertEqual(tle_checksum(ISS[0]), 9)
+        self.assertEqual(tle_checksum(ISS[1]), 6)
+
+    def test_mixed_two_and_three_line_records(self):
+        text = "0 ISS (ZARYA)\n{}\n{}\n\n{}\r\n{}\r\n".format(*ISS, *NOAA)
+        records = list(iter_tle(io.StringIO(text)))
+
+        self.assertEqual([record[0] for record in records], ['ISS (ZARYA)', None])
+        self.assertEqual(records[0][1:3], ISS)
+        self.assertAlmostEqual(records[1][3], 99.0912)
+
+    def test_norad_filter_skips_other_objects(self):
+        broken = ISS[0][:68] + '0'
+        text = "ISS\n{}\n{}\nNOAA 19\n{}\n{}\n".format(broken, ISS[1], *NOAA)
+
+        name, tle_1, tle_2, inc = read_tle(io.StringIO(text), norad_id=33591)
+        self.assertEqual(name, 'NOAA 19')
+        self.assertIsNone(read_tle(io.StringIO(text), norad_id=20580))
+        with self.assertRaises(ValueError):
+            read_tle(io.StringIO(text))
+
+    def test_stops_after_first_match(self):
+        def lines():
+            yield ISS[0]
+            yield ISS[1]
+            raise AssertionError("read past the matching record")
+
+        self.assertEqual(read_tle(lines(), norad_id=25544)[1:3], ISS)
+
+    def test_reads_from_path(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'elements.tle')
+            with open(path, 'w') as f:
+                f.write("\n".join(NOAA + ISS) + "\n")
+            self.assertEqual([record[1][2:7] for record in iter_tle(path)], ['33591', '25544'])
+
+
+ISS_OMM = {
+    "OBJECT_NAME": "ISS (ZARYA)", "OBJECT_ID": "1998-067A", "EPOCH": "2025-03-28T17:23:45.697344",
+    "MEAN_MOTION": "15.50242233", "ECCENTRICITY": "0.0004029", "INCLINATION": "51.6386",
+    "RA_OF_ASC_NODE": "345.5386", "ARG_OF_PERICENTER": "59.5799", "MEAN_ANOMALY": "332.6073",
+    "EPHEMERIS_TYPE": "0", "CLASSIFICATION_TYPE": "U", "NORAD_CAT_ID": "25544", "ELEMENT_SET_NO": "999",
+    "REV_AT_EPOCH": "50268", "BSTAR": "0.00056484", "MEAN_MOTION_DOT": "0.00032194", "MEAN_MOTION_DDOT": "0",
+}
+
+CCSDS_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<ndm xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
+  <omm id="CCSDS_OMM_VERS" version="2.0">
+    <header><CREATION_DATE/><ORIGINATOR/></header>
+    <body><segment>
+      <metadata><OBJECT_NAME>{name}</OBJECT_NAME><OBJECT_ID>1998-067A</OBJECT_ID></metadata>
+      <data>
+        <meanElements><EPOCH>{epoch}</EPOCH><MEAN_MOTION>15.50242233</MEAN_MOTION>
+          <ECCENTRICITY>.0004029</ECCENTRICITY><INCLINATION>51.6386</INCLINATION>
+          <RA_OF_ASC_NODE>345.5386</RA_OF_ASC_NODE><ARG_OF_PERICENTER>59.5799</ARG_OF_PERICENTER>
+          <MEAN_ANOMALY>332.6073</MEAN_ANOMALY></meanElements>
+        <tleParameters><NORAD_CAT_ID>{norad}</NORAD_CAT_ID><BSTAR>.56484E-3</BSTAR>
+          <MEAN_MOTION_DOT>.32194E-3</MEAN_MOTION_DOT></tleParameters>
+        <userDefinedParameters><USER_DEFINED parameter="FILE">1</USER_DEFINED></userDefinedParameters>
+      </data>
+    </segment></body>
+  </omm>
+</ndm>"""
+
+
+class OmmReaderTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', newline='') as f:
+            f.write(content)
+        return path
+
+    def _history(self, count):
+        for number in range(count):
+            yield dict(ISS_OMM, NORAD_CAT_ID=str(25544 + number % 3),
+                       EPOCH=f"2025-03-{1 + number % 28:02d}T00:00:00.000000")
+
+    def test_json_is_parsed_in_chunks(self):
+        records = list(self._history(60))
+        path = self._write('history.json', json.dumps(records, indent=2))
+
+        with patch('src.Space_trace.orbital.readers.JSON_CHUNK_SIZE', 256):
+            self.assertEqual(list(iter_omm(path)), records)
+            selected = list(iter_omm(path, norad_id=25545, epoch_start=date(2025, 3, 10),
+                                     epoch_end=datetime(2025, 3, 20)))
+
+        self.assertEqual(selected, [r for r in records if r['NORAD_CAT_ID'] == '25545'
+                                    and '2025-03-10' <= r['EPOCH'][:10] <= '2025-03-20'])
+
+    def test_json_lines(self):
+        records = list(self._history(3))
+        path = self._write('history.jsonl', "\n".join(json.dumps(r) for r in records))
+
+        self.assertEqual(list(iter_omm(path, file_format='json')), records)
+
+    def test_ccsds_xml(self):
+        segments = [CCSDS_XML.format(name=f"OBJ {n}", epoch="2025-03-28T17:23:45.697344", norad=25544 + n)
+                    for n in range(3)]
+        content = segments[0].replace('</ndm>', '') + ''.join(
+            s[s.index('<omm'):s.index('</ndm>')] for s in segments[1:]) + '</ndm>'
+        path = self._write('catalog.xml', content)
+
+        records = list(iter_omm(path, norad_id=25545))
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]['OBJECT_NAME'], 'OBJ 1')
+        self.assertEqual(records[0]['FILE'], '1')
+
+    def test_standalone_ccsds_omm(self):
+        document = CCSDS_XML.format(name="ISS (ZARYA)", epoch="2025-03-28T17:23:45.697344", norad=25544)
+        content = document[:document.index('<ndm')] + document[document.index('<omm'):document.index('</ndm>')]
+        path = self._write('iss.xml', content.replace(
+            '<omm ', '<omm xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" ', 1))
+
+        records = list(iter_omm(path))
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]['NORAD_CAT_ID'], '25544')
+        self.assertEqual(records[0]['MEAN_MOTION'], '15.50242233')
+
+    def test_csv_and_tle_synthesis(self):
+        header = list(ISS_OMM)
+        rows = [",".join(header)] + [",".join(r[key] for key in header) for r in self._history(5)]
+        path = self._write('catalog.csv', "\r\n".join(rows) + "\r\n")
+
+        records = list(iter_omm(path, norad_id=25544))
+        self.assertEqual(len(records), 2)
+        self.assertEqual(omm_to_tle(dict(records[0], EPOCH=ISS_OMM['EPOCH'])), ISS)
+
+    def test_tle_synthesis_from_xml_values(self):
+        record = dict(ISS_OMM, ECCENTRICITY=".0004029", BSTAR=".56484E-3", MEAN_MOTION_DOT=".32194E-3")
+        self.assertEqual(omm_to_tle(record), ISS)
+        with self.assertRaises(ValueError):
+            omm_to_tle({"NORAD_CAT_ID": "25544", "EPOCH": ISS_OMM['EPOCH']})
@@ -0,0 +1,239 @@
+import os
+import json
+import struct
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.Space_trace.orbital.saver import (ParquetSaver, ArrowSaver, FlatGeobufSaver, CzmlSaver, GpkgSaver,
+                                          MemoryLayerSaver, LOD_BASE_SCALE, day_row_groups, lod_table_name, pa)
+from src.Space_trace.orbital.track import (POINT_COLUMNS, STATE_COLUMNS, columns_to_points, lonlatalt_to_ecef,
+                                           decimate_columns)
+from .utilities import get_qgis_app
+
+QGIS_APP = get_qgis_app()[0]
+
+
+def make_columns(count, start='2025-03-28T20:00', step_minutes=10):
+    columns = {name: np.linspace(-170, 170, count) + index for index, name in enumerate(POINT_COLUMNS[1:])}
+    columns['time'] = np.datetime64(start, 'ms') + np.arange(count) * np.timedelta64(step_minutes, 'm')
+    return columns
+
+
+class DayRowGroupsTest(unittest.TestCase):
+    def test_split_by_utc_day(self):
+        columns = make_columns(30)  # 20:00 until 00:50 the next day
+        self.assertEqual(day_row_groups(columns['time']), [(0, 24), (24, 30)])
+        self.assertEqual(day_row_groups(columns['time'][:0]), [])
+
+
+class MemoryLayerSaverTest(unittest.TestCase):
+    def test_memory_layer_is_temporal(self):
+        layer = MemoryLayerSaver().save_points(columns_to_points(make_columns(5)), 'track', step_minutes=10)
+
+        properties = layer.temporalProperties()
+        self.assertTrue(properties.isActive())
+        self.assertEqual(properties.startField(), 'Date_Time')
+        self.assertEqual(properties.fixedDuration(), 10)
+        self.assertEqual(layer.featureCount(), 5)
+
+    def test_export_layer_is_not_temporal(self):
+        layer = MemoryLayerSaver().save_track(make_columns(5), 'temp_points', temporal=False)
+
+        self.assertFalse(layer.temporalProperties().isActive())
+        self.assertEqual(layer.featureCount(), 5)
+
+    def test_append_track_in_chunks(self):
+        saver = MemoryLayerSaver()
+        saver.CHUNK_SIZE = 4
+        columns = make_columns(10)
+        layer = saver.save_track(columns, 'track')
+        fids = saver.append_track(layer, columns, start_id=10)
+
+        self.assertEqual(len(fids), 10)
+        self.assertEqual(layer.featureCount(), 20)
+        feature = layer.getFeature(fids[-1])
+        self.assertEqual(feature.attributes()[0], 19)
+        self.assertEqual(feature.attributes()[2], columns['lat'][-1])
+        self.assertEqual(feature.attributes()[3], columns['lon'][-1])
+
+
+    def test_revolution_field(self):
+        columns = make_columns(5)
+        columns['revolution'] = np.array([7, 7, 8, 8, 8], dtype=np.int32)
+        layer = MemoryLayerSaver().save_track(columns, 'track')
+
+        index = layer.fields().indexOf('Revolution')
+        self.assertEqual(index, len(layer.fields()) - 1)
+        self.assertEqual([feat.attributes()[index] for feat in layer.getFeatures()], [7, 7, 8, 8, 8])
+
+    def test_projected_coordinates(self):
+        columns = make_columns(3)
+        columns['x'] = np.array([1000.0, np.nan, 3000.0])
+        columns['y'] = np.array([-50.0, np.nan, 50.0])
+        layer = MemoryLayerSaver().save_track(columns, 'track', crs='EPSG:3857')
+
+        self.assertEqual(layer.crs().authid(), 'EPSG:3857')
+        features = list(layer.getFeatures())
+        self.assertEqual([feat.hasGeometry() for feat in features], [True, False, True])
+        point = features[2].geometry().asPoint()
+        self.assertEqual((point.x(), point.y()), (3000.0, 50.0))
+        # The attributes keep the geodetic coordinates.
+        self.assertEqual(features[2].attributes()[3], columns['lon'][2])
+
+
+class CzmlSaverTest(unittest.TestCase):
+    def test_sampled_position(self):
+        columns = make_columns(30)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'iss.czml')
+            CzmlSaver().save_track(columns, path)
+            with open(path, encoding='utf-8') as f:
+                document, packet = json.load(f)
+
+        self.assertEqual(document['id'], 'document')
+        self.assertEqual(document['clock']['interval'], '2025-03-28T20:00:00.000Z/2025-03-29T00:50:00.000Z')
+        position = packet['position']
+        self.assertEqual(position['epoch'], '2025-03-28T20:00:00.000Z')
+        self.assertEqual(position['referenceFrame'], 'FIXED')
+        self.assertEqual(position['interpolationAlgorithm'], 'LAGRANGE')
+
+        samples = np.array(position['cartesian']).reshape(-1, 4)
+        self.assertEqual(len(samples), 30)
+        np.testing.assert_allclose(samples[:, 0], np.arange(30) * 600)
+        expected = np.column_stack(lonlatalt_to_ecef(columns['lon'], columns['lat'], columns['alt'])) * 1000
+        np.testing.assert_allclose(samples[:, 1:], expected, atol=1e-3)
+
+    def test_coarse_nodes_from_state_vectors(self):
+        columns = make_columns(31, step_minutes=1)
+        columns.update({name: np.arange(31.0) * 10 + index for index, name in enumerate(STATE_COLUMNS)})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'iss.czml')
+            CzmlSaver(node_minutes=3).save_track(columns, path)
+            with open(path, encoding='utf-8') as f:
+                _, packet = json.load(f)
+
+        samples = np.array(packet['position']['cartesian']).reshape(-1, 4)
+        np.testing.assert_allclose(samples[:, 0], np.arange(0, 31, 3) * 60)
+        nodes = np.arange(0, 31, 3)
+        expected = np.column_stack([columns[name][nodes] for name in ('ecef_x', 'ecef_y', 'ecef_z')]) * 1000
+        np.testing.assert_allclose(samples[:, 1:], expected)
+
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class ColumnarSaverTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.columns = make_columns(30)
+
+    def test_geoparquet_points(self):
+        import pyarrow.parquet as pq
+        path = os.path.join(self.tmp.name, 'track.parquet')
+        ParquetSaver().save_track(self.columns, path)
+
+        parquet = pq.ParquetFile(path)
+        self.assertEqual(parquet.metadata.num_row_groups, 2)
+        self.assertEqual(parquet.metadata.row_group(0).column(0).compression, 'ZSTD')
+        geo = json.loads(parquet.schema_arrow.metadata[b'geo'])
+        self.assertEqual(geo['columns']['geometry']['geometry_types'], ['Point'])
+
+        table = parquet.read()
+        np.testing.assert_array_equal(table['Longitude'].to_numpy(), self.columns['lon'])
+        self.assertEqual(table['Date_Time'].type, pa.timestamp('ms', tz='UTC'))
+        np.testing.assert_array_equal(table['Date_Time'].to_numpy().astype('datetime64[ms]'), self.columns['time'])
+        order, kind, x, y = struct.unpack('<BIdd', table['geometry'][5].as_py())
+        self.assertEqual((order, kind), (1, 1))
+        self.assertEqual((x, y), (self.columns['lon'][5], self.columns['lat'][5]))
+
+    def test_multi_satellite_row_groups(self):
+        import pyarrow.parquet as pq
+        path = os.path.join(self.tmp.name, 'constellation.parquet')
+        ParquetSaver().save_tracks([(25544, self.columns), (33591, make_columns(5))], path)
+
+        parquet = pq.ParquetFile(path)
+        self.assertEqual(parquet.metadata.num_row_groups, 3)
+        self.assertEqual(parquet.read_row_group(2)['NORAD_ID'].to_pylist(), [33591] * 5)
+
+    def test_arrow_ipc(self):
+        path = os.path.join(self.tmp.name, 'track.arrow')
+        ArrowSaver().save_track(self.columns, path)
+
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            self.assertEqual(reader.num_record_batches, 2)
+            table = reader.read_all()
+        np.testing.assert_array_equal(table['Altitude'].to_numpy(), self.columns['alt'])
+
+    def test_state_vector_fields(self):
+        path = os.path.join(self.tmp.name, 'track.arrow')
+        columns = dict(self.columns, **{name: np.arange(30.0) + index for index, name in enumerate(STATE_COLUMNS)})
+        ArrowSaver().save_track(columns, path)
+
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all()
+        self.assertEqual(table.column_names[-3:], ['ECEF_VZ', 'GroundSpd', 'geometry'])
+        np.testing.assert_array_equal(table['ECI_X'].to_numpy(), columns['eci_x'])
+
+
+@unittest.skipIf(QGIS_APP is None or pa is None, "QGIS or pyarrow is not available")
+class LinesTableTest(unittest.TestCase):
+    def test_mixed_geometry_types(self):
+        from qgis.core import QgsGeometry
+        from src.Space_trace.orbital.saver import lines_table
+
+        geometries = [QgsGeometry.fromWkt('LineString (0 0, 10 10)'),
+                      QgsGeometry.fromWkt('MultiLineString ((170 0, 180 5), (-180 5, -170 10))')]
+        geo = json.loads(lines_table(geometries).schema.metadata[b'geo'])
+
+        self.assertEqual(geo['columns']['geometry']['geometry_types'], ['LineString', 'MultiLineString'])
+        geo = json.loads(lines_table(geometries[:1]).schema.metadata[b'geo'])
+        self.assertEqual(geo['columns']['geometry']['geometry_types'], ['LineString'])
+
+
+@unittest.skipIf(QGIS_APP is None, "QGIS is not available")
+class FlatGeobufSaverTest(unittest.TestCase):
+    def test_indexed_points(self):
+        from qgis.core import QgsVectorLayer, QgsFeatureSource, QgsRectangle, QgsFeatureRequest
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'track.fgb')
+            saver = FlatGeobufSaver()
+            saver.BATCH_SIZE = 7
+            columns = make_columns(30)
+            saver.save_track(columns, path)
+
+            layer = QgsVectorLayer(path, 'track', 'ogr')
+            self.assertTrue(layer.isValid())
+            self.assertEqual(layer.featureCount(), 30)
+            self.assertEqual(layer.hasSpatialIndex(), QgsFeatureSource.SpatialIndexPresent)
+            request = QgsFeatureRequest().setFilterRect(QgsRectangle(-180, -90, 0, 90))
+            ids = sorted(feat['Point_ID'] for feat in layer.getFeatures(request))
+            self.assertEqual(ids, [i for i in range(30) if columns['lon'][i] <= 0])
+
+
+@unittest.skipIf(QGIS_APP is None, "QGIS is not available")
+class GpkgSaverTest(unittest.TestCase):
+    def test_level_tables(self):
+        from qgis.core import QgsVectorLayer
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'track.gpkg')
+            columns = make_columns(33)
+            GpkgSaver().save_track_levels([(factor, decimate_columns(columns, factor)) for factor in (1, 4, 16)],
+                                          path)
+
+            counts = {}
+            scales = {}
+            for factor in (1, 4, 16):
+                table = lod_table_name(path, factor)
+                layer = QgsVectorLayer(f"{path}|layername={table}", table, 'ogr')
+                self.assertTrue(layer.isValid())
+                counts[factor] = layer.featureCount()
+                scales[factor] = (layer.hasScaleBasedVisibility(), layer.minimumScale(), layer.maximumScale())
+
+        self.assertEqual(counts, {1: 33, 4: 9, 16: 3})
+        self.assertEqual(scales[1], (True, 4 * LOD_BASE_SCALE, 0))
+        self.assertEqual(scales[4], (True, 16 * LOD_BASE_SCALE, 4 * LOD_BASE_SCALE))
+        self.assertEqual(scales[16], (True, 0, 16 * LOD_BASE_SCALE))
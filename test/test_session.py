@@ -0,0 +1,82 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.Space_trace.orbital.ratelimit import RateLimiter
+from src.Space_trace.orbital.session import SpaceTrackSessionPool
+from src.Space_trace.orbital.spacetrack_client import SpacetrackClientWrapper
+from .mock_spacetrack import MockSpaceTrackServer
+
+
+class SpaceTrackSessionTest(unittest.TestCase):
+    @patch('src.Space_trace.orbital.spacetrack_client.SpaceTrackClient')
+    def test_pool_reuses_client_per_account(self, mock_client):
+        pool = SpaceTrackSessionPool()
+        first = pool.get_client("user@example.com", "password")
+
+        self.assertIs(pool.get_client("user@example.com", "password"), first)
+        self.assertIsNot(pool.get_client("other@example.com", "password"), first)
+        self.assertEqual(mock_client.call_count, 2)
+
+        pool.close()
+        self.assertEqual(mock_client.return_value.close.call_count, 2)
+
+    @patch('src.Space_trace.orbital.spacetrack_client.time.monotonic')
+    @patch('src.Space_trace.orbital.spacetrack_client.SpaceTrackClient')
+    def test_login_only_on_expiry(self, mock_client, mock_monotonic):
+        mock_client.return_value.gp.return_value = "x" * 140
+        # time.monotonic is patched for the whole process: keep the shared rate limiters out of it.
+        wrapper = SpacetrackClientWrapper("user@example.com", "password", session_lifetime=100,
+                                          rate_limiter=MagicMock())
+
+        mock_monotonic.return_value = 0
+        wrapper.get_tle(25544, latest=True)
+        mock_monotonic.return_value = 50
+        wrapper.get_tle(25544, latest=True)
+        self.assertEqual(mock_client.return_value.authenticate.call_count, 1)
+
+        mock_monotonic.return_value = 200
+        wrapper.get_tle(25544, latest=True)
+        self.assertEqual(mock_client.return_value.authenticate.call_count, 2)
+        # The session is renewed with a new client; the expired one is closed with the wrapper,
+        # as requests of other threads may still use it.
+        self.assertEqual(mock_client.call_count, 2)
+        mock_client.return_value.close.assert_not_called()
+        wrapper.close()
+        self.assertEqual(mock_client.return_value.close.call_count, 2)
+
+    def test_threads_share_one_login(self):
+        with MockSpaceTrackServer(latency=0.01) as server:
+            wrapper = SpacetrackClientWrapper("user@example.com", "password",
+                                              rate_limiter=RateLimiter(limits=((1000, 1),)), base_url=server.base_url)
+
+            def fetch():
+                wrapper.get_tle(25544, latest=True)
+
+            for expire in (False, True):
+                if expire:
+                    server.expire_sessions()
+                threads = [threading.Thread(target=fetch) for _ in range(8)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            wrapper.close()
+
+        # One login, and one renewal for all the requests rejected with HTTP 401.
+        self.assertEqual(server.logins, 2)
+        self.assertEqual(len(server.queries), 16)
+
+    def test_pool_reuses_async_session(self):
+        with MockSpaceTrackServer() as server:
+            pool = SpaceTrackSessionPool(base_url=server.base_url)
+            try:
+                first = pool.fetch_many("user@example.com", "password", [25544, 33591], latest=True)
+                second = pool.fetch_many("user@example.com", "password", [25544, 20580], latest=True)
+            finally:
+                pool.close()
+
+        self.assertEqual(first[25544], second[25544])
+        self.assertEqual(second[20580][2], ' 28.4697')
+        self.assertEqual(server.logins, 1)
+        self.assertEqual(len(server.queries), 4)
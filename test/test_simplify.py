@@ -0,0 +1,91 @@
+import unittest
+from datetime import date
+
+import numpy as np
+
+from src.Space_trace.orbital.geodesic import unit_vectors, to_lonlat, interpolate
+from src.Space_trace.orbital.cache import TrackCache
+from src.Space_trace.orbital.handler import OrbitalLogicHandler
+from src.Space_trace.orbital.simplify import simplify_mask, simplify_segments
+from src.Space_trace.orbital.track import EARTH_EQUATORIAL_RADIUS_KM
+
+TLE = ("1 25544U 98067A   25087.72483446  .00032194  00000-0  56484-3 0  9999",
+       "2 25544  51.6386 345.5386 0004029  59.5799 332.6073 15.50242233502686", 51.6386)
+
+
+def written_line_distances(lons, lats, mask):
+    """
+    Ground distances in km of all vertices from the simplified line drawn straight in lon/lat.
+    """
+    points = unit_vectors(lons, lats)
+    fractions = np.linspace(0, 1, 2001)
+    distances = np.zeros(len(lons))
+    kept = np.flatnonzero(mask)
+    for first, last in zip(kept[:-1], kept[1:]):
+        line = unit_vectors(lons[first] + fractions * (lons[last] - lons[first]),
+                            lats[first] + fractions * (lats[last] - lats[first]))
+        cosines = np.clip(points[first:last + 1] @ line.T, -1, 1).max(axis=1)
+        distances[first:last + 1] = np.arccos(cosines) * EARTH_EQUATORIAL_RADIUS_KM
+    return distances
+
+
+class SimplifyTest(unittest.TestCase):
+    def test_great_circle_reduces_to_ends(self):
+        # The equator and a meridian are great circles.
+        lons = np.linspace(-170, 170, 200)
+        mask = simplify_mask(lons, np.zeros_like(lons), 1.0)
+        self.assertEqual(np.flatnonzero(mask).tolist(), [0, 199])
+
+        lats = np.linspace(-80, 80, 50)
+        mask = simplify_mask(np.full_like(lats, 30.0), lats, 1.0)
+        self.assertEqual(mask.sum(), 2)
+
+    def test_tolerance_is_a_ground_distance(self):
+        # A 0.1 degree bump is about 11 km on the ground, even close to the pole
+        # where the same longitude offset would be much shorter.
+        lons = [0.0, 0.5, 1.0]
+        lats = [0.0, 0.1, 0.0]
+        self.assertTrue(simplify_mask(lons, lats, 5.0)[1])
+        self.assertFalse(simplify_mask(lons, lats, 20.0)[1])
+
+        lats = [80.0, 80.1, 80.0]
+        self.assertTrue(simplify_mask(lons, lats, 5.0)[1])
+
+    def test_zigzag_keeps_vertices_above_tolerance(self):
+        lons = np.arange(10, dtype=float)
+        lats = np.where(np.arange(10) % 2, 1.0, 0.0)
+        self.assertTrue(simplify_mask(lons, lats, 10.0).all())
+
+    def test_tolerance_holds_for_written_line(self):
+        handler = OrbitalLogicHandler(track_cache=TrackCache())
+        segments, _ = handler.get_track_segments(handler.generate_track(TLE, 'TLE', date(2025, 3, 29), 1))
+        for tolerance in (10.0, 50.0):
+            kept = 0
+            for segment in segments:
+                lons, lats = np.asarray(segment).T
+                mask = simplify_mask(lons, lats, tolerance)
+                kept += mask.sum()
+                self.assertLessEqual(written_line_distances(lons, lats, mask).max(), tolerance)
+            self.assertLess(kept, sum(len(segment) for segment in segments))
+
+    def test_geodesic_measures_from_great_circle(self):
+        ends = unit_vectors([0, 60], [0, 45])
+        lons, lats = to_lonlat(interpolate(np.repeat(ends[:1], 20, axis=0), np.repeat(ends[1:], 20, axis=0),
+                                           np.linspace(0, 1, 20)))
+        self.assertEqual(simplify_mask(lons, lats, 1.0, geodesic=True).sum(), 2)
+        # Drawn straight in lon/lat, the great circle bulges far beyond 1 km.
+        self.assertGreater(simplify_mask(lons, lats, 1.0).sum(), 2)
+
+    def test_zero_tolerance_and_short_lines(self):
+        self.assertTrue(simplify_mask([0, 1, 2], [0, 0, 0], 0).all())
+        self.assertEqual(simplify_mask([], [], 1.0).tolist(), [])
+        self.assertEqual(simplify_mask([0, 1], [0, 0], 1.0).tolist(), [True, True])
+
+    def test_simplify_segments(self):
+        segments = [[(0.0, 0.0), (1.0, 0.0), (2.0, 0.0)], [(5.0, 5.0)]]
+        self.assertIs(simplify_segments(segments, 0), segments)
+        self.assertEqual(simplify_segments(segments, 1.0), [[(0.0, 0.0), (2.0, 0.0)], [(5.0, 5.0)]])
+
+
+if __name__ == '__main__':
+    unittest.main()
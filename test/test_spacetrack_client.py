@@ -0,0 +1,190 @@
+import json
+import asyncio
+import unittest
+from datetime import date
+from unittest.mock import AsyncMock, patch
+
+import httpx
+
+from src.Space_trace.orbital.ratelimit import RateLimiter
+from src.Space_trace.orbital.spacetrack_client import (
+    AsyncSpacetrackClientWrapper, SpacetrackClientWrapper, SpaceTrackError
+)
+from .mock_spacetrack import MockSpaceTrackServer
+
+TLE = ("1 25544U 98067A   25087.72483446  .00032194  00000-0  56484-3 0  9999\n"
+       "2 25544  51.6386 345.5386 0004029  59.5799 332.6073 15.50242233502686")
+
+
+class AsyncSpacetrackClientWrapperTest(unittest.TestCase):
+    @patch('src.Space_trace.orbital.spacetrack_client.AsyncSpaceTrackClient')
+    def test_get_many_respects_concurrency_limit(self, mock_client):
+        in_flight = []
+        peak = []
+
+        async def gp(**kwargs):
+            in_flight.append(kwargs['norad_cat_id'])
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(kwargs['norad_cat_id'])
+            return TLE if kwargs['norad_cat_id'] != 3 else ''
+
+        mock_client.return_value.gp = gp
+        mock_client.return_value.authenticate = AsyncMock()
+
+        async def run():
+            wrapper = AsyncSpacetrackClientWrapper("user@example.com", "password", max_concurrency=2)
+            return await wrapper.get_many([1, 2, 3, 4, 5], latest=True)
+
+        results = asyncio.run(run())
+
+        self.assertEqual(max(peak), 2)
+        self.assertEqual(results[1][2], ' 51.6386')
+        self.assertIsInstance(results[3], SpaceTrackError)
+        self.assertEqual(len(results), 5)
+
+
+def _status_error(status, headers=None):
+    request = httpx.Request("GET", "https://www.space-track.org/basicspacedata/query/class/gp")
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError(f"HTTP {status}", request=request, response=response)
+
+
+class SpacetrackClientRetryTest(unittest.TestCase):
+    @patch('src.Space_trace.orbital.spacetrack_client.time.sleep')
+    @patch('src.Space_trace.orbital.spacetrack_client.SpaceTrackClient')
+    def test_retries_throttled_and_server_errors(self, mock_client, mock_sleep):
+        mock_client.return_value.gp.side_effect = [
+            _status_error(429, {"Retry-After": "3"}), _status_error(503), TLE
+        ]
+        limiter = RateLimiter()
+        wrapper = SpacetrackClientWrapper("user@example.com", "password", rate_limiter=limiter)
+
+        tle_1, tle_2, inc = wrapper.get_tle(25544, latest=True)
+
+        self.assertEqual(inc, ' 51.6386')
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(mock_sleep.call_args_list[0][0][0], 3.0)
+        self.assertEqual(limiter.metrics()['retries'], 2)
+
+    @patch('src.Space_trace.orbital.spacetrack_client.time.sleep')
+    @patch('src.Space_trace.orbital.spacetrack_client.SpaceTrackClient')
+    def test_gives_up_after_max_retries(self, mock_client, mock_sleep):
+        mock_client.return_value.gp.side_effect = _status_error(500)
+        wrapper = SpacetrackClientWrapper("user@example.com", "password",
+                                          rate_limiter=RateLimiter(), max_retries=2)
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            wrapper.get_tle(25544, latest=True)
+        self.assertEqual(mock_client.return_value.gp.call_count, 3)
+
+    @patch('src.Space_trace.orbital.spacetrack_client.time.sleep')
+    @patch('src.Space_trace.orbital.spacetrack_client.SpaceTrackClient')
+    def test_client_errors_are_not_retried(self, mock_client, mock_sleep):
+        mock_client.return_value.gp.side_effect = _status_error(400)
+        wrapper = SpacetrackClientWrapper("user@example.com", "password", rate_limiter=RateLimiter())
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            wrapper.get_tle(25544, latest=True)
+        mock_sleep.assert_not_called()
+
+    @patch('src.Space_trace.orbital.spacetrack_client.SpaceTrackClient')
+    def test_empty_response_raises_spacetrack_error(self, mock_client):
+        mock_client.return_value.gp.return_value = ''
+        wrapper = SpacetrackClientWrapper("user@example.com", "password", rate_limiter=RateLimiter())
+
+        with self.assertRaises(SpaceTrackError):
+            wrapper.get_tle(25544, latest=True)
+
+
+class MockSpaceTrackServerTest(unittest.TestCase):
+    def setUp(self):
+        self.limiter = RateLimiter(limits=((1000, 1),))
+
+    def test_history_query_and_session_reuse(self):
+        with MockSpaceTrackServer() as server:
+            wrapper = SpacetrackClientWrapper("user@example.com", "password", rate_limiter=self.limiter,
+                                              base_url=server.base_url)
+            tle_1, tle_2, inc = wrapper.get_tle(25544, date(2025, 3, 28))
+            omm = wrapper.get_omm(33591, date(2025, 3, 28))
+            wrapper.close()
+
+        self.assertEqual(tle_1[18:32], '25087.72483446')
+        self.assertEqual(inc, ' 51.6386')
+        self.assertEqual([record['OBJECT_NAME'] for record in json.loads(omm)], ['NOAA 19'])
+        self.assertEqual(server.logins, 1)
+        self.assertEqual(len(server.queries), 2)
+
+    def test_tle_history_covers_window(self):
+        with MockSpaceTrackServer() as server:
+            wrapper = SpacetrackClientWrapper("user@example.com", "password", rate_limiter=self.limiter,
+                                              base_url=server.base_url)
+            element_sets = wrapper.get_tle_history(25544, date(2025, 3, 28), date(2025, 3, 29))
+            with self.assertRaises(SpaceTrackError):
+                wrapper.get_tle_history(25544, date(2024, 1, 1), date(2024, 1, 2))
+            wrapper.close()
+
+        self.assertEqual([tle_1[18:32] for tle_1, _, _ in element_sets], ['25087.72483446', '25087.20000000'])
+
+    def test_rate_limited_requests_are_retried(self):
+        with MockSpaceTrackServer(rate_limit=(1, 0.2), retry_after=0.2) as server:
+            wrapper = SpacetrackClientWrapper("user@example.com", "password", rate_limiter=self.limiter,
+                                              base_url=server.base_url)
+            wrapper.get_tle(25544, latest=True)
+            wrapper.get_tle(20580, latest=True)
+            wrapper.close()
+
+        self.assertGreaterEqual(server.throttled, 1)
+        self.assertEqual(self.limiter.metrics()['retries'], server.throttled)
+
+    def test_async_get_many(self):
+        with MockSpaceTrackServer(latency=0.01) as server:
+            async def run():
+                wrapper = AsyncSpacetrackClientWrapper("user@example.com", "password",
+                                                       rate_limiter=self.limiter, base_url=server.base_url)
+                try:
+                    return await wrapper.get_many([25544, 33591, 99999], latest=True)
+                finally:
+                    await wrapper.close()
+
+            results = asyncio.run(run())
+
+        self.assertEqual(results[33591][2], ' 99.0912')
+        self.assertIsInstance(results[99999], SpaceTrackError)
+
+    def test_async_relogin_on_expired_session(self):
+        with MockSpaceTrackServer() as server:
+            async def run():
+                wrapper = AsyncSpacetrackClientWrapper("user@example.com", "password",
+                                                       rate_limiter=self.limiter, base_url=server.base_url)
+                try:
+                    first = await wrapper.get_many([25544, 33591], latest=True)
+                    server.expire_sessions()
+                    second = await wrapper.get_many([25544, 33591], latest=True)
+                    return first, second
+                finally:
+                    await wrapper.close()
+
+            first, second = asyncio.run(run())
+
+        self.assertEqual(second[33591], first[33591])
+        # Both requests rejected with HTTP 401 share a single new login.
+        self.assertEqual(server.logins, 2)
+        # Logins go through the rate limiter like queries.
+        self.assertEqual(self.limiter.metrics()['requests'], server.logins + len(server.queries) + 2)
+
+    def test_async_get_many_history(self):
+        with MockSpaceTrackServer() as server:
+            async def run():
+                wrapper = AsyncSpacetrackClientWrapper("user@example.com", "password",
+                                                       rate_limiter=self.limiter, base_url=server.base_url)
+                try:
+                    return await wrapper.get_many([25544, 33591], date(2025, 3, 28), history=True)
+                finally:
+                    await wrapper.close()
+
+            results = asyncio.run(run())
+
+        self.assertEqual([tle_1[18:32] for tle_1, _, _ in results[25544]], ['25087.72483446', '25087.20000000'])
+        self.assertEqual(len(results[33591]), 1)
+        self.assertTrue(all('gp_history' in query for query in server.queries))
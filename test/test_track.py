@@ -0,0 +1,72 @@
+import unittest
+from datetime import datetime
+
+import numpy as np
+from pyorbital.orbital import Orbital
+
+from src.Space_trace.orbital.track import (eci_to_lonlatalt, lonlatalt_to_ecef, decimate_columns, eci_to_ecef,
+                                           state_vector_columns, STATE_COLUMNS)
+
+TLE_1 = "1 25544U 98067A   25087.72483446  .00032194  00000-0  56484-3 0  9999"
+TLE_2 = "2 25544  51.6386 345.5386 0004029  59.5799 332.6073 15.50242233502686"
+
+
+class TrackTest(unittest.TestCase):
+    def test_eci_to_lonlatalt_matches_pyorbital(self):
+        orb = Orbital("N", line1=TLE_1, line2=TLE_2)
+        times = np.datetime64(datetime(2025, 3, 28)) + np.arange(0, 180, 7) * np.timedelta64(1, 'm')
+        positions, _ = orb.get_position(times, normalize=False)
+
+        lons, lats, alts = eci_to_lonlatalt(*positions, times)
+        expected_lons, expected_lats, expected_alts = orb.get_lonlatalt(times)
+
+        np.testing.assert_allclose(lons, expected_lons, atol=1e-6)
+        np.testing.assert_allclose(lats, expected_lats, atol=1e-6)
+        np.testing.assert_allclose(alts, expected_alts, atol=0.01)
+
+    def test_eci_to_lonlatalt_nan_position(self):
+        orb = Orbital("N", line1=TLE_1, line2=TLE_2)
+        times = np.datetime64(datetime(2025, 3, 28)) + np.arange(3) * np.timedelta64(1, 'm')
+        x, y, z = orb.get_position(times, normalize=False)[0]
+        x[1] = np.nan
+
+        lons, lats, alts = eci_to_lonlatalt(x, y, z, times)
+        self.assertTrue(np.isnan(lats[1]) and np.isnan(alts[1]))
+        expected_lons, expected_lats, _ = orb.get_lonlatalt(times)
+        np.testing.assert_allclose(lats[[0, 2]], expected_lats[[0, 2]], atol=1e-6)
+
+    def test_lonlatalt_to_ecef(self):
+        x, y, z = lonlatalt_to_ecef([0, 90, 0], [0, 0, 90], [0, 400, 0])
+        np.testing.assert_allclose(x, [6378.137, 0, 0], atol=1e-6)
+        np.testing.assert_allclose(y, [0, 6778.137, 0], atol=1e-6)
+        np.testing.assert_allclose(z, [0, 0, 6356.752314], atol=1e-6)
+
+    def test_decimate_columns_keeps_last_point(self):
+        columns = {'time': np.arange(10), 'lat': np.arange(10) * 2.0}
+        decimated = decimate_columns(columns, 4)
+        self.assertEqual(decimated['time'].tolist(), [0, 4, 8, 9])
+        self.assertEqual(decimated['lat'].tolist(), [0, 8, 16, 18])
+        self.assertIs(decimate_columns(columns, 1), columns)
+        self.assertEqual(decimate_columns(columns, 3)['time'].tolist(), [0, 3, 6, 9])
+
+    def test_state_vector_columns(self):
+        orb = Orbital("N", line1=TLE_1, line2=TLE_2)
+        times = np.datetime64(datetime(2025, 3, 28)) + np.arange(0, 180, 7) * np.timedelta64(1, 'm')
+        positions, velocities = orb.get_position(times, normalize=False)
+        lons, lats, alts = eci_to_lonlatalt(*positions, times)
+
+        columns = state_vector_columns(positions, velocities, times, lons, lats)
+        self.assertEqual(tuple(columns), STATE_COLUMNS)
+        np.testing.assert_array_equal(columns['eci_vz'], velocities[2])
+        # The Earth-fixed positions are those of the geodetic coordinates.
+        for column, expected in zip(('ecef_x', 'ecef_y', 'ecef_z'), lonlatalt_to_ecef(lons, lats, alts)):
+            np.testing.assert_allclose(columns[column], expected, atol=1e-3)
+        # ISS: about 7.66 km/s inertial, 6.9 km/s over the rotating Earth's surface.
+        self.assertTrue(np.all((columns['ground_speed'] > 6.8) & (columns['ground_speed'] < 7.0)))
+
+    def test_eci_to_ecef_velocity_matches_finite_difference(self):
+        orb = Orbital("N", line1=TLE_1, line2=TLE_2)
+        times = np.datetime64(datetime(2025, 3, 28)) + np.array([0, 1000, 2000]) * np.timedelta64(1, 'ms')
+        positions, velocities = eci_to_ecef(*orb.get_position(times, normalize=False), times)
+        for axis in range(3):
+            self.assertAlmostEqual(velocities[axis][1], (positions[axis][2] - positions[axis][0]) / 2, places=4)